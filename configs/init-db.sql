@@ -55,6 +55,9 @@ CREATE TABLE IF NOT EXISTS agent_skills (
     execution_steps JSONB NOT NULL,
     success_count INT DEFAULT 0,
     failure_count INT DEFAULT 0,
+    total_duration_ms DOUBLE PRECISION DEFAULT 0,
+    latency_histogram JSONB DEFAULT '{}',
+    last_used_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -0,0 +1,6 @@
+-- Migration: metricas agregadas de skills (flush em lote do SkillMetricsAggregator)
+
+ALTER TABLE agent_skills
+    ADD COLUMN IF NOT EXISTS total_duration_ms DOUBLE PRECISION DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS latency_histogram JSONB DEFAULT '{}',
+    ADD COLUMN IF NOT EXISTS last_used_at TIMESTAMP WITH TIME ZONE;
@@ -133,17 +133,12 @@ class CapGate:
     async def check_ram_threshold(engine: "AutonomousLoop", proposal_id: int) -> dict:
         """Verifica se hÃ¡ RAM suficiente."""
         try:
-            with open("/proc/meminfo", "r") as f:
-                meminfo = f.read()
+            from core.resource_manager.sampler import get_resource_sampler
 
-            values = {}
-            for line in meminfo.split("\n"):
-                if ":" in line:
-                    key, val = line.split(":", 1)
-                    values[key.strip()] = int(val.strip().split()[0])
-
-            values.get("MemTotal", 0) // 1024  # noqa: F841
-            available = values.get("MemAvailable", 0) // 1024
+            sample = get_resource_sampler().latest()
+            if sample is None:
+                return {"blocked": False}
+            available = sample.mem_available_mb
 
             min_required = 200
             if available < min_required:
@@ -551,67 +546,21 @@ def get_autonomous_loop() -> AutonomousLoop:
             )
         )
 
-        # Trigger 3: Skill Stats
+        # Trigger 3: Skill Stats (flush do agregador alimentado pelo metrics_hook)
         async def skill_stats_action(engine: AutonomousLoop):
-            try:
-                skills = [
-                    "get_ram",
-                    "list_containers",
-                    "get_system_status",
-                    "check_postgres",
-                    "check_redis",
-                    "shell_exec",
-                    "file_manager",
-                    "memory_query",
-                    "web_search",
-                    "self_edit",
-                ]
-                stats = {}
-                for skill in skills:
-                    count = engine._redis.get(f"skill_usage:{skill}")
-                    stats[skill] = int(count) if count else 0
-
-                conn = engine._get_conn()
-                cur = conn.cursor()
-                for skill, count in stats.items():
-                    if count > 0:
-                        cur.execute(
-                            """INSERT INTO agent_skills (skill_name, success_count)
-                            VALUES (%s, %s)
-                            ON CONFLICT (skill_name)
-                            DO UPDATE SET success_count = agent_skills.success_count + EXCLUDED.success_count""",
-                            (skill, count),
-                        )
-                conn.commit()
-                conn.close()
-
-                for skill in skills:
-                    engine._redis.delete(f"skill_usage:{skill}")
+            from core.hooks.metrics import get_skill_metrics
 
-                return stats
+            try:
+                return get_skill_metrics().flush(engine._get_conn, engine._redis)
             except Exception as e:
                 logger.error("skill_stats_error", error=str(e))
                 return {}
 
         def skill_stats_condition() -> bool:
-            """Apenas se algum skill foi usado desde ultimo flush."""
-            skills = [
-                "get_ram",
-                "list_containers",
-                "get_system_status",
-                "check_postgres",
-                "check_redis",
-                "shell_exec",
-                "file_manager",
-                "memory_query",
-                "web_search",
-                "self_edit",
-            ]
-            for skill in skills:
-                count = _autonomous_loop._redis.get(f"skill_usage:{skill}")
-                if count and int(count) > 0:
-                    return True
-            return False
+            """Apenas quando o intervalo de flush venceu (tambem drena skill_usage:* do Redis)."""
+            from core.hooks.metrics import get_skill_metrics
+
+            return get_skill_metrics().flush_due(require_pending=False)
 
         _autonomous_loop.register_trigger(
             Trigger(
@@ -625,22 +574,12 @@ def get_autonomous_loop() -> AutonomousLoop:
 
         # Trigger 4: RAM > 80% â†’ criar proposal
         def check_ram_condition() -> bool:
+            """RAM > 80% na media do ultimo minuto (evita disparar em picos)."""
             try:
-                with open("/proc/meminfo", "r") as f:
-                    meminfo = f.read()
-
-                values = {}
-                for line in meminfo.split("\n"):
-                    if ":" in line:
-                        key, val = line.split(":", 1)
-                        values[key.strip()] = int(val.strip().split()[0])
-
-                total = values.get("MemTotal", 0) // 1024
-                available = values.get("MemAvailable", 0) // 1024
+                from core.resource_manager.sampler import get_resource_sampler
 
-                if total > 0:
-                    used_percent = ((total - available) / total) * 100
-                    return used_percent > 80
+                used_percent = get_resource_sampler().smoothed(60)["mem_used_percent"]
+                return used_percent is not None and used_percent > 80
             except Exception:
                 pass
             return False
@@ -676,6 +615,7 @@ def get_autonomous_loop() -> AutonomousLoop:
             try:
                 conn = engine._get_conn()
                 cur = conn.cursor()
+                # Janela de 1h exata: linhas cruas (rollup diario nao tem essa resolucao)
                 cur.execute(
                     """SELECT trigger, COUNT(*) as count
                     FROM learnings
@@ -55,6 +55,8 @@ class CapabilitiesRegistry:
 
     def __init__(self):
         self.capabilities: Dict[str, Capability] = {}
+        # Incrementada a cada mudança (invalida o cache de prompt do react_node)
+        self.version = 0
         self._initialize_core_capabilities()
 
     def _initialize_core_capabilities(self):
@@ -131,6 +133,7 @@ class CapabilitiesRegistry:
     def register(self, capability: Capability):
         """Registra uma nova capacidade."""
         self.capabilities[capability.name] = capability
+        self.version += 1
         logger.info(
             "capacidade_registrada", name=capability.name, implemented=capability.implemented
         )
@@ -251,6 +254,7 @@ O CLI/Kilocode será usado para gerar o código de implementação.
         cap = self.capabilities.get(name)
         if cap:
             cap.mark_implemented(implementation_path)
+            self.version += 1
             logger.info("capacidade_implementada", name=name, path=implementation_path)
         else:
             logger.warning("capacidade_nao_encontrada", name=name)
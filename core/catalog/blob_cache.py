@@ -0,0 +1,210 @@
+"""
+Content-addressed blob cache for catalog sync.
+
+Remote documents (source JSON, GitHub API responses, SKILL.md files) are stored
+once under the SHA-256 of their content. A JSON index maps each URL to the ETag
+and blob it was last served with, so conditional requests can answer 304 and the
+body is read from disk. Named aliases point at derived blobs (e.g. the normalized
+skills for a given source content hash), which lets unchanged sources skip
+parsing and normalization entirely.
+
+Blobs are evicted least-recently-used first once the total size exceeds
+``max_bytes``; URL entries and aliases pointing at evicted blobs are dropped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+INDEX_VERSION = 1
+
+
+class BlobCache:
+    """Blobs on disk keyed by SHA-256, with URL/ETag and alias lookups."""
+
+    def __init__(self, root: str | Path, max_bytes: int = 64 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._index: dict[str, Any] | None = None
+        self._dirty = False
+        self._clock = 0.0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    # ---------- index ----------
+
+    def _load(self) -> dict[str, Any]:
+        if self._index is None:
+            index: dict[str, Any] = {}
+            try:
+                index = json.loads(self._index_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                pass
+            except Exception as exc:
+                logger.warning("catalog.blob_index_unreadable", error=str(exc))
+            if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+                index = {}
+            index = {
+                "version": INDEX_VERSION,
+                "urls": index.get("urls", {}),
+                "aliases": index.get("aliases", {}),
+                "blobs": index.get("blobs", {}),
+            }
+            self._index = index
+        return self._index
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / sha256
+
+    def _now(self) -> float:
+        # Strictly increasing, so LRU order is exact even within one clock tick.
+        self._clock = max(time.time(), self._clock + 1e-6)
+        return self._clock
+
+    def _touch(self, sha256: str) -> None:
+        entry = self._load()["blobs"].get(sha256)
+        if entry is not None:
+            entry["used"] = self._now()
+            self._dirty = True
+
+    # ---------- blobs ----------
+
+    def get(self, sha256: str) -> bytes | None:
+        with self._lock:
+            if sha256 not in self._load()["blobs"]:
+                self.stats["misses"] += 1
+                return None
+            try:
+                content = self._blob_path(sha256).read_bytes()
+            except FileNotFoundError:
+                self._forget(sha256)
+                self.stats["misses"] += 1
+                return None
+            self._touch(sha256)
+            self.stats["hits"] += 1
+            return content
+
+    def put(self, content: bytes, *, url: str | None = None, etag: str | None = None) -> str:
+        """Stores content (no-op if already present) and optionally maps url -> (etag, sha)."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            blobs = self._load()["blobs"]
+            if sha256 not in blobs:
+                path = self._blob_path(sha256)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, path)
+                blobs[sha256] = {"size": len(content), "used": self._now()}
+                self.stats["writes"] += 1
+            else:
+                blobs[sha256]["used"] = self._now()
+            if url is not None:
+                if etag:
+                    self._index["urls"][url] = {"etag": etag, "sha256": sha256}
+                else:
+                    self._index["urls"].pop(url, None)
+            self._dirty = True
+        return sha256
+
+    # ---------- URL / ETag ----------
+
+    def lookup_url(self, url: str) -> tuple[str, str] | None:
+        """(etag, sha256) last served for url, if its blob is still cached."""
+        with self._lock:
+            index = self._load()
+            entry = index["urls"].get(url)
+            if not entry or entry.get("sha256") not in index["blobs"]:
+                return None
+            return entry["etag"], entry["sha256"]
+
+    # ---------- aliases ----------
+
+    def get_alias(self, name: str) -> bytes | None:
+        with self._lock:
+            sha256 = self._load()["aliases"].get(name)
+        if sha256 is None:
+            self.stats["misses"] += 1
+            return None
+        return self.get(sha256)
+
+    def put_alias(self, name: str, content: bytes) -> str:
+        sha256 = self.put(content)
+        with self._lock:
+            self._load()["aliases"][name] = sha256
+            self._dirty = True
+        return sha256
+
+    def drop_aliases(self, prefix: str) -> int:
+        """Removes the aliases whose name starts with ``prefix``; blobs age out normally."""
+        with self._lock:
+            aliases = self._load()["aliases"]
+            names = [name for name in aliases if name.startswith(prefix)]
+            for name in names:
+                del aliases[name]
+            if names:
+                self._dirty = True
+        return len(names)
+
+    def get_json(self, name: str) -> Any:
+        content = self.get_alias(name)
+        return None if content is None else json.loads(content)
+
+    def put_json(self, name: str, value: Any) -> str:
+        return self.put_alias(name, json.dumps(value, ensure_ascii=True, sort_keys=True).encode())
+
+    # ---------- eviction / persistence ----------
+
+    def _forget(self, sha256: str) -> None:
+        index = self._load()
+        index["blobs"].pop(sha256, None)
+        index["urls"] = {
+            url: entry for url, entry in index["urls"].items() if entry.get("sha256") != sha256
+        }
+        index["aliases"] = {
+            name: value for name, value in index["aliases"].items() if value != sha256
+        }
+        self._dirty = True
+
+    def _evict(self) -> None:
+        blobs = self._load()["blobs"]
+        total = sum(entry["size"] for entry in blobs.values())
+        if total <= self.max_bytes:
+            return
+        for sha256, entry in sorted(blobs.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                self._blob_path(sha256).unlink()
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            self._forget(sha256)
+            self.stats["evictions"] += 1
+
+    def flush(self) -> None:
+        """Applies the size cap and writes the index if anything changed."""
+        with self._lock:
+            if not self._dirty or self._index is None:
+                return
+            self._evict()
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._index, ensure_ascii=True), encoding="utf-8")
+            os.replace(tmp_path, self._index_path)
+            self._dirty = False
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry["size"] for entry in self._load()["blobs"].values())
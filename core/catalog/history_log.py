@@ -0,0 +1,286 @@
+"""
+Append-only catalog history used when Postgres is unavailable.
+
+Each line of the JSONL file is one per-skill change (added, updated, removed,
+rollback_applied) instead of a full catalog snapshot. A sidecar index
+(``<file>.idx``) maps (skill_name, source_name) to the byte offsets of its
+records plus the latest schema_hash/status, so provenance and rollback read only
+the lines of one skill and the next snapshot diff needs no file scan at all.
+
+The index is validated against the file's inode and size: appends made by
+another process are picked up by scanning only the new tail, and a rewritten
+file (compaction) triggers a full rebuild. Compaction keeps the newest
+``max_versions`` records per skill once superseded records outnumber them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Below this many records compaction is not worth a rewrite.
+COMPACT_MIN_RECORDS = 1000
+
+
+def _key(skill_name: str, source_name: str) -> str:
+    return f"{skill_name}:{source_name}"
+
+
+class CatalogHistoryLog:
+    """JSONL history of per-skill catalog changes with an offset index."""
+
+    def __init__(
+        self, path: str | Path, max_versions: int = 20, legacy_path: str | Path | None = None
+    ):
+        self.path = Path(path)
+        # Old JSON snapshot list (e.g. the previous default history_file), migrated
+        # into ``path`` when ``path`` does not exist yet.
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.max_versions = max(1, max_versions)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._records = 0
+        self._indexed: tuple[int, int] | None = None  # (inode, size) covered by the index
+
+    # ---------- index ----------
+
+    def _index_line(self, record: dict[str, Any], offset: int) -> None:
+        key = _key(str(record.get("skill_name", "")), str(record.get("source_name", "")))
+        entry = self._entries.setdefault(key, {"offsets": []})
+        entry["offsets"].append(offset)
+        entry["schema_hash"] = record.get("schema_hash")
+        entry["status"] = record.get("status", "active")
+        self._records += 1
+
+    def _scan(self, start: int) -> int:
+        """Indexes the records from byte offset start; returns the end offset."""
+        with self.path.open("rb") as handle:
+            handle.seek(start)
+            offset = start
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # partial line from an in-flight append
+                if line.strip():
+                    try:
+                        self._index_line(json.loads(line), offset)
+                    except ValueError:
+                        pass
+                offset += len(line)
+        return offset
+
+    def _refresh(self) -> None:
+        """Brings the in-memory index in sync with the file on disk."""
+        self._migrate_legacy()
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._entries, self._records, self._indexed = {}, 0, None
+            return
+        if self._indexed is None:
+            self._load_sidecar()
+        inode, size = self._indexed or (None, 0)
+        if inode != stat.st_ino or size > stat.st_size:
+            self._entries, self._records, size = {}, 0, 0
+        if size == stat.st_size and inode == stat.st_ino:
+            return
+        end = self._scan(size)
+        self._indexed = (stat.st_ino, end)
+        self._save_sidecar()
+
+    def _load_sidecar(self) -> None:
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+            self._entries = payload["entries"]
+            self._records = int(payload["records"])
+            self._indexed = (int(payload["inode"]), int(payload["size"]))
+        except Exception:
+            self._entries, self._records, self._indexed = {}, 0, None
+
+    def _save_sidecar(self) -> None:
+        if self._indexed is None:
+            return
+        payload = {
+            "inode": self._indexed[0],
+            "size": self._indexed[1],
+            "records": self._records,
+            "entries": self._entries,
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=True), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+    def _migrate_legacy(self) -> None:
+        """Converts the old JSON list of full snapshots into per-skill diff records."""
+        source = self.path
+        if self.legacy_path is not None and not self.path.exists():
+            source = self.legacy_path
+        try:
+            with source.open("rb") as handle:
+                if handle.read(1) != b"[":
+                    return
+            snapshots = json.loads(source.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return
+        latest: dict[str, tuple[Any, Any]] = {}
+        lines = []
+        for snapshot in snapshots if isinstance(snapshots, list) else []:
+            for item in snapshot.get("skills", []):
+                if not isinstance(item, dict):
+                    continue
+                key = _key(str(item.get("skill_name", "")), str(item.get("source_name", "")))
+                state = (item.get("schema_hash"), item.get("status", "active"))
+                if latest.get(key) == state:
+                    continue
+                change_type = "updated" if key in latest else "added"
+                latest[key] = state
+                record = self.build_record(item, change_type, ts=snapshot.get("ts"))
+                lines.append(json.dumps(record, ensure_ascii=True) + "\n")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text("".join(lines), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._entries, self._records, self._indexed = {}, 0, None
+        logger.info(
+            "catalog.history_migrated", path=str(self.path), source=str(source), records=len(lines)
+        )
+
+    # ---------- writes ----------
+
+    @staticmethod
+    def build_record(
+        item: dict[str, Any],
+        change_type: str,
+        *,
+        status: str | None = None,
+        ts: str | None = None,
+        changed_by: str = "sync_engine",
+    ) -> dict[str, Any]:
+        record = {
+            "ts": ts or datetime.now(timezone.utc).isoformat(),
+            "skill_name": item.get("skill_name"),
+            "source_name": item.get("source_name"),
+            "version": item.get("version"),
+            "schema_hash": item.get("schema_hash"),
+            "status": status or item.get("status", "active"),
+            "change_type": change_type,
+            "changed_by": changed_by,
+        }
+        if "payload" in item:
+            record["payload"] = item["payload"]
+        return record
+
+    def append(self, records: Iterable[dict[str, Any]]) -> int:
+        lines = [
+            json.dumps(record, ensure_ascii=True).encode("utf-8") + b"\n" for record in records
+        ]
+        if not lines:
+            return 0
+        with self._lock:
+            self._refresh()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as handle:
+                handle.write(b"".join(lines))
+            self._refresh()
+            self._maybe_compact()
+        return len(lines)
+
+    def record_snapshot(self, discovered: dict[str, dict[str, Any]]) -> int:
+        """Appends one record per skill that changed since the last recorded state."""
+        with self._lock:
+            self._refresh()
+            entries = dict(self._entries)
+        records = []
+        for key, item in discovered.items():
+            entry = entries.get(key)
+            if entry is None:
+                records.append(self.build_record(item, "added"))
+            elif entry.get("schema_hash") != item.get("schema_hash") or entry.get("status") != (
+                item.get("status", "active")
+            ):
+                records.append(self.build_record(item, "updated"))
+        if discovered:
+            for key, entry in entries.items():
+                if key in discovered or entry.get("status") != "active":
+                    continue
+                last = self._read(entry["offsets"][-1:])
+                if last:
+                    removed = {k: v for k, v in last[0].items() if k != "payload"}
+                    records.append(self.build_record(removed, "removed", status="inactive"))
+        return self.append(records)
+
+    # ---------- reads ----------
+
+    def _read(self, offsets: list[int]) -> list[dict[str, Any]]:
+        records = []
+        with self.path.open("rb") as handle:
+            for offset in offsets:
+                handle.seek(offset)
+                records.append(json.loads(handle.readline()))
+        return records
+
+    def lookup(
+        self,
+        skill_name: str,
+        source_name: str | None = None,
+        *,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Records of one skill, newest first (all sources when source_name is None)."""
+        with self._lock:
+            self._refresh()
+            if source_name is not None:
+                keys = [_key(skill_name, source_name)]
+            else:
+                prefix = f"{skill_name}:"
+                keys = [key for key in self._entries if key.startswith(prefix)]
+            offsets = sorted(
+                (
+                    offset
+                    for key in keys
+                    for offset in self._entries.get(key, {}).get("offsets", [])
+                ),
+                reverse=True,
+            )
+            if limit is not None:
+                offsets = offsets[: max(1, limit)]
+            if not offsets:
+                return []
+            records = self._read(offsets)
+        return [record for record in records if record.get("skill_name") == skill_name]
+
+    # ---------- compaction ----------
+
+    def _maybe_compact(self) -> None:
+        retained = sum(
+            min(len(entry["offsets"]), self.max_versions) for entry in self._entries.values()
+        )
+        if self._records < COMPACT_MIN_RECORDS or self._records - retained <= retained:
+            return
+        self.compact()
+
+    def compact(self) -> None:
+        """Rewrites the file keeping the newest max_versions records per skill."""
+        keep = sorted(
+            offset
+            for entry in self._entries.values()
+            for offset in entry["offsets"][-self.max_versions :]
+        )
+        before = self._records
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with self.path.open("rb") as source, tmp_path.open("wb") as target:
+            for offset in keep:
+                source.seek(offset)
+                target.write(source.readline())
+        os.replace(tmp_path, self.path)
+        self._entries, self._records, self._indexed = {}, 0, None
+        self._refresh()
+        logger.info("catalog.history_compacted", before=before, after=self._records)
@@ -4,14 +4,20 @@ Catalog sync engine for external skills metadata sources.
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import csv
 import hashlib
+import io
 import json
 import os
 import re
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 from urllib.parse import urlparse
 
 import httpx
@@ -20,10 +26,105 @@ import structlog
 import yaml
 from psycopg2.extras import Json, RealDictCursor
 
+from core.catalog.blob_cache import BlobCache
+from core.catalog.history_log import CatalogHistoryLog
 from core.config import get_settings
 
 logger = structlog.get_logger(__name__)
 
+# Bump when _normalize_skill output changes so memoized catalogs are rebuilt.
+_NORMALIZE_MEMO_VERSION = 1
+# Blob cache alias holding the digest of the fallback catalog file last written.
+_FALLBACK_DIGEST_ALIAS = "fallback_catalog"
+
+# Set-based apply: discovered rows are COPYed into a per-transaction staging table
+# and diffed against skills_catalog in SQL (see _apply_catalog).
+_STAGE_TABLE_SQL = """
+CREATE TEMP TABLE skills_catalog_stage (
+    skill_name VARCHAR(255) NOT NULL,
+    source_name VARCHAR(255) NOT NULL,
+    version VARCHAR(100) NOT NULL,
+    schema_hash VARCHAR(64) NOT NULL,
+    payload JSONB NOT NULL,
+    change VARCHAR(10) NOT NULL DEFAULT 'added',
+    PRIMARY KEY (skill_name, source_name)
+) ON COMMIT DROP
+"""
+
+_STAGE_COPY_SQL = """
+COPY skills_catalog_stage (skill_name, source_name, version, schema_hash, payload)
+FROM STDIN WITH (FORMAT csv)
+"""
+
+# Pinned rows whose upstream version drifted keep their pinned content.
+_STAGE_CLASSIFY_SQL = """
+UPDATE skills_catalog_stage s
+SET change = CASE
+    WHEN c.pinned AND c.pinned_version IS NOT NULL AND s.version <> c.pinned_version
+        THEN 'pinned'
+    WHEN c.schema_hash IS DISTINCT FROM s.schema_hash OR c.status IS DISTINCT FROM 'active'
+        THEN 'updated'
+    ELSE 'unchanged'
+END
+FROM skills_catalog c
+WHERE c.skill_name = s.skill_name AND c.source_name = s.source_name
+"""
+
+_APPLY_REMOVED_SQL = """
+WITH removed AS (
+    UPDATE skills_catalog c
+    SET status = 'inactive', updated_at = NOW()
+    WHERE c.status = 'active'
+      AND NOT EXISTS (
+          SELECT 1 FROM skills_catalog_stage s
+          WHERE s.skill_name = c.skill_name AND s.source_name = c.source_name
+      )
+    RETURNING c.skill_name, c.source_name, c.version, c.schema_hash, c.payload
+)
+INSERT INTO skills_catalog_history (
+    skill_name, source_name, version, schema_hash, payload, status, change_type, changed_by, details
+)
+SELECT skill_name, source_name, version, schema_hash, payload,
+       'inactive', 'removed', %s, '{}'::jsonb
+FROM removed
+"""
+
+_APPLY_UPSERT_SQL = """
+INSERT INTO skills_catalog (
+    skill_name, source_name, version, schema_hash, payload, status, last_seen_at
+)
+SELECT skill_name, source_name, version, schema_hash, payload, 'active', NOW()
+FROM skills_catalog_stage
+WHERE change IN ('added', 'updated')
+ON CONFLICT (skill_name, source_name)
+DO UPDATE SET
+    version = EXCLUDED.version,
+    schema_hash = EXCLUDED.schema_hash,
+    payload = EXCLUDED.payload,
+    status = 'active',
+    last_seen_at = NOW(),
+    updated_at = NOW()
+"""
+
+_APPLY_HISTORY_SQL = """
+INSERT INTO skills_catalog_history (
+    skill_name, source_name, version, schema_hash, payload, status, change_type, changed_by, details
+)
+SELECT skill_name, source_name, version, schema_hash, payload,
+       'active', change, %s, '{}'::jsonb
+FROM skills_catalog_stage
+WHERE change IN ('added', 'updated')
+"""
+
+# Unchanged and pinned rows only get a heartbeat.
+_APPLY_HEARTBEAT_SQL = """
+UPDATE skills_catalog c
+SET status = 'active', last_seen_at = NOW()
+FROM skills_catalog_stage s
+WHERE c.skill_name = s.skill_name AND c.source_name = s.source_name
+  AND s.change IN ('unchanged', 'pinned')
+"""
+
 
 @dataclass(slots=True)
 class CatalogSource:
@@ -33,6 +134,17 @@ class CatalogSource:
     enabled: bool = True
 
 
+@dataclass(slots=True)
+class _SourceFetch:
+    """Per-source fetch context: shared HTTP client and semaphore, own counters."""
+
+    client: httpx.AsyncClient
+    semaphore: asyncio.Semaphore
+    requests: int = 0
+    not_modified: int = 0
+    memoized: bool = False
+
+
 class SkillsCatalogSyncEngine:
     """Synchronizes skill metadata catalog from configured sources."""
 
@@ -42,7 +154,12 @@ class SkillsCatalogSyncEngine:
         self.sources_file = sources_file or self.settings.sources_file
         self._fallback_cache_path = self.settings.fallback_cache_file
         self._history_file_path = self.settings.history_file
+        self._history_log: CatalogHistoryLog | None = None
         self._pins_file_path = self.settings.pins_file
+        self._blobs = BlobCache(
+            self.settings.blob_cache_dir, self.settings.blob_cache_max_mb * 1024 * 1024
+        )
+        self.last_fetch_stats: dict[str, dict[str, Any]] = {}
         self._github_token = (
             os.getenv("CATALOG_GITHUB_TOKEN")
             or os.getenv("GITHUB_TOKEN")
@@ -115,7 +232,7 @@ class SkillsCatalogSyncEngine:
             diff = self._diff_catalog(existing, discovered)
 
             if mode == "apply":
-                self._apply_catalog(diff, discovered, existing)
+                self._apply_catalog(diff, discovered)
                 self._persist_history_snapshot(discovered, diff)
 
             result = {
@@ -129,6 +246,8 @@ class SkillsCatalogSyncEngine:
                 "removed": diff["removed"],
                 "pinned_skipped": diff.get("pinned_skipped", 0),
                 "changed_keys": diff["changed_keys"][:50],
+                "fetch": self.last_fetch_stats,
+                "blob_cache": dict(self._blobs.stats),
             }
             self._persist_run(status="success", run_mode=mode, stats=result)
             return result
@@ -463,62 +582,172 @@ class SkillsCatalogSyncEngine:
     async def _discover_all_sources(
         self, sources: list[CatalogSource]
     ) -> dict[str, dict[str, Any]]:
+        """Fetches all sources concurrently; requests share one bounded semaphore.
+
+        Normalized skills are memoized per source by the hash of the fetched
+        content, so a source with no upstream change skips parse and normalize.
+        """
+        concurrency = max(1, int(self.settings.fetch_concurrency))
+        semaphore = asyncio.Semaphore(concurrency)
+        self.last_fetch_stats = {}
+        async with httpx.AsyncClient(
+            timeout=self.settings.http_timeout_seconds,
+            limits=httpx.Limits(max_connections=concurrency),
+        ) as client:
+            fetches = [_SourceFetch(client=client, semaphore=semaphore) for _ in sources]
+            results = await asyncio.gather(
+                *(
+                    self._timed_fetch_source(source, fetch)
+                    for source, fetch in zip(sources, fetches)
+                ),
+                return_exceptions=True,
+            )
+        try:
+            self._blobs.flush()
+        except Exception as exc:
+            logger.warning("catalog.blob_cache_flush_failed", error=str(exc))
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        # Merge in configured order so later sources keep overriding earlier ones.
         catalog: dict[str, dict[str, Any]] = {}
-        for source in sources:
-            raw_skills = await self._fetch_source_skills(source)
-            for raw_skill in raw_skills:
-                normalized = self._normalize_skill(raw_skill, source_name=source.name)
-                if not normalized:
-                    continue
+        for skills in results:
+            for normalized in skills:
                 key = self._catalog_key(normalized["skill_name"], normalized["source_name"])
                 catalog[key] = normalized
         return catalog
 
-    async def _fetch_source_skills(self, source: CatalogSource) -> list[dict[str, Any]]:
-        if source.source_type == "local_json":
+    async def _timed_fetch_source(
+        self, source: CatalogSource, fetch: _SourceFetch
+    ) -> list[dict[str, Any]]:
+        started = time.perf_counter()
+        stats: dict[str, Any] = {"source_type": source.source_type}
+        self.last_fetch_stats[source.name] = stats
+        try:
+            skills = await self._fetch_source_skills(source, fetch)
+            stats["skills"] = len(skills)
+            return skills
+        except Exception as exc:
+            stats["error"] = str(exc)
+            raise
+        finally:
+            stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            stats["requests"] = fetch.requests
+            stats["not_modified"] = fetch.not_modified
+            stats["memoized"] = fetch.memoized
+
+    async def _fetch_source_skills(
+        self, source: CatalogSource, fetch: _SourceFetch
+    ) -> list[dict[str, Any]]:
+        """Returns the normalized skills of one source."""
+        if source.source_type in {"local_json", "langchain_skills_local_json"}:
             path = Path(source.location)
             if not path.is_file():
                 logger.warning("catalog.local_source_missing", source=source.name, path=str(path))
                 return []
-            payload = json.loads(path.read_text(encoding="utf-8"))
-            return self._extract_skills(payload)
+            content = path.read_bytes()
+        elif source.source_type in {"url_json", "langchain_skills_url_json"}:
+            content = await self._fetch_content(fetch, source.location)
+        elif source.source_type == "langchain_skills_github_repo":
+            return await self._fetch_langchain_skills_github_repo(source, fetch)
+        else:
+            logger.warning(
+                "catalog.unsupported_source_type",
+                source=source.name,
+                source_type=source.source_type,
+            )
+            return []
 
-        if source.source_type == "url_json":
-            async with httpx.AsyncClient(timeout=self.settings.http_timeout_seconds) as client:
-                response = await client.get(source.location)
-                response.raise_for_status()
-                payload = response.json()
-                return self._extract_skills(payload)
+        if source.source_type.startswith("langchain_"):
+            extract = self._extract_langchain_skills
+        else:
+            extract = self._extract_skills
 
-        if source.source_type == "langchain_skills_local_json":
-            path = Path(source.location)
-            if not path.is_file():
-                logger.warning("catalog.local_source_missing", source=source.name, path=str(path))
-                return []
-            payload = json.loads(path.read_text(encoding="utf-8"))
-            return self._extract_langchain_skills(payload)
-
-        if source.source_type == "langchain_skills_url_json":
-            async with httpx.AsyncClient(timeout=self.settings.http_timeout_seconds) as client:
-                response = await client.get(source.location)
-                response.raise_for_status()
-                payload = response.json()
-                return self._extract_langchain_skills(payload)
-
-        if source.source_type == "langchain_skills_github_repo":
-            return await self._fetch_langchain_skills_github_repo(source.location)
-
-        logger.warning(
-            "catalog.unsupported_source_type",
-            source=source.name,
-            source_type=source.source_type,
-        )
-        return []
+        async def load_raw() -> list[dict[str, Any]]:
+            return extract(json.loads(content))
+
+        content_hash = hashlib.sha256(content).hexdigest()
+        return await self._memoized_normalize(source, fetch, content_hash, load_raw)
+
+    async def _memoized_normalize(
+        self,
+        source: CatalogSource,
+        fetch: _SourceFetch,
+        content_hash: str,
+        load_raw: Callable[[], Awaitable[list[dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        """Normalized skills for content_hash, from the blob cache when unchanged."""
+        memo_key = f"normalized:v{_NORMALIZE_MEMO_VERSION}:{source.source_type}:{source.name}"
+        try:
+            memo = self._blobs.get_json(memo_key)
+        except Exception:
+            memo = None
+        if isinstance(memo, dict) and memo.get("content_hash") == content_hash:
+            fetch.memoized = True
+            seen_at = datetime.now(timezone.utc).isoformat()
+            skills = memo.get("skills", [])
+            for item in skills:
+                item["last_seen_at"] = seen_at
+            return skills
+
+        skills = []
+        for raw_skill in await load_raw():
+            normalized = self._normalize_skill(raw_skill, source_name=source.name)
+            if normalized:
+                skills.append(normalized)
+        try:
+            self._blobs.put_json(memo_key, {"content_hash": content_hash, "skills": skills})
+        except Exception as exc:
+            logger.warning("catalog.blob_cache_write_failed", error=str(exc))
+        return skills
 
-    async def _fetch_langchain_skills_github_repo(self, location: str) -> list[dict[str, Any]]:
-        owner, repo, ref = self._parse_github_repo_location(location)
+    async def _http_get(
+        self, fetch: _SourceFetch, url: str, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        async with fetch.semaphore:
+            fetch.requests += 1
+            return await fetch.client.get(url, headers=headers)
+
+    async def _fetch_content(
+        self,
+        fetch: _SourceFetch,
+        url: str,
+        headers: dict[str, str] | None = None,
+        *,
+        not_found_message: str | None = None,
+    ) -> bytes:
+        """GET with If-None-Match; a 304 serves the body from the blob cache."""
+        cached = self._blobs.lookup_url(url)
+        if cached:
+            conditional = {**(headers or {}), "If-None-Match": cached[0]}
+            response = await self._http_get(fetch, url, headers=conditional)
+            if response.status_code == 304:
+                content = self._blobs.get(cached[1])
+                if content is not None:
+                    fetch.not_modified += 1
+                    return content
+                response = await self._http_get(fetch, url, headers=headers)
+        else:
+            response = await self._http_get(fetch, url, headers=headers)
+
+        if response.status_code == 404 and not_found_message:
+            raise RuntimeError(not_found_message)
+        response.raise_for_status()
+        content = response.content
+        try:
+            self._blobs.put(content, url=url, etag=response.headers.get("ETag"))
+        except Exception as exc:
+            logger.warning("catalog.blob_cache_write_failed", error=str(exc))
+        return content
+
+    async def _fetch_langchain_skills_github_repo(
+        self, source: CatalogSource, fetch: _SourceFetch
+    ) -> list[dict[str, Any]]:
+        owner, repo, ref = self._parse_github_repo_location(source.location)
         if not owner or not repo:
-            logger.warning("catalog.github_repo_invalid_location", location=location)
+            logger.warning("catalog.github_repo_invalid_location", location=source.location)
             return []
 
         headers = {
@@ -527,39 +756,54 @@ class SkillsCatalogSyncEngine:
         }
         if self._github_token:
             headers["Authorization"] = f"Bearer {self._github_token}"
-        async with httpx.AsyncClient(timeout=self.settings.http_timeout_seconds) as client:
-            commit_resp = await client.get(
+
+        # 304s on the commit endpoint do not count against the GitHub API rate limit.
+        commit_payload = json.loads(
+            await self._fetch_content(
+                fetch,
                 f"https://api.github.com/repos/{owner}/{repo}/commits/{ref}",
                 headers=headers,
-            )
-            if commit_resp.status_code == 404 and not self._github_token:
-                raise RuntimeError(
+                not_found_message=None
+                if self._github_token
+                else (
                     "GitHub repository not accessible without token. "
                     "Set CATALOG_GITHUB_TOKEN, GITHUB_TOKEN, or GH_TOKEN."
+                ),
+            )
+        )
+        commit_sha = str(commit_payload.get("sha", ref))
+
+        async def load_raw() -> list[dict[str, Any]]:
+            tree_payload = json.loads(
+                await self._fetch_content(
+                    fetch,
+                    f"https://api.github.com/repos/{owner}/{repo}/git/trees/{ref}?recursive=1",
+                    headers=headers,
+                )
+            )
+            paths = [
+                str(item.get("path", ""))
+                for item in tree_payload.get("tree", [])
+                if isinstance(item, dict)
+                and re.fullmatch(r"skills/[^/]+/SKILL\.md", str(item.get("path", "")))
+            ]
+            contents = await asyncio.gather(
+                *(
+                    self._fetch_content(
+                        fetch,
+                        f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{path}",
+                        headers=headers,
+                    )
+                    for path in paths
                 )
-            commit_resp.raise_for_status()
-            commit_sha = str(commit_resp.json().get("sha", ref))
-
-            tree_resp = await client.get(
-                f"https://api.github.com/repos/{owner}/{repo}/git/trees/{ref}?recursive=1",
-                headers=headers,
             )
-            tree_resp.raise_for_status()
-            tree_payload = tree_resp.json()
 
             skills: list[dict[str, Any]] = []
-            for item in tree_payload.get("tree", []):
-                if not isinstance(item, dict):
-                    continue
-                path = str(item.get("path", ""))
-                if not re.fullmatch(r"skills/[^/]+/SKILL\.md", path):
-                    continue
-                raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{path}"
-                raw_resp = await client.get(raw_url, headers=headers)
-                raw_resp.raise_for_status()
-                parsed = self._parse_langchain_skill_markdown(raw_resp.text)
+            for path, content in zip(paths, contents):
+                parsed = _parse_skill_markdown_memo(content)
                 if not parsed:
                     continue
+                parsed = copy.deepcopy(parsed)
                 parsed.setdefault("name", path.split("/")[1])
                 parsed.setdefault("version", commit_sha[:12])
                 parsed.setdefault("metadata", {})
@@ -571,6 +815,9 @@ class SkillsCatalogSyncEngine:
                 skills.append(parsed)
             return skills
 
+        # Same commit as the last run: memo hit, no tree walk and no file downloads.
+        return await self._memoized_normalize(source, fetch, f"git:{commit_sha}", load_raw)
+
     @staticmethod
     def _parse_github_repo_location(location: str) -> tuple[str, str, str]:
         value = location.strip()
@@ -798,106 +1045,57 @@ class SkillsCatalogSyncEngine:
         self,
         diff: dict[str, Any],
         discovered: dict[str, dict[str, Any]],
-        existing: dict[str, dict[str, Any]],
     ) -> None:
+        """Applies the discovered catalog with a fixed number of set-based statements.
+
+        Rows are COPYed into a temp staging table and classified against
+        skills_catalog by schema_hash (added, updated, pinned, unchanged); each
+        class is then written with one statement, regardless of catalog size.
+        """
         try:
             conn = self._get_conn()
             cur = conn.cursor()
-
-            for key, item in discovered.items():
-                current = existing.get(key)
-                pinned_version = current.get("pinned_version") if current else None
-                if (
-                    current
-                    and current.get("pinned")
-                    and pinned_version
-                    and item.get("version") != pinned_version
-                ):
-                    # Keep pinned version stable, only refresh heartbeat.
-                    cur.execute(
-                        """
-                        UPDATE skills_catalog
-                        SET status = 'active', last_seen_at = NOW(), updated_at = NOW()
-                        WHERE skill_name = %s AND source_name = %s
-                        """,
-                        (item["skill_name"], item["source_name"]),
-                    )
-                    continue
-
-                cur.execute(
-                    """
-                    INSERT INTO skills_catalog (
-                        skill_name, source_name, version, schema_hash, payload, status, last_seen_at,
-                        pinned, pinned_version, pin_reason, pinned_at, pinned_by
-                    )
-                    VALUES (%s, %s, %s, %s, %s, 'active', NOW(), FALSE, NULL, NULL, NULL, NULL)
-                    ON CONFLICT (skill_name, source_name)
-                    DO UPDATE SET
-                        version = EXCLUDED.version,
-                        schema_hash = EXCLUDED.schema_hash,
-                        payload = EXCLUDED.payload,
-                        status = 'active',
-                        last_seen_at = NOW(),
-                        updated_at = NOW()
-                    """,
-                    (
-                        item["skill_name"],
-                        item["source_name"],
-                        item["version"],
-                        item["schema_hash"],
-                        Json(item["payload"]),
-                    ),
-                )
-
-                self._insert_history_row(
-                    cur,
-                    item=item,
-                    status="active",
-                    change_type="applied",
-                )
-
-            if discovered:
-                pairs = [(item["skill_name"], item["source_name"]) for item in discovered.values()]
-                cur.execute(
-                    """
-                    SELECT skill_name, source_name, version, schema_hash, payload
-                    FROM skills_catalog
-                    WHERE status = 'active'
-                    """
-                )
-                rows = cur.fetchall()
-                known = {(row[0], row[1]): row for row in rows}
-                discovered_set = set(pairs)
-                removed_set = set(known.keys()) - discovered_set
-                for skill_name, source_name in removed_set:
-                    cur.execute(
-                        """
-                        UPDATE skills_catalog
-                        SET status = 'inactive', updated_at = NOW()
-                        WHERE skill_name = %s AND source_name = %s
-                        """,
-                        (skill_name, source_name),
-                    )
-                    row = known[(skill_name, source_name)]
-                    self._insert_history_row(
-                        cur,
-                        item={
-                            "skill_name": row[0],
-                            "source_name": row[1],
-                            "version": row[2],
-                            "schema_hash": row[3],
-                            "payload": row[4],
-                        },
-                        status="inactive",
-                        change_type="removed",
-                    )
-
-            conn.commit()
-            conn.close()
+            try:
+                cur.execute(_STAGE_TABLE_SQL)
+                cur.copy_expert(_STAGE_COPY_SQL, self._stage_rows_csv(discovered))
+                cur.execute("ANALYZE skills_catalog_stage")
+                cur.execute(_STAGE_CLASSIFY_SQL)
+
+                if discovered:
+                    # Active rows not discovered in this run become inactive.
+                    cur.execute(_APPLY_REMOVED_SQL, ("sync_engine",))
+                cur.execute(_APPLY_UPSERT_SQL)
+                cur.execute(_APPLY_HISTORY_SQL, ("sync_engine",))
+                cur.execute(_APPLY_HEARTBEAT_SQL)
+
+                cur.execute("SELECT change, COUNT(*) FROM skills_catalog_stage GROUP BY change")
+                counts = dict(cur.fetchall())
+                conn.commit()
+            finally:
+                conn.close()
+            logger.info("catalog.apply_done", changes=counts, removed=diff.get("removed", 0))
         except Exception as exc:
             logger.warning("catalog.apply_fallback_file", error=str(exc))
             self._write_catalog_cache_file(discovered, diff)
 
+    @staticmethod
+    def _stage_rows_csv(discovered: dict[str, dict[str, Any]]) -> io.StringIO:
+        """Serializes discovered skills as CSV for COPY into the staging table."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for item in discovered.values():
+            writer.writerow(
+                (
+                    item["skill_name"],
+                    item["source_name"],
+                    item["version"],
+                    item["schema_hash"],
+                    json.dumps(item["payload"], ensure_ascii=True),
+                )
+            )
+        buffer.seek(0)
+        return buffer
+
     def _apply_pins_to_discovered(self, discovered: dict[str, dict[str, Any]]) -> None:
         pins = self._load_pins_from_file()
         if not pins:
@@ -912,45 +1110,30 @@ class SkillsCatalogSyncEngine:
                 item["pinned_version"] = str(pin_version)
                 item.setdefault("payload", {}).setdefault("metadata", {})["pinned"] = True
 
-    def _insert_history_row(
-        self,
-        cur,
-        *,
-        item: dict[str, Any],
-        status: str,
-        change_type: str,
-        changed_by: str = "sync_engine",
-        details: dict[str, Any] | None = None,
-    ) -> None:
-        try:
-            cur.execute(
-                """
-                INSERT INTO skills_catalog_history (
-                    skill_name, source_name, version, schema_hash, payload, status, change_type, changed_by, details
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    item["skill_name"],
-                    item["source_name"],
-                    item.get("version", "0.0.0"),
-                    item.get("schema_hash", ""),
-                    Json(item.get("payload", {})),
-                    status,
-                    change_type,
-                    changed_by,
-                    Json(details or {}),
-                ),
-            )
-        except Exception:
-            return
-
     def _write_catalog_cache_file(
         self,
         discovered: dict[str, dict[str, Any]],
         diff: dict[str, Any],
     ) -> None:
         path = Path(self._fallback_cache_path)
+        # Skip the full rewrite when the catalog content is the one already on disk.
+        # The digest covers everything written except the timestamps (updated_at,
+        # last_seen_at), so pins, status and diff changes still reach the file.
+        skills = sorted(
+            (key, {field: value for field, value in item.items() if field != "last_seen_at"})
+            for key, item in discovered.items()
+        )
+        digest = hashlib.sha256(
+            json.dumps(
+                {"skills": skills, "diff": diff},
+                ensure_ascii=True,
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()
+        digest_alias = f"{_FALLBACK_DIGEST_ALIAS}:{self._fallback_cache_path}"
+        if path.is_file() and self._blobs.get_alias(digest_alias) == digest.encode():
+            return
         path.parent.mkdir(parents=True, exist_ok=True)
         payload = {
             "updated_at": datetime.now(timezone.utc).isoformat(),
@@ -958,31 +1141,34 @@ class SkillsCatalogSyncEngine:
             "diff": diff,
         }
         path.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
+        try:
+            # Only the current fallback file keeps a digest alias
+            self._blobs.drop_aliases(f"{_FALLBACK_DIGEST_ALIAS}:")
+            self._blobs.put_alias(digest_alias, digest.encode())
+            self._blobs.flush()
+        except Exception as exc:
+            logger.warning("catalog.blob_cache_write_failed", error=str(exc))
+
+    def _history(self) -> CatalogHistoryLog:
+        path = Path(self._history_file_path)
+        if self._history_log is None or self._history_log.path != path:
+            # history_file used to default to a .json snapshot list next to the .jsonl
+            legacy_path = path.with_suffix(".json") if path.suffix == ".jsonl" else None
+            self._history_log = CatalogHistoryLog(
+                path, self.settings.history_max_versions, legacy_path=legacy_path
+            )
+        return self._history_log
 
     def _persist_history_snapshot(
         self,
         discovered: dict[str, dict[str, Any]],
         diff: dict[str, Any],
     ) -> None:
-        path = Path(self._history_file_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        history = []
-        if path.is_file():
-            try:
-                raw = json.loads(path.read_text(encoding="utf-8"))
-                if isinstance(raw, list):
-                    history = raw
-            except Exception:
-                history = []
-        history.append(
-            {
-                "ts": datetime.now(timezone.utc).isoformat(),
-                "skills": list(discovered.values()),
-                "diff": diff,
-            }
-        )
-        history = history[-100:]
-        path.write_text(json.dumps(history, ensure_ascii=True, indent=2), encoding="utf-8")
+        """Appends per-skill change records (not a full snapshot) to the history log."""
+        try:
+            self._history().record_snapshot(discovered)
+        except Exception as exc:
+            logger.warning("catalog.history_write_failed", error=str(exc))
 
     def _load_pins_from_file(self) -> dict[str, dict[str, Any]]:
         path = Path(self._pins_file_path)
@@ -1062,36 +1248,25 @@ class SkillsCatalogSyncEngine:
         if not current:
             return {"success": False, "error": "skill not found in cache"}
 
-        history_path = Path(self._history_file_path)
-        history_rows: list[dict[str, Any]] = []
-        if history_path.is_file():
-            try:
-                snapshots = json.loads(history_path.read_text(encoding="utf-8"))
-                if isinstance(snapshots, list):
-                    for snapshot in reversed(snapshots):
-                        for item in snapshot.get("skills", []):
-                            if not isinstance(item, dict):
-                                continue
-                            if item.get("skill_name") != current.get("skill_name"):
-                                continue
-                            if item.get("source_name") != current.get("source_name"):
-                                continue
-                            history_rows.append(
-                                {
-                                    "version": item.get("version"),
-                                    "schema_hash": item.get("schema_hash"),
-                                    "status": item.get("status", "active"),
-                                    "changed_at": snapshot.get("ts"),
-                                    "change_type": "snapshot",
-                                    "changed_by": "sync_engine",
-                                }
-                            )
-                            if len(history_rows) >= max(1, int(limit)):
-                                break
-                        if len(history_rows) >= max(1, int(limit)):
-                            break
-            except Exception:
-                history_rows = []
+        try:
+            records = self._history().lookup(
+                str(current.get("skill_name")),
+                str(current.get("source_name")),
+                limit=max(1, int(limit)),
+            )
+        except Exception:
+            records = []
+        history_rows = [
+            {
+                "version": record.get("version"),
+                "schema_hash": record.get("schema_hash"),
+                "status": record.get("status", "active"),
+                "changed_at": record.get("ts"),
+                "change_type": record.get("change_type"),
+                "changed_by": record.get("changed_by", "sync_engine"),
+            }
+            for record in records
+        ]
 
         return {
             "success": True,
@@ -1106,41 +1281,36 @@ class SkillsCatalogSyncEngine:
         source_name: str | None,
         target_version: str | None,
     ) -> dict[str, Any]:
-        history_path = Path(self._history_file_path)
-        if not history_path.is_file():
-            return {"success": False, "error": "history unavailable"}
         try:
-            snapshots = json.loads(history_path.read_text(encoding="utf-8"))
-            if not isinstance(snapshots, list):
-                return {"success": False, "error": "invalid history format"}
-
+            history = self._history()
             candidate = None
-            for snapshot in reversed(snapshots):
-                for item in snapshot.get("skills", []):
-                    if not isinstance(item, dict):
-                        continue
-                    if item.get("skill_name") != skill_name:
-                        continue
-                    if source_name and item.get("source_name") != source_name:
-                        continue
-                    if target_version and str(item.get("version")) != target_version:
-                        continue
-                    candidate = item
-                    break
-                if candidate:
-                    break
+            for record in history.lookup(skill_name, source_name):
+                if "payload" not in record:
+                    continue
+                if target_version and str(record.get("version")) != target_version:
+                    continue
+                candidate = record
+                break
 
             if not candidate:
                 return {"success": False, "error": "rollback candidate not found in history"}
 
-            catalog = self._load_existing_from_file()
             key = self._catalog_key(
                 candidate.get("skill_name", ""), candidate.get("source_name", "")
             )
             if key == ":":
                 return {"success": False, "error": "invalid candidate key"}
-            catalog[key] = candidate
+            catalog = self._load_existing_from_file()
+            catalog[key] = {
+                "skill_name": candidate["skill_name"],
+                "source_name": candidate["source_name"],
+                "version": candidate.get("version"),
+                "schema_hash": candidate.get("schema_hash"),
+                "payload": candidate["payload"],
+                "status": "active",
+            }
             self._write_catalog_cache_file(catalog, {"rollback": True})
+            history.append([history.build_record(catalog[key], "rollback_applied")])
             return {
                 "success": True,
                 "skill_name": candidate.get("skill_name"),
@@ -1295,3 +1465,11 @@ class SkillsCatalogSyncEngine:
             if key in raw_skill and key not in base:
                 base[key] = raw_skill.get(key)
         return base
+
+
+@lru_cache(maxsize=2048)
+def _parse_skill_markdown_memo(content: bytes) -> dict[str, Any] | None:
+    """SKILL.md parse memoized by content; callers must copy before mutating."""
+    return SkillsCatalogSyncEngine._parse_langchain_skill_markdown(
+        content.decode("utf-8", errors="replace")
+    )
@@ -273,8 +273,12 @@ class CatalogSettings(BaseSettings):
         description="Cache local quando DB estÃƒÂ¡ indisponÃƒÂ­vel",
     )
     history_file: str = Field(
-        default="configs/skills-catalog-history.json",
-        description="Historico local para rollback/provenance",
+        default="configs/skills-catalog-history.jsonl",
+        description="Historico local (JSONL de diffs por skill) para rollback/provenance",
+    )
+    history_max_versions: int = Field(
+        default=20,
+        description="Registros mantidos por skill no historico local apos compactacao",
     )
     pins_file: str = Field(
         default="configs/skills-catalog-pins.json",
@@ -285,6 +289,15 @@ class CatalogSettings(BaseSettings):
         description="Intervalo para check automÃƒÂ¡tico no loop autÃƒÂ´nomo",
     )
     http_timeout_seconds: int = Field(default=20, description="Timeout HTTP das fontes remotas")
+    fetch_concurrency: int = Field(
+        default=8,
+        description="Requisicoes HTTP simultaneas no fetch das fontes (fontes e SKILL.md)",
+    )
+    blob_cache_dir: str = Field(
+        default="configs/skills-catalog-blobs",
+        description="Cache de blobs por SHA-256 (ETags, SKILL.md, skills normalizados)",
+    )
+    blob_cache_max_mb: int = Field(default=64, description="Limite do cache de blobs (LRU)")
     approval_required_for_apply: bool = Field(
         default=True,
         description="Se true, apply automÃƒÂ¡tico via trigger gera proposal com aprovaÃƒÂ§ÃƒÂ£o humana",
@@ -356,6 +369,14 @@ class VoiceContextSettings(BaseSettings):
         default=12,
         description="Limite de arquivos processados por rodada",
     )
+    transcription_workers: int = Field(
+        default=0,
+        description="Processos paralelos de transcricao no sync_inbox (0 = numero de CPUs)",
+    )
+    extraction_concurrency: int = Field(
+        default=3,
+        description="Chamadas simultaneas de extracao via LLM por lote (limite da API)",
+    )
     auto_commit_max_duration_minutes: int = Field(
         default=30,
         description="Audios acima desse limite exigem revisao humana para todos os itens",
@@ -30,7 +30,7 @@ class DatabasePool:
         self,
         dsn: Optional[str] = None,
         host: Optional[str] = None,
-        port: int = 5432,
+        port: Optional[int] = None,
         user: Optional[str] = None,
         password: Optional[str] = None,
         database: Optional[str] = None,
@@ -44,7 +44,7 @@ class DatabasePool:
         Args:
             dsn: Full PostgreSQL DSN string (optional)
             host: Database host
-            port: Database port
+            port: Database port (default: POSTGRES_PORT or 5432)
             user: Database user
             password: Database password
             database: Database name
@@ -61,13 +61,14 @@ class DatabasePool:
     def _build_dsn(
         self,
         host: Optional[str],
-        port: int,
+        port: Optional[int],
         user: Optional[str],
         password: Optional[str],
         database: Optional[str],
     ) -> str:
         """Build DSN from individual parameters."""
         host = host or os.getenv("POSTGRES_HOST", "localhost")
+        port = port or int(os.getenv("POSTGRES_PORT", "5432"))
         user = user or os.getenv("POSTGRES_USER", "postgres")
         password = password or os.getenv("POSTGRES_PASSWORD", "")
         database = database or os.getenv("POSTGRES_DB", "vps_agent")
@@ -49,6 +49,7 @@ class TelegramAdapter:
         """
         self.bot_token = bot_token or "your-bot-token"
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self._http = None
 
     def process_update(self, update: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -166,6 +167,35 @@ class TelegramAdapter:
 
         return response.json()
 
+    async def send_message_async(self, chat_id: str, text: str, **kwargs) -> Dict[str, Any]:
+        """
+        Send a message to a chat without blocking the event loop.
+
+        Uses a pooled httpx.AsyncClient (keep-alive) shared by every call on
+        this adapter. Call aclose() on shutdown.
+        """
+        payload = {"chat_id": chat_id, "text": text, **kwargs}
+
+        response = await self._get_http().post(f"{self.api_url}/sendMessage", json=payload)
+
+        return response.json()
+
+    def _get_http(self):
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     def answer_callback(
         self, callback_id: str, text: str = None, show_alert: bool = False
     ) -> Dict[str, Any]:
@@ -8,6 +8,7 @@ Provides HTTP endpoints for:
 - Authentication and rate limiting
 """
 
+import hmac
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -22,6 +23,10 @@ from pydantic import BaseModel, Field
 
 from core.gateway.adapters import TelegramAdapter
 from core.gateway.rate_limiter import RateLimiter
+from core.gateway.webhook_queue import TelegramUpdateQueue
+from core.hooks.runner import close_hook_runner
+from core.skills.sandbox import close_sandbox_pool
+from core.skills.watcher import start_skill_watcher, stop_skill_watcher
 from core.vps_agent.agent import process_message_async
 
 # Configure logging
@@ -48,6 +53,15 @@ GATEWAY_ALLOWED_ORIGINS = [
 # Rate limiter (in-memory, replace with Redis in production)
 rate_limiter = RateLimiter(requests_per_minute=60)
 
+# Telegram webhook: secret header (setWebhook secret_token) and background workers
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+telegram_queue = TelegramUpdateQueue(
+    adapter=TelegramAdapter(bot_token=os.getenv("TELEGRAM_BOT_TOKEN")),
+    process_message=process_message_async,
+    workers=int(os.getenv("GATEWAY_TELEGRAM_WORKERS", "2")),
+    max_queue_size=int(os.getenv("GATEWAY_TELEGRAM_QUEUE_SIZE", "100")),
+)
+
 
 def verify_gateway_auth(api_key: Optional[str]) -> bool:
     """Verify if the provided API key is valid."""
@@ -104,8 +118,14 @@ async def lifespan(app: FastAPI):
     """Lifespan context for startup and shutdown events."""
     logger.info("🚀 Gateway Module starting...")
     logger.info("📡 HTTP endpoints initializing...")
+    telegram_queue.start()
+    start_skill_watcher()
     yield
     logger.info("👋 Gateway Module shutting down...")
+    await stop_skill_watcher()
+    await telegram_queue.stop()
+    await close_hook_runner()
+    await close_sandbox_pool()
 
 
 # ============ FastAPI App ============
@@ -259,50 +279,58 @@ async def get_capabilities():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/v1/skills/cache", tags=["Capabilities"])
+async def get_skill_cache_stats(user_identifier: str = Depends(verify_api_key)):
+    """Per-skill result cache counters (hits, misses, coalesced calls, hit ratio)."""
+    from core.skills.registry import get_skill_registry
+
+    return {"skills": get_skill_registry().cache_stats()}
+
+
+@app.get("/api/v1/hooks/stats", tags=["Capabilities"])
+async def get_hook_stats(user_identifier: str = Depends(verify_api_key)):
+    """Per-hook timing (calls, errors, timeouts, avg/max ms) and post hook queue state."""
+    from core.hooks.runner import get_hook_runner
+
+    return get_hook_runner().stats()
+
+
 @app.post("/api/v1/webhook/telegram", tags=["Webhooks"])
 async def telegram_webhook(request: Request):
     """
     Telegram webhook endpoint.
 
-    Receives updates from Telegram and processes them through the agent.
+    Validates the update, enqueues it and returns 200 immediately; background
+    workers run the agent and reply asynchronously. Updates are deduplicated
+    by update_id, so Telegram retries are never processed twice.
     Isso unifica o entry point: Telegram → Gateway → Agent (em vez de polling).
     """
+    if TELEGRAM_WEBHOOK_SECRET and not hmac.compare_digest(
+        request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""), TELEGRAM_WEBHOOK_SECRET
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+
     # Verify rate limit
     if not rate_limiter.allow_request("telegram:webhook"):
         return JSONResponse(status_code=429, content={"error": "Rate limited"})
 
     try:
         update = await request.json()
-        logger.info(f"📨 Telegram update received: {update.get('update_id', 'unknown')}")
-
-        # Process through Telegram adapter
-        adapter = TelegramAdapter()
-        result = adapter.process_update(update)
-
-        # Se for uma mensagem, processar através do agente
-        if result.get("type") == "message" and result.get("text"):
-            user_id = result.get("user_id")
-            text = result.get("text")
-            chat_id = result.get("chat_id")
-
-            # Processar via agente
-            agent_result = await process_message_async(user_id=user_id, message=text)
-
-            # Responder ao usuário
-            response_text = (
-                agent_result.get("response", "Erro ao processar")
-                if isinstance(agent_result, dict)
-                else str(agent_result)
-            )
-            adapter.send_message(chat_id, response_text)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
 
-            return {"ok": True, "processed": True, "response": response_text}
+    if not isinstance(update, dict) or "update_id" not in update:
+        raise HTTPException(status_code=400, detail="Missing update_id")
 
-        return result
+    update_id = update["update_id"]
+    status = telegram_queue.enqueue(update)
+    logger.info(f"📨 Telegram update {update_id}: {status} (depth={telegram_queue.depth()})")
 
-    except Exception as e:
-        logger.error(f"❌ Telegram webhook error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if status == "full":
+        # 503 faz o Telegram reenviar mais tarde em vez de perder o update.
+        return JSONResponse(status_code=503, content={"ok": False, "error": "Queue full"})
+
+    return {"ok": True, "update_id": update_id, "status": status}
 
 
 @app.get("/api/v1/sessions/{session_id}", tags=["Sessions"])
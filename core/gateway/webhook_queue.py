@@ -0,0 +1,160 @@
+"""
+Telegram Webhook Queue for Gateway Module
+
+Decouples the webhook HTTP response from agent processing:
+- the endpoint validates, deduplicates by update_id and enqueues
+- a pool of background workers runs the agent turn
+- replies go out through the adapter's pooled async HTTP client
+
+Updates are sharded by chat_id, so each chat is handled by a single worker
+and its messages are answered in arrival order.
+"""
+
+import asyncio
+import logging
+import zlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.gateway.adapters import TelegramAdapter
+
+logger = logging.getLogger(__name__)
+
+AgentCallable = Callable[..., Awaitable[Any]]
+
+
+class UpdateDeduplicator:
+    """Bounded LRU of recently seen update_ids."""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+    def seen(self, update_id: str) -> bool:
+        return update_id in self._seen
+
+    def mark(self, update_id: str) -> None:
+        self._seen[update_id] = None
+        self._seen.move_to_end(update_id)
+        while len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+
+
+class TelegramUpdateQueue:
+    """
+    Background worker pool for Telegram webhook updates.
+
+    Use enqueue() from the endpoint; start()/stop() from the app lifespan.
+    """
+
+    def __init__(
+        self,
+        adapter: TelegramAdapter,
+        process_message: AgentCallable,
+        workers: int = 2,
+        max_queue_size: int = 100,
+        dedup_size: int = 10000,
+    ):
+        self.adapter = adapter
+        self.process_message = process_message
+        self.workers = max(1, workers)
+        self.max_queue_size = max_queue_size
+        self.dedup = UpdateDeduplicator(dedup_size)
+
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {"enqueued": 0, "duplicates": 0, "rejected": 0, "processed": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the worker pool (idempotent)."""
+        if self._tasks:
+            return
+        self._queues = [asyncio.Queue(maxsize=self.max_queue_size) for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.create_task(self._worker(queue), name=f"telegram-webhook-worker-{index}")
+            for index, queue in enumerate(self._queues)
+        ]
+        logger.info(f"🧵 Telegram webhook workers started: {self.workers}")
+
+    async def stop(self) -> None:
+        """Cancel workers and close the pooled HTTP client."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._queues = []
+        await self.adapter.aclose()
+
+    def enqueue(self, update: Dict[str, Any]) -> str:
+        """
+        Queue an update for background processing.
+
+        Returns:
+            "queued", "duplicate" or "full"
+        """
+        update_id = str(update["update_id"])
+        if self.dedup.seen(update_id):
+            self.stats["duplicates"] += 1
+            return "duplicate"
+
+        self.start()
+        queue = self._queues[self._shard(update)]
+        try:
+            queue.put_nowait(update)
+        except asyncio.QueueFull:
+            # Nao marca como visto: o retry do Telegram tenta de novo.
+            self.stats["rejected"] += 1
+            return "full"
+
+        self.dedup.mark(update_id)
+        self.stats["enqueued"] += 1
+        return "queued"
+
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    async def join(self) -> None:
+        """Wait until every queued update has been handled."""
+        for queue in self._queues:
+            await queue.join()
+
+    def _shard(self, update: Dict[str, Any]) -> int:
+        message = update.get("message") or {}
+        chat_id = str((message.get("chat") or {}).get("id", update["update_id"]))
+        return zlib.crc32(chat_id.encode()) % self.workers
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            update = await queue.get()
+            try:
+                await self._handle(update)
+                self.stats["processed"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"❌ Telegram update {update.get('update_id')} failed: {e}")
+            finally:
+                queue.task_done()
+
+    async def _handle(self, update: Dict[str, Any]) -> Optional[str]:
+        result = self.adapter.process_update(update)
+        if result.get("type") != "message" or not result.get("text"):
+            return None
+
+        agent_result = await self.process_message(
+            user_id=result.get("user_id"), message=result.get("text")
+        )
+        response_text = (
+            agent_result.get("response", "Erro ao processar")
+            if isinstance(agent_result, dict)
+            else str(agent_result)
+        )
+        await self.adapter.send_message_async(result.get("chat_id"), response_text)
+        return response_text
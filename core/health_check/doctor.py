@@ -236,30 +236,49 @@ class HealthCheck:
                 details={"error": str(e)},
             )
 
+    def _resource_sample(self):
+        """Última amostra do ResourceSampler compartilhado (None fora do Linux)."""
+        try:
+            from core.resource_manager.sampler import get_resource_sampler
+
+            return get_resource_sampler().latest()
+        except Exception:
+            return None
+
+    def _classify_memory(self, percent: float, details: Dict[str, Any]) -> HealthCheckResult:
+        if percent >= self.MEMORY_CRITICAL_THRESHOLD:
+            status = HealthStatus.UNHEALTHY
+            message = f"Memória crítica: {percent:.1f}% usado"
+        elif percent >= self.MEMORY_WARNING_THRESHOLD:
+            status = HealthStatus.DEGRADED
+            message = f"Memória elevada: {percent:.1f}% usado"
+        else:
+            status = HealthStatus.HEALTHY
+            message = f"Memória normal: {percent:.1f}% usado"
+        return HealthCheckResult(name="memory", status=status, message=message, details=details)
+
     def check_memory(self) -> HealthCheckResult:
         """Verifica uso de memória."""
+        sample = self._resource_sample()
+        if sample is not None and sample.mem_total_mb > 0:
+            return self._classify_memory(
+                sample.mem_used_percent,
+                {
+                    "percent": round(sample.mem_used_percent, 2),
+                    "used_gb": sample.mem_used_mb / 1024,
+                    "available_gb": sample.mem_available_mb / 1024,
+                    "total_gb": sample.mem_total_mb / 1024,
+                },
+            )
+
         try:
             import psutil
 
             memory = psutil.virtual_memory()
-            percent = memory.percent
-
-            if percent >= self.MEMORY_CRITICAL_THRESHOLD:
-                status = HealthStatus.UNHEALTHY
-                message = f"Memória crítica: {percent:.1f}% usado"
-            elif percent >= self.MEMORY_WARNING_THRESHOLD:
-                status = HealthStatus.DEGRADED
-                message = f"Memória elevada: {percent:.1f}% usado"
-            else:
-                status = HealthStatus.HEALTHY
-                message = f"Memória normal: {percent:.1f}% usado"
-
-            return HealthCheckResult(
-                name="memory",
-                status=status,
-                message=message,
-                details={
-                    "percent": percent,
+            return self._classify_memory(
+                memory.percent,
+                {
+                    "percent": memory.percent,
                     "used_gb": memory.used / (1024**3),
                     "available_gb": memory.available / (1024**3),
                     "total_gb": memory.total / (1024**3),
@@ -280,28 +299,43 @@ class HealthCheck:
                 details={"error": str(e)},
             )
 
+    def _classify_cpu(self, percent: float, details: Dict[str, Any]) -> HealthCheckResult:
+        if percent >= self.CPU_CRITICAL_THRESHOLD:
+            status = HealthStatus.UNHEALTHY
+            message = f"CPU crítica: {percent:.1f}% usado"
+        elif percent >= self.CPU_WARNING_THRESHOLD:
+            status = HealthStatus.DEGRADED
+            message = f"CPU elevada: {percent:.1f}% usado"
+        else:
+            status = HealthStatus.HEALTHY
+            message = f"CPU normal: {percent:.1f}% usado"
+        return HealthCheckResult(name="cpu", status=status, message=message, details=details)
+
     def check_cpu(self) -> HealthCheckResult:
-        """Verifica uso de CPU."""
+        """Verifica uso de CPU (média do último minuto, sem bloquear)."""
+        sample = self._resource_sample()
+        if sample is not None and sample.cpu_percent is not None:
+            from core.resource_manager.sampler import get_resource_sampler
+
+            percent = get_resource_sampler().smoothed(60)["cpu_percent"]
+            if percent is None:
+                percent = sample.cpu_percent
+            return self._classify_cpu(
+                percent,
+                {
+                    "percent": percent,
+                    "cores": os.cpu_count(),
+                    "load_1m": sample.load_1m,
+                },
+            )
+
         try:
             import psutil
 
-            percent = psutil.cpu_percent(interval=1)
-
-            if percent >= self.CPU_CRITICAL_THRESHOLD:
-                status = HealthStatus.UNHEALTHY
-                message = f"CPU crítica: {percent:.1f}% usado"
-            elif percent >= self.CPU_WARNING_THRESHOLD:
-                status = HealthStatus.DEGRADED
-                message = f"CPU elevada: {percent:.1f}% usado"
-            else:
-                status = HealthStatus.HEALTHY
-                message = f"CPU normal: {percent:.1f}% usado"
-
-            return HealthCheckResult(
-                name="cpu",
-                status=status,
-                message=message,
-                details={
+            percent = psutil.cpu_percent(interval=None)
+            return self._classify_cpu(
+                percent,
+                {
                     "percent": percent,
                     "cores": psutil.cpu_count(),
                     "frequency_mhz": psutil.cpu_freq().current if psutil.cpu_freq() else None,
@@ -319,30 +353,40 @@ class HealthCheck:
                 details={"error": str(e)},
             )
 
+    def _classify_disk(self, percent: float, details: Dict[str, Any]) -> HealthCheckResult:
+        if percent >= self.DISK_CRITICAL_THRESHOLD:
+            status = HealthStatus.UNHEALTHY
+            message = f"Disco crítico: {percent:.1f}% usado"
+        elif percent >= self.DISK_WARNING_THRESHOLD:
+            status = HealthStatus.DEGRADED
+            message = f"Disco elevado: {percent:.1f}% usado"
+        else:
+            status = HealthStatus.HEALTHY
+            message = f"Disco normal: {percent:.1f}% usado"
+        return HealthCheckResult(name="disk", status=status, message=message, details=details)
+
     def check_disk(self) -> HealthCheckResult:
         """Verifica uso de disco."""
+        sample = self._resource_sample()
+        if sample is not None and sample.disk_total_gb > 0:
+            return self._classify_disk(
+                sample.disk_percent,
+                {
+                    "percent": round(sample.disk_percent, 2),
+                    "used_gb": sample.disk_used_gb,
+                    "free_gb": sample.disk_free_gb,
+                    "total_gb": sample.disk_total_gb,
+                },
+            )
+
         try:
             import psutil
 
             disk = psutil.disk_usage("/")
-            percent = disk.percent
-
-            if percent >= self.DISK_CRITICAL_THRESHOLD:
-                status = HealthStatus.UNHEALTHY
-                message = f"Disco crítico: {percent:.1f}% usado"
-            elif percent >= self.DISK_WARNING_THRESHOLD:
-                status = HealthStatus.DEGRADED
-                message = f"Disco elevado: {percent:.1f}% usado"
-            else:
-                status = HealthStatus.HEALTHY
-                message = f"Disco normal: {percent:.1f}% usado"
-
-            return HealthCheckResult(
-                name="disk",
-                status=status,
-                message=message,
-                details={
-                    "percent": percent,
+            return self._classify_disk(
+                disk.percent,
+                {
+                    "percent": disk.percent,
                     "used_gb": disk.used / (1024**3),
                     "free_gb": disk.free / (1024**3),
                     "total_gb": disk.total / (1024**3),
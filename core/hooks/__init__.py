@@ -1,5 +1,12 @@
 """Hook System — pre/post execution hooks para skills."""
 
+from .metrics import SkillMetricsAggregator, get_skill_metrics
 from .runner import HookContext, HookRunner, get_hook_runner
 
-__all__ = ["HookRunner", "HookContext", "get_hook_runner"]
+__all__ = [
+    "HookRunner",
+    "HookContext",
+    "get_hook_runner",
+    "SkillMetricsAggregator",
+    "get_skill_metrics",
+]
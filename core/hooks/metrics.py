@@ -0,0 +1,286 @@
+"""
+Skill Metrics — agregador in-process de uso de skills.
+
+Alimentado pelo post hook `metrics_hook`: acumula deltas de sucesso/falha e
+histograma de latencia por skill e descarrega tudo no PostgreSQL com um unico
+upsert em lote por intervalo. Contadores legados `skill_usage:*` no Redis sao
+lidos e zerados atomicamente (GETDEL em pipeline) no mesmo flush.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Limites superiores (ms) dos buckets do histograma; o ultimo bucket e +inf.
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+REDIS_USAGE_PATTERN = "skill_usage:*"
+
+UPSERT_SQL = """
+INSERT INTO agent_skills (
+    skill_name, execution_steps, success_count, failure_count,
+    total_duration_ms, latency_histogram, last_used_at
+)
+VALUES %s
+ON CONFLICT (skill_name) DO UPDATE SET
+    success_count = agent_skills.success_count + EXCLUDED.success_count,
+    failure_count = agent_skills.failure_count + EXCLUDED.failure_count,
+    total_duration_ms = COALESCE(agent_skills.total_duration_ms, 0) + EXCLUDED.total_duration_ms,
+    latency_histogram = (
+        SELECT COALESCE(
+            jsonb_object_agg(
+                k,
+                COALESCE((agent_skills.latency_histogram ->> k)::bigint, 0)
+                + COALESCE((EXCLUDED.latency_histogram ->> k)::bigint, 0)
+            ),
+            '{}'::jsonb
+        )
+        FROM jsonb_object_keys(
+            COALESCE(agent_skills.latency_histogram, '{}'::jsonb) || EXCLUDED.latency_histogram
+        ) AS k
+    ),
+    last_used_at = GREATEST(agent_skills.last_used_at, EXCLUDED.last_used_at)
+"""
+
+UPSERT_TEMPLATE = "(%s, '[]'::jsonb, %s, %s, %s, %s::jsonb, NOW())"
+
+
+def _bucket_label(index: int) -> str:
+    if index < len(LATENCY_BUCKETS_MS):
+        return f"le_{LATENCY_BUCKETS_MS[index]}"
+    return "le_inf"
+
+
+@dataclass
+class SkillStats:
+    """Contadores de um skill (delta pendente ou total do processo)."""
+
+    success: int = 0
+    failure: int = 0
+    total_duration_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def observe(self, success: bool, duration_ms: Optional[float] = None):
+        if success:
+            self.success += 1
+        else:
+            self.failure += 1
+        if duration_ms is None:
+            return
+        self.total_duration_ms += duration_ms
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def merge(self, other: "SkillStats"):
+        self.success += other.success
+        self.failure += other.failure
+        self.total_duration_ms += other.total_duration_ms
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def histogram(self) -> Dict[str, int]:
+        return {_bucket_label(i): count for i, count in enumerate(self.buckets) if count}
+
+    def to_dict(self) -> Dict[str, Any]:
+        observed = sum(self.buckets)
+        return {
+            "success": self.success,
+            "failure": self.failure,
+            "total_duration_ms": round(self.total_duration_ms, 2),
+            "avg_duration_ms": round(self.total_duration_ms / observed, 2) if observed else None,
+            "latency_histogram": self.histogram(),
+        }
+
+
+class SkillMetricsAggregator:
+    """Agrega execucoes de skills em memoria e faz flush em lote."""
+
+    def __init__(self, flush_interval_seconds: float = 300.0):
+        self.flush_interval_seconds = flush_interval_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[str, SkillStats] = {}
+        self._totals: Dict[str, SkillStats] = {}
+        self._last_flush = time.monotonic()
+        self._flushing = False
+
+    def record(self, skill_name: str, success: bool, duration_ms: Optional[float] = None):
+        """Registra uma execucao (O(1), seguro entre threads)."""
+        with self._lock:
+            self._pending.setdefault(skill_name, SkillStats()).observe(success, duration_ms)
+            self._totals.setdefault(skill_name, SkillStats()).observe(success, duration_ms)
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending)
+
+    def flush_due(self, require_pending: bool = True) -> bool:
+        """True quando o intervalo de flush expirou (e ha deltas pendentes, por padrao)."""
+        with self._lock:
+            if self._flushing or (require_pending and not self._pending):
+                return False
+            return (time.monotonic() - self._last_flush) >= self.flush_interval_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Totais desde o inicio do processo (para export/diagnostico)."""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._totals.items()}
+
+    def drain(self) -> Dict[str, SkillStats]:
+        """Retira os deltas pendentes, zerando o acumulador."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            return pending
+
+    def restore(self, pending: Dict[str, SkillStats]):
+        """Devolve deltas que nao puderam ser persistidos."""
+        with self._lock:
+            for name, stats in pending.items():
+                self._pending.setdefault(name, SkillStats()).merge(stats)
+
+    @staticmethod
+    def drain_redis_counters(redis_client) -> Dict[str, int]:
+        """Le e zera `skill_usage:*` atomicamente (GETDEL numa pipeline MULTI)."""
+        keys = list(redis_client.scan_iter(match=REDIS_USAGE_PATTERN, count=200))
+        if not keys:
+            return {}
+
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            for key in keys:
+                pipe.getdel(key)
+            values = pipe.execute()
+        except Exception as exc:
+            # Redis < 6.2 nao tem GETDEL: GET + DEL dentro do mesmo MULTI.
+            logger.debug("skill_metrics_getdel_fallback", reason=str(exc))
+            pipe = redis_client.pipeline(transaction=True)
+            for key in keys:
+                pipe.get(key)
+                pipe.delete(key)
+            values = pipe.execute()[::2]
+
+        counters: Dict[str, int] = {}
+        for key, value in zip(keys, values):
+            if not value:
+                continue
+            name = key.decode() if isinstance(key, bytes) else str(key)
+            name = name.split(":", 1)[1]
+            try:
+                counters[name] = counters.get(name, 0) + int(value)
+            except (TypeError, ValueError):
+                continue
+        return counters
+
+    def flush(
+        self,
+        conn_factory: Optional[Callable[[], Any]] = None,
+        redis_client=None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Persiste deltas pendentes em um unico upsert em lote.
+
+        Returns:
+            Deltas persistidos por skill (vazio se nada pendente)
+        """
+        with self._lock:
+            if self._flushing:
+                return {}
+            self._flushing = True
+
+        pending = self.drain()
+        try:
+            if redis_client is not None:
+                try:
+                    for name, count in self.drain_redis_counters(redis_client).items():
+                        stats = pending.setdefault(name, SkillStats())
+                        stats.success += count
+                except Exception as exc:
+                    logger.warning("skill_metrics_redis_drain_error", error=str(exc))
+
+            if not pending:
+                return {}
+
+            rows = [
+                (
+                    name,
+                    stats.success,
+                    stats.failure,
+                    stats.total_duration_ms,
+                    json.dumps(stats.histogram()),
+                )
+                for name, stats in sorted(pending.items())
+            ]
+
+            from psycopg2.extras import execute_values
+
+            conn = (conn_factory or _default_conn_factory)()
+            try:
+                cur = conn.cursor()
+                execute_values(cur, UPSERT_SQL, rows, template=UPSERT_TEMPLATE)
+                conn.commit()
+            finally:
+                conn.close()
+
+            logger.info("skill_metrics_flushed", skills=len(rows))
+            return {name: stats.to_dict() for name, stats in pending.items()}
+        except Exception as exc:
+            self.restore(pending)
+            logger.error("skill_metrics_flush_error", error=str(exc))
+            return {}
+        finally:
+            with self._lock:
+                self._last_flush = time.monotonic()
+                self._flushing = False
+
+
+def _default_conn_factory():
+    import psycopg2
+
+    return psycopg2.connect(
+        host=os.getenv("POSTGRES_HOST", "127.0.0.1"),
+        port=int(os.getenv("POSTGRES_PORT", 5432)),
+        dbname=os.getenv("POSTGRES_DB", "vps_agent"),
+        user=os.getenv("POSTGRES_USER"),
+        password=os.getenv("POSTGRES_PASSWORD"),
+    )
+
+
+def _is_failure(ctx) -> bool:
+    if ctx.error:
+        return True
+    # execute_skill converte excecoes em texto de erro em vez de propagar.
+    return isinstance(ctx.result, str) and ctx.result.startswith("❌")
+
+
+# ============================================
+# Singleton + hook
+# ============================================
+
+_aggregator: Optional[SkillMetricsAggregator] = None
+
+
+def get_skill_metrics() -> SkillMetricsAggregator:
+    """Retorna instancia singleton do agregador."""
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = SkillMetricsAggregator(
+            flush_interval_seconds=float(os.getenv("SKILL_METRICS_FLUSH_SECONDS", "300"))
+        )
+    return _aggregator
+
+
+async def metrics_hook(ctx):
+    """Hook: alimenta o agregador e agenda flush em background quando vencido."""
+    aggregator = get_skill_metrics()
+    aggregator.record(ctx.skill_name, not _is_failure(ctx), ctx.duration_ms)
+    if aggregator.flush_due():
+        asyncio.get_running_loop().run_in_executor(None, aggregator.flush)
@@ -4,16 +4,35 @@ Hook System — pre/post execution hooks para skills.
 Inspirado no OpenClaw hook-runner-global.ts.
 Permite logging, metricas, e feedback loop
 sem modificar os skills individuais.
+
+Pre hooks rodam em paralelo sob um orcamento de latencia (HOOK_PRE_BUDGET_MS):
+o que nao terminar a tempo segue em background e nao atrasa o skill. Hooks
+registrados com `cache_ttl` guardam veredito + metadata por skill, entao o
+resultado de um hook lento fica disponivel na execucao seguinte. Hooks
+`critical=True` (ex: politicas que podem vetar) sempre sao aguardados.
+
+Post hooks sao fire-and-forget: `run_post` so enfileira o contexto e um worker
+em background roda todos os hooks em paralelo. O tempo de cada hook vai para
+o log (`hook_timing`) e para `HookRunner.stats()`.
 """
 
+import asyncio
+import os
 import time
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import structlog
 
+from .metrics import metrics_hook
+
 logger = structlog.get_logger()
 
+PRE_HOOK_BUDGET_MS = float(os.getenv("HOOK_PRE_BUDGET_MS", "100"))
+POST_HOOK_QUEUE_SIZE = int(os.getenv("HOOK_POST_QUEUE_SIZE", "1000"))
+POST_HOOK_TIMEOUT_SECONDS = float(os.getenv("HOOK_POST_TIMEOUT_SECONDS", "10"))
+FEEDBACK_CACHE_TTL_SECONDS = float(os.getenv("HOOK_FEEDBACK_CACHE_TTL_SECONDS", "60"))
+
 
 @dataclass
 class HookContext:
@@ -29,40 +48,269 @@ class HookContext:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class HookTiming:
+    """Contadores de tempo de um hook."""
+
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    cache_hits: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, duration_ms: float, error: bool = False, timeout: bool = False):
+        self.calls += 1
+        self.errors += int(error)
+        self.timeouts += int(timeout)
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cache_hits": self.cache_hits,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+@dataclass
+class _PreHook:
+    hook: Callable
+    cache_ttl: float = 0.0
+    critical: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.hook.__name__
+
+
+_MISSING = object()
+
+
 class HookRunner:
     """Executa hooks pre/post execution."""
 
-    def __init__(self):
-        self._pre_hooks: List[Callable] = []
+    def __init__(
+        self,
+        pre_budget_ms: float = PRE_HOOK_BUDGET_MS,
+        queue_size: int = POST_HOOK_QUEUE_SIZE,
+        post_timeout: float = POST_HOOK_TIMEOUT_SECONDS,
+    ):
+        self._pre_hooks: List[_PreHook] = []
         self._post_hooks: List[Callable] = []
+        self.pre_budget_ms = pre_budget_ms
+        self.post_timeout = post_timeout
+        self._queue_size = queue_size
+        # (hook, skill) -> (expira_em, veredito, metadata)
+        self._pre_cache: Dict[Tuple[str, str], Tuple[float, bool, Dict[str, Any]]] = {}
+        # Pre hooks que estouraram o orcamento e seguem rodando
+        self._background: Set[asyncio.Task] = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timings: Dict[Tuple[str, str], HookTiming] = {}
+        self._post_counters = {"enqueued": 0, "processed": 0, "dropped": 0}
+
+    def register_pre(self, hook: Callable, cache_ttl: float = 0.0, critical: bool = False):
+        """Registra hook pre-execucao.
 
-    def register_pre(self, hook: Callable):
-        """Registra hook pre-execucao."""
-        self._pre_hooks.append(hook)
+        cache_ttl > 0 reaproveita o resultado por skill durante esse tempo;
+        critical=True ignora o orcamento (o hook sempre e aguardado).
+        """
+        self._pre_hooks.append(_PreHook(hook, cache_ttl, critical))
 
     def register_post(self, hook: Callable):
         """Registra hook pos-execucao."""
         self._post_hooks.append(hook)
 
+    # ---------- timing ----------
+
+    def _timing(self, phase: str, name: str) -> HookTiming:
+        key = (phase, name)
+        if key not in self._timings:
+            self._timings[key] = HookTiming()
+        return self._timings[key]
+
+    def _record(self, phase: str, name: str, skill: str, started: float, **outcome):
+        duration_ms = (time.perf_counter() - started) * 1000
+        self._timing(phase, name).record(duration_ms, **outcome)
+        logger.debug(
+            "hook_timing",
+            phase=phase,
+            hook=name,
+            skill=skill,
+            duration_ms=round(duration_ms, 2),
+            **outcome,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Tempo por hook + estado da fila de post hooks."""
+        hooks: Dict[str, Dict[str, Any]] = {"pre": {}, "post": {}}
+        for (phase, name), timing in sorted(self._timings.items()):
+            hooks[phase][name] = timing.to_dict()
+        return {
+            **hooks,
+            "post_queue": {
+                **self._post_counters,
+                "pending": self._queue.qsize() if self._queue is not None else 0,
+            },
+            "pre_background": len(self._background),
+        }
+
+    # ---------- pre hooks ----------
+
+    def _cached_pre(self, spec: _PreHook, skill: str) -> Optional[Tuple[bool, Dict[str, Any]]]:
+        if spec.cache_ttl <= 0:
+            return None
+        entry = self._pre_cache.get((spec.name, skill))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        self._timing("pre", spec.name).cache_hits += 1
+        return entry[1], entry[2]
+
+    def invalidate_pre_cache(self, skill: Optional[str] = None):
+        """Descarta resultados cacheados (de um skill ou todos)."""
+        if skill is None:
+            self._pre_cache.clear()
+            return
+        for key in [key for key in self._pre_cache if key[1] == skill]:
+            del self._pre_cache[key]
+
+    async def _call_pre(self, spec: _PreHook, ctx: HookContext) -> Tuple[bool, Dict[str, Any]]:
+        """Roda o hook sobre uma copia do metadata e devolve (veredito, alteracoes)."""
+        probe = replace(ctx, metadata=dict(ctx.metadata))
+        started = time.perf_counter()
+        try:
+            result = await spec.hook(probe)
+        except Exception as e:
+            self._record("pre", spec.name, ctx.skill_name, started, error=True)
+            logger.error("pre_hook_error", hook=spec.name, error=str(e))
+            return True, {}
+        self._record("pre", spec.name, ctx.skill_name, started)
+        verdict = result is not False
+        updates = {
+            key: value
+            for key, value in probe.metadata.items()
+            if ctx.metadata.get(key, _MISSING) is not value
+        }
+        if spec.cache_ttl > 0:
+            expires = time.monotonic() + spec.cache_ttl
+            self._pre_cache[(spec.name, ctx.skill_name)] = (expires, verdict, updates)
+        return verdict, updates
+
+    def _detach(self, task: asyncio.Task, spec: _PreHook, ctx: HookContext):
+        self._timing("pre", spec.name).timeouts += 1
+        logger.warning(
+            "pre_hook_over_budget",
+            hook=spec.name,
+            skill=ctx.skill_name,
+            budget_ms=self.pre_budget_ms,
+            cached_next=spec.cache_ttl > 0,
+        )
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
     async def run_pre(self, ctx: HookContext) -> bool:
         """Roda hooks pre-execucao. Retorna False para cancelar."""
-        for hook in self._pre_hooks:
-            try:
-                result = await hook(ctx)
-                if result is False:
-                    logger.info("hook_vetoed", hook=hook.__name__, skill=ctx.skill_name)
-                    return False
-            except Exception as e:
-                logger.error("pre_hook_error", hook=hook.__name__, error=str(e))
+        results: List[Tuple[_PreHook, bool, Dict[str, Any]]] = []
+        pending: Dict[asyncio.Task, _PreHook] = {}
+        for spec in self._pre_hooks:
+            cached = self._cached_pre(spec, ctx.skill_name)
+            if cached is not None:
+                results.append((spec, *cached))
+            else:
+                pending[asyncio.ensure_future(self._call_pre(spec, ctx))] = spec
+
+        if pending:
+            done, late = await asyncio.wait(pending, timeout=self.pre_budget_ms / 1000)
+            critical = {task for task in late if pending[task].critical}
+            if critical:
+                await asyncio.wait(critical)
+                done |= critical
+            for task in late - critical:
+                self._detach(task, pending[task], ctx)
+            for task in done:
+                results.append((pending[task], *task.result()))
+
+        # Ordem de registro, como na execucao sequencial
+        order = {id(spec): index for index, spec in enumerate(self._pre_hooks)}
+        results.sort(key=lambda item: order[id(item[0])])
+        for spec, verdict, updates in results:
+            ctx.metadata.update(updates)
+            if not verdict:
+                logger.info("hook_vetoed", hook=spec.name, skill=ctx.skill_name)
+                return False
         return True
 
-    async def run_post(self, ctx: HookContext):
-        """Roda hooks pos-execucao."""
-        for hook in self._post_hooks:
+    # ---------- post hooks ----------
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop or self._worker.done():
+            # asyncio.Queue fica presa ao loop em que foi usada
+            if self._loop is not loop or self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._loop = loop
+            self._worker = loop.create_task(self._post_worker(self._queue))
+        return self._queue
+
+    async def _call_post(self, hook: Callable, ctx: HookContext):
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(hook(ctx), timeout=self.post_timeout)
+        except asyncio.TimeoutError:
+            self._record("post", hook.__name__, ctx.skill_name, started, timeout=True)
+            logger.error("post_hook_timeout", hook=hook.__name__, timeout=self.post_timeout)
+        except Exception as e:
+            self._record("post", hook.__name__, ctx.skill_name, started, error=True)
+            logger.error("post_hook_error", hook=hook.__name__, error=str(e))
+        else:
+            self._record("post", hook.__name__, ctx.skill_name, started)
+
+    async def _post_worker(self, queue: asyncio.Queue):
+        while True:
+            ctx = await queue.get()
             try:
-                await hook(ctx)
-            except Exception as e:
-                logger.error("post_hook_error", hook=hook.__name__, error=str(e))
+                await asyncio.gather(*(self._call_post(hook, ctx) for hook in self._post_hooks))
+                self._post_counters["processed"] += 1
+            finally:
+                queue.task_done()
+
+    async def run_post(self, ctx: HookContext):
+        """Enfileira os hooks pos-execucao (nao espera por eles)."""
+        if not self._post_hooks:
+            return
+        queue = self._ensure_worker()
+        try:
+            queue.put_nowait(ctx)
+            self._post_counters["enqueued"] += 1
+        except asyncio.QueueFull:
+            self._post_counters["dropped"] += 1
+            logger.warning("post_hook_queue_full", skill=ctx.skill_name, size=queue.maxsize)
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Espera a fila de post hooks esvaziar. False se estourar o timeout."""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def close(self, timeout: float = 5.0):
+        """Drena a fila e encerra o worker e os pre hooks em background."""
+        drained = await self.drain(timeout)
+        for task in [self._worker, *self._background]:
+            if task is not None and not task.done():
+                task.cancel()
+        self._worker = None
+        self._queue = None
+        logger.info("hook_runner_closed", drained=drained, **self._post_counters)
 
 
 # ============================================
@@ -90,19 +338,14 @@ async def feedback_pre_hook(ctx: HookContext):
     try:
         from ..vps_langgraph.learnings import learnings_manager
 
-        recent_failures = learnings_manager.search_learnings(ctx.skill_name, limit=5)
-        # Filtrar apenas erros de execucao recentes
-        errors = [
-            entry
-            for entry in recent_failures
-            if entry.get("category") == "execution_error" and not entry.get("success", True)
-        ]
-        if len(errors) >= 3:
-            ctx.metadata["warning"] = f"Este skill falhou {len(errors)}x recentemente"
+        # Lookup por chave no rollup (psycopg2 sincrono): fora do event loop
+        failures = await asyncio.to_thread(learnings_manager.recent_failure_count, ctx.skill_name)
+        if failures >= 3:
+            ctx.metadata["warning"] = f"Este skill falhou {failures}x recentemente"
             logger.warning(
                 "feedback_warning",
                 skill=ctx.skill_name,
-                failures=len(errors),
+                failures=failures,
             )
     except Exception as e:
         logger.debug("feedback_pre_hook_skip", reason=str(e))
@@ -115,7 +358,8 @@ async def learning_hook(ctx: HookContext):
         try:
             from ..vps_langgraph.learnings import learnings_manager
 
-            learnings_manager.add_learning(
+            await asyncio.to_thread(
+                learnings_manager.add_learning,
                 category="execution_error",
                 trigger=ctx.skill_name,
                 lesson=f"Erro ao executar {ctx.skill_name}: {ctx.error}",
@@ -138,8 +382,15 @@ def get_hook_runner() -> HookRunner:
     global _hook_runner
     if _hook_runner is None:
         _hook_runner = HookRunner()
-        _hook_runner.register_pre(feedback_pre_hook)
+        _hook_runner.register_pre(feedback_pre_hook, cache_ttl=FEEDBACK_CACHE_TTL_SECONDS)
         _hook_runner.register_post(logging_hook)
         _hook_runner.register_post(learning_hook)
-        logger.info("hook_runner_initialized", hooks=3)
+        _hook_runner.register_post(metrics_hook)
+        logger.info("hook_runner_initialized", hooks=4)
     return _hook_runner
+
+
+async def close_hook_runner():
+    """Drena os post hooks pendentes (shutdown do bot/gateway)."""
+    if _hook_runner is not None:
+        await _hook_runner.close()
@@ -118,6 +118,8 @@ class SoulManager:
         self._local_artifacts = _default_soul(owner_name=self._owner_name)
         self._local_proposals: dict[int, SoulChangeProposal] = {}
         self._local_proposal_seq = 0
+        # Incrementada quando um artifact muda neste processo (invalida cache de prompt)
+        self._revision = 0
 
     def _get_conn(self):
         return psycopg2.connect(**self._db_config)
@@ -126,6 +128,10 @@ class SoulManager:
     def challenge_mode_enabled(self) -> bool:
         return self._challenge_mode_enabled
 
+    @property
+    def revision(self) -> int:
+        return self._revision
+
     def get_artifact(self, artifact_type: SoulArtifactType) -> SoulArtifact:
         try:
             conn = self._get_conn()
@@ -352,6 +358,7 @@ class SoulManager:
             created_at=now,
         )
         self._local_artifacts[proposal.artifact_type] = artifact
+        self._revision += 1
 
         try:
             conn = self._get_conn()
@@ -9,7 +9,6 @@ The server will be available at http://localhost:8000/mcp
 """
 
 import os
-import subprocess
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -18,12 +17,14 @@ from fastapi_mcp import FastApiMCP
 
 from core.env import load_project_env
 from core.integrations import warmup_consumer_sync
+from core.resource_manager.docker_client import get_docker_client
 from core.resource_manager.manager import (
     get_available_ram,
     get_tools_status,
     start_tool,
     stop_tool,
 )
+from core.resource_manager.sampler import get_resource_sampler
 
 load_project_env()
 
@@ -41,6 +42,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("[MCP] Shutting down...")
+    await get_docker_client().close()
 
 
 # Create FastAPI app
@@ -73,49 +75,40 @@ async def require_mcp_api_key(request: Request, call_next):
     return await call_next(request)
 
 
-def get_docker_containers() -> list:
-    """Get all Docker containers with their status."""
-    result = subprocess.run(
-        ["docker", "ps", "-a", "--format", "{{.Names}}|{{.Status}}|{{.Image}}"],
-        capture_output=True,
-        text=True,
-    )
-    containers = []
-    for line in result.stdout.strip().split("\n"):
-        if line:
-            parts = line.split("|")
-            containers.append(
-                {
-                    "name": parts[0] if len(parts) > 0 else "",
-                    "status": parts[1] if len(parts) > 1 else "",
-                    "image": parts[2] if len(parts) > 2 else "",
-                }
-            )
-    return containers
+async def get_docker_containers() -> list:
+    """Get all Docker containers with their status (Engine API, cached)."""
+    containers = await get_docker_client().list_containers(all_containers=True)
+    return [{"name": c["name"], "status": c["status"], "image": c["image"]} for c in containers]
 
 
 def get_system_info() -> dict:
     """Get system information (CPU, RAM, Disk)."""
-    # RAM
-    ram_result = subprocess.run(["free", "-m"], capture_output=True, text=True)
-    ram_lines = ram_result.stdout.strip().split("\n")
-    ram_total = int(ram_lines[1].split()[1])
-    ram_used = int(ram_lines[1].split()[2])
-    ram_available = int(ram_lines[1].split()[6])
-
-    # CPU
-    cpu_result = subprocess.run(["top", "-bn1"], capture_output=True, text=True)
-    cpu_line = [line for line in cpu_result.stdout.split("\n") if "Cpu(s)" in line][0]
-    cpu_parts = cpu_line.split()
-    cpu_idle = float(cpu_parts[3].replace(",", "."))
-    cpu_usage = 100.0 - cpu_idle
+    sampler = get_resource_sampler()
+    sample = sampler.latest()
+    if sample is None:
+        # Sem amostra (fora do Linux ou antes da primeira leitura): psutil direto
+        import psutil
+
+        memory = psutil.virtual_memory()
+        return {
+            "ram_total_mb": int(memory.total / (1024 * 1024)),
+            "ram_used_mb": int(memory.used / (1024 * 1024)),
+            "ram_available_mb": int(memory.available / (1024 * 1024)),
+            "ram_percent": round(memory.percent, 1),
+            "cpu_usage_percent": round(psutil.cpu_percent(interval=None), 1),
+            "disk_percent": round(psutil.disk_usage("/").percent, 1),
+            "ram_trend_pct_per_min": None,
+        }
+    cpu_usage = sampler.smoothed(60)["cpu_percent"]
 
     return {
-        "ram_total_mb": ram_total,
-        "ram_used_mb": ram_used,
-        "ram_available_mb": ram_available,
-        "ram_percent": round((ram_used / ram_total) * 100, 1),
-        "cpu_usage_percent": round(cpu_usage, 1),
+        "ram_total_mb": sample.mem_total_mb,
+        "ram_used_mb": sample.mem_used_mb,
+        "ram_available_mb": sample.mem_available_mb,
+        "ram_percent": round(sample.mem_used_percent, 1),
+        "cpu_usage_percent": round(cpu_usage, 1) if cpu_usage is not None else None,
+        "disk_percent": round(sample.disk_percent, 1),
+        "ram_trend_pct_per_min": sampler.trend("mem_used_percent", seconds=300),
     }
 
 
@@ -143,7 +136,7 @@ async def get_ram_status() -> dict:
 async def list_containers() -> dict:
     """List all Docker containers and their status."""
     try:
-        containers = get_docker_containers()
+        containers = await get_docker_containers()
         return {"status": "success", "containers": containers}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -183,7 +176,7 @@ async def stop_tool_endpoint(tool_name: str) -> dict:
 async def list_services() -> dict:
     """List all core services and their status."""
     try:
-        containers = get_docker_containers()
+        containers = await get_docker_containers()
         # Filter for core services
         core_names = ["postgres", "redis", "telegram-bot", "langgraph", "vps-agent"]
         core_services = [
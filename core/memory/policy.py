@@ -1,5 +1,10 @@
 """
 Memory policy primitives for typed memory, retention, and redaction.
+
+Redaction compiles `sensitive_patterns` into one alternation regex (and
+`sensitive_keys` into one key matcher), cached per pattern set. A single
+`subn` per string both redacts and reports whether anything changed, and the
+iterative walker returns unchanged subtrees as-is instead of copying them.
 """
 
 from __future__ import annotations
@@ -7,6 +12,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Mapping
 
 
@@ -82,6 +88,122 @@ def _default_sensitive_patterns() -> tuple[re.Pattern[str], ...]:
     )
 
 
+_INLINE_FLAGS = re.compile(r"^\(\?([imsx]+)\)")
+_SCOPED_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE}
+_CONTAINERS = (Mapping, list, tuple)
+
+
+def _scoped(pattern: re.Pattern[str]) -> str:
+    """Pattern source with its flags as a scoped group, e.g. `(?i:...)`."""
+    source = pattern.pattern
+    leading = _INLINE_FLAGS.match(source)
+    if leading:
+        source = source[leading.end() :]
+    letters = "".join(flag for flag, bit in _SCOPED_FLAGS.items() if pattern.flags & bit)
+    return f"(?{letters}:{source})" if letters else f"(?:{source})"
+
+
+class _Redactor:
+    """Compiled matchers for one (patterns, keys, token) combination."""
+
+    def __init__(
+        self,
+        patterns: tuple[re.Pattern[str], ...],
+        keys: tuple[str, ...],
+        token: str,
+    ) -> None:
+        self.token = token
+        self.passes: tuple[re.Pattern[str], ...] = ()
+        if patterns:
+            try:
+                self.passes = (re.compile("|".join(_scoped(p) for p in patterns)),)
+            except re.error:
+                # Group names/backreferences that clash once merged: one pass each
+                self.passes = patterns
+        self.key_matcher = (
+            re.compile("|".join(re.escape(key.lower()) for key in keys)) if keys else None
+        )
+
+    def is_sensitive_key(self, key: Any) -> bool:
+        return bool(self.key_matcher and self.key_matcher.search(str(key).strip().lower()))
+
+    def redact_string(self, value: str) -> tuple[str, bool]:
+        changed = False
+        for pattern in self.passes:
+            value, count = pattern.subn(self.token, value)
+            changed = changed or count > 0
+        return value, changed
+
+    def redact(self, value: Any) -> tuple[Any, bool]:
+        if isinstance(value, str):
+            return self.redact_string(value)
+        if not isinstance(value, _CONTAINERS):
+            return value, False
+
+        stack = [_Frame(value)]
+        while True:
+            frame = stack[-1]
+            if frame.pos < len(frame.entries):
+                key, item = frame.entries[frame.pos]
+                frame.pos += 1
+                if frame.is_mapping and self.is_sensitive_key(key):
+                    frame.out.append(self.token)
+                    frame.changed = frame.changed or item != self.token
+                elif isinstance(item, _CONTAINERS):
+                    stack.append(_Frame(item))
+                elif isinstance(item, str):
+                    redacted, changed = self.redact_string(item)
+                    frame.out.append(redacted)
+                    frame.changed = frame.changed or changed
+                else:
+                    frame.out.append(item)
+                continue
+
+            stack.pop()
+            result = frame.build()
+            if not stack:
+                return result, frame.changed
+            parent = stack[-1]
+            parent.out.append(result)
+            parent.changed = parent.changed or frame.changed
+
+
+class _Frame:
+    """One container being walked by `_Redactor.redact`."""
+
+    __slots__ = ("source", "is_mapping", "entries", "out", "pos", "changed")
+
+    def __init__(self, source: Any) -> None:
+        self.source = source
+        self.is_mapping = isinstance(source, Mapping)
+        self.entries = list(source.items()) if self.is_mapping else list(enumerate(source))
+        self.out: list[Any] = []
+        self.pos = 0
+        self.changed = False
+
+    def build(self) -> Any:
+        if self.is_mapping:
+            if (
+                not self.changed
+                and type(self.source) is dict
+                and all(type(key) is str for key in self.source)
+            ):
+                return self.source
+            return {str(key): item for (key, _), item in zip(self.entries, self.out)}
+        if not self.changed:
+            return self.source
+        return tuple(self.out) if isinstance(self.source, tuple) else self.out
+
+
+@lru_cache(maxsize=32)
+def _redactor(
+    patterns: tuple[re.Pattern[str], ...],
+    keys: tuple[str, ...],
+    token: str,
+) -> _Redactor:
+    return _Redactor(patterns, keys, token)
+
+
 @dataclass(slots=True)
 class MemoryPolicy:
     """Retention and redaction defaults for all memory operations."""
@@ -106,30 +228,16 @@ class MemoryPolicy:
     def scope_for(self, memory_type: MemoryType) -> MemoryScope:
         return self.default_scope_by_type.get(memory_type, MemoryScope.USER)
 
-    def redact_value(self, value: Any) -> Any:
-        """Redact values recursively for known secret patterns."""
-        if isinstance(value, Mapping):
-            output: dict[str, Any] = {}
-            for key, item in value.items():
-                if self._is_sensitive_key(key):
-                    output[str(key)] = self.redaction_token
-                else:
-                    output[str(key)] = self.redact_value(item)
-            return output
-
-        if isinstance(value, list):
-            return [self.redact_value(item) for item in value]
+    def redact(self, value: Any) -> tuple[Any, bool]:
+        """Redact known secrets; returns (redacted value, whether anything changed).
 
-        if isinstance(value, tuple):
-            return tuple(self.redact_value(item) for item in value)
+        Unchanged subtrees are returned as-is (not copied).
+        """
+        return self._redactor().redact(value)
 
-        if isinstance(value, str):
-            redacted = value
-            for pattern in self.sensitive_patterns:
-                redacted = pattern.sub(self.redaction_token, redacted)
-            return redacted
-
-        return value
+    def redact_value(self, value: Any) -> Any:
+        """Redact values recursively for known secret patterns."""
+        return self.redact(value)[0]
 
     def sanitize_context(
         self,
@@ -148,5 +256,11 @@ class MemoryPolicy:
         return self.redact_value(filtered)
 
     def _is_sensitive_key(self, key: str) -> bool:
-        key_lc = key.strip().lower()
-        return any(token in key_lc for token in self.sensitive_keys)
+        return self._redactor().is_sensitive_key(key)
+
+    def _redactor(self) -> _Redactor:
+        return _redactor(
+            tuple(self.sensitive_patterns),
+            tuple(self.sensitive_keys),
+            self.redaction_token,
+        )
@@ -4,4 +4,6 @@ Resource Manager Package
 Gerenciamento de recursos da VPS (RAM, containers, ferramentas sob demanda).
 """
 
-__all__ = ["manager"]
+from .sampler import ResourceSample, ResourceSampler, get_resource_sampler
+
+__all__ = ["manager", "ResourceSample", "ResourceSampler", "get_resource_sampler"]
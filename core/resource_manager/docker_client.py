@@ -0,0 +1,269 @@
+"""
+Docker Client — acesso compartilhado à Docker Engine API pelo unix socket.
+
+Substitui `subprocess.run(["docker", ...])` (um fork do CLI por chamada,
+~100 ms+) por HTTP direto em /var/run/docker.sock, com conexões reusadas.
+
+A lista de containers fica num cache curto (DOCKER_CACHE_TTL_SECONDS). Quando
+a assinatura de eventos (/events, type=container) está conectada, cada evento
+de container invalida o cache e o TTL pode ser bem maior: a lista só é
+relida quando algo mudou de fato.
+
+Uso async (skills, endpoints):
+    containers = await get_docker_client().list_containers()
+Uso sync (resource manager):
+    containers = get_docker_client().list_containers_sync()
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+DOCKER_SOCKET = os.getenv("DOCKER_SOCKET", "/var/run/docker.sock")
+CACHE_TTL_SECONDS = float(os.getenv("DOCKER_CACHE_TTL_SECONDS", "2"))
+# TTL usado enquanto a assinatura de eventos está conectada (eventos invalidam)
+EVENTS_CACHE_TTL_SECONDS = 30.0
+REQUEST_TIMEOUT_SECONDS = 5.0
+EVENTS_RECONNECT_MAX_SECONDS = 30.0
+
+
+class DockerUnavailableError(Exception):
+    """Socket ausente, daemon parado ou resposta de erro da Engine API."""
+
+
+def _format_ports(ports: List[Dict[str, Any]]) -> str:
+    """Formata Ports da API como o `docker ps` (ex: 0.0.0.0:8080->80/tcp)."""
+    formatted = []
+    for port in ports or []:
+        private = f"{port.get('PrivatePort')}/{port.get('Type', 'tcp')}"
+        if port.get("PublicPort"):
+            formatted.append(f"{port.get('IP', '0.0.0.0')}:{port['PublicPort']}->{private}")
+        else:
+            formatted.append(private)
+    return ", ".join(dict.fromkeys(formatted))
+
+
+def normalize_container(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Container da API -> dict simples usado pelos consumidores."""
+    names = raw.get("Names") or []
+    return {
+        "id": (raw.get("Id") or "")[:12],
+        "name": names[0].lstrip("/") if names else "",
+        "image": raw.get("Image", ""),
+        "state": raw.get("State", ""),
+        "status": raw.get("Status", ""),
+        "ports": _format_ports(raw.get("Ports")),
+    }
+
+
+class DockerClient:
+    """Cliente da Engine API com cache de containers e assinatura de eventos."""
+
+    def __init__(
+        self,
+        socket_path: str = DOCKER_SOCKET,
+        cache_ttl: float = CACHE_TTL_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        sync_transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.socket_path = socket_path
+        self.cache_ttl = cache_ttl
+        self._transport = transport
+        self._sync_transport = sync_transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+        # all (bool) -> (timestamp, containers)
+        self._cache: Dict[bool, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._version: Optional[Dict[str, Any]] = None
+        self._events_task: Optional[asyncio.Task] = None
+        self.events_connected = False
+        self.stats = {"requests": 0, "cache_hits": 0, "events": 0}
+
+    # ---------- conexões ----------
+
+    def available(self) -> bool:
+        return self._transport is not None or os.path.exists(self.socket_path)
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # AsyncClient é preso ao event loop em que foi usado
+            transport = self._transport or httpx.AsyncHTTPTransport(uds=self.socket_path)
+            self._client = httpx.AsyncClient(
+                transport=transport, base_url="http://docker", timeout=REQUEST_TIMEOUT_SECONDS
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _blocking_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            transport = self._sync_transport or httpx.HTTPTransport(uds=self.socket_path)
+            self._sync_client = httpx.Client(
+                transport=transport, base_url="http://docker", timeout=REQUEST_TIMEOUT_SECONDS
+            )
+        return self._sync_client
+
+    @staticmethod
+    def _decode(response: httpx.Response) -> Any:
+        if response.status_code >= 400:
+            raise DockerUnavailableError(
+                f"Docker API {response.status_code}: {response.text[:200]}"
+            )
+        return response.json()
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        if not self.available():
+            raise DockerUnavailableError(f"socket não encontrado: {self.socket_path}")
+        self.stats["requests"] += 1
+        try:
+            response = await self._async_client().get(path, params=params)
+        except httpx.HTTPError as e:
+            raise DockerUnavailableError(str(e)) from e
+        return self._decode(response)
+
+    def _get_sync(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        if not self.available():
+            raise DockerUnavailableError(f"socket não encontrado: {self.socket_path}")
+        self.stats["requests"] += 1
+        try:
+            response = self._blocking_client().get(path, params=params)
+        except httpx.HTTPError as e:
+            raise DockerUnavailableError(str(e)) from e
+        return self._decode(response)
+
+    # ---------- cache ----------
+
+    def _ttl(self) -> float:
+        return EVENTS_CACHE_TTL_SECONDS if self.events_connected else self.cache_ttl
+
+    def _cached(self, all_containers: bool) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._cache.get(all_containers)
+            if entry and (time.monotonic() - entry[0]) < self._ttl():
+                self.stats["cache_hits"] += 1
+                return entry[1]
+        return None
+
+    def _store(self, all_containers: bool, raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        containers = [normalize_container(item) for item in raw]
+        with self._lock:
+            self._cache[all_containers] = (time.monotonic(), containers)
+        return containers
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    # ---------- API ----------
+
+    async def list_containers(self, all_containers: bool = False) -> List[Dict[str, Any]]:
+        """Containers (só rodando, ou todos com all_containers=True)."""
+        self.start_events()
+        cached = self._cached(all_containers)
+        if cached is not None:
+            return cached
+        raw = await self._get("/containers/json", {"all": "1" if all_containers else "0"})
+        return self._store(all_containers, raw)
+
+    def list_containers_sync(self, all_containers: bool = False) -> List[Dict[str, Any]]:
+        """Versão bloqueante (compartilha o cache) para código síncrono."""
+        cached = self._cached(all_containers)
+        if cached is not None:
+            return cached
+        raw = self._get_sync("/containers/json", {"all": "1" if all_containers else "0"})
+        return self._store(all_containers, raw)
+
+    async def version(self) -> Dict[str, Any]:
+        """GET /version (cacheado: só muda com upgrade do daemon)."""
+        if self._version is None:
+            self._version = await self._get("/version")
+        return self._version
+
+    # ---------- eventos ----------
+
+    def start_events(self) -> None:
+        """Assina /events no loop atual (idempotente; no-op sem socket)."""
+        if not self.available() or os.getenv("DOCKER_EVENTS_ENABLED", "true") != "true":
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._events_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._events_task = loop.create_task(self._watch_events())
+
+    def _handle_event(self, event: Dict[str, Any]) -> None:
+        self.stats["events"] += 1
+        self.invalidate()
+        if event.get("Action") in ("start", "die", "destroy", "create"):
+            logger.debug(
+                "docker_event",
+                action=event.get("Action"),
+                container=(event.get("Actor") or {}).get("Attributes", {}).get("name"),
+            )
+
+    async def _consume_events(self) -> None:
+        params = {"filters": json.dumps({"type": ["container"]})}
+        client = self._async_client()
+        async with client.stream("GET", "/events", params=params, timeout=None) as response:
+            if response.status_code >= 400:
+                raise DockerUnavailableError(f"Docker events {response.status_code}")
+            self.events_connected = True
+            # Eventos perdidos antes da conexão: começa com cache limpo
+            self.invalidate()
+            async for line in response.aiter_lines():
+                if line.strip():
+                    self._handle_event(json.loads(line))
+
+    async def _watch_events(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                await self._consume_events()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                self.events_connected = False
+                raise
+            except Exception as e:
+                logger.warning("docker_events_disconnected", error=str(e), retry_in=backoff)
+            self.events_connected = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, EVENTS_RECONNECT_MAX_SECONDS)
+
+    async def close(self) -> None:
+        if self._events_task is not None:
+            self._events_task.cancel()
+            try:
+                await self._events_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._events_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+
+_client: Optional[DockerClient] = None
+
+
+def get_docker_client() -> DockerClient:
+    """Cliente global compartilhado."""
+    global _client
+    if _client is None:
+        _client = DockerClient()
+    return _client
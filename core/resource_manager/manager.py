@@ -8,6 +8,9 @@ import subprocess
 
 import structlog
 
+from .docker_client import get_docker_client
+from .sampler import get_resource_sampler
+
 logger = structlog.get_logger()
 
 # Configuração das ferramentas sob demanda
@@ -47,18 +50,19 @@ SAFETY_MARGIN_MB = 200
 
 
 def get_available_ram() -> int:
-    """Retorna RAM disponível em MB."""
-    result = subprocess.run(["free", "-m"], capture_output=True, text=True)
-    lines = result.stdout.strip().split("\n")
-    return int(lines[1].split()[6])
+    """Retorna RAM disponível em MB (última amostra do ResourceSampler)."""
+    sample = get_resource_sampler().latest()
+    if sample is not None:
+        return sample.mem_available_mb
+    # Sem amostra (fora do Linux ou antes da primeira leitura): psutil direto
+    import psutil
+
+    return int(psutil.virtual_memory().available / (1024 * 1024))
 
 
 def get_running_tools() -> list:
     """Retorna lista de ferramentas sob demanda rodando."""
-    result = subprocess.run(
-        ["docker", "ps", "--format", "{{.Names}}"], capture_output=True, text=True
-    )
-    containers = result.stdout.strip().split("\n") if result.stdout.strip() else []
+    containers = [c["name"] for c in get_docker_client().list_containers_sync()]
 
     running = []
     for tool_name, config in TOOLS_CONFIG.items():
@@ -113,6 +117,7 @@ def start_tool(tool_name: str) -> tuple[bool, str]:
         ["docker", "compose", "-f", compose_file, "up", "-d"], capture_output=True, text=True
     )
 
+    get_docker_client().invalidate()
     if result.returncode != 0:
         return False, f"Erro ao iniciar: {result.stderr[:300]}"
 
@@ -136,6 +141,7 @@ def stop_tool(tool_name: str) -> tuple[bool, str]:
         ["docker", "compose", "-f", compose_file, "down"], capture_output=True, text=True
     )
 
+    get_docker_client().invalidate()
     if result.returncode != 0:
         return False, f"Erro ao parar: {result.stderr[:300]}"
 
@@ -0,0 +1,249 @@
+"""
+Resource Sampler — amostragem compartilhada de RAM/CPU/disco.
+
+Uma thread em background le /proc/meminfo, /proc/stat e statvfs num intervalo
+fixo e guarda as amostras num ring buffer. Consumidores (cap gates, triggers,
+skills, health check) leem a ultima amostra ou uma janela suavizada sem abrir
+subprocessos nem bloquear; o buffer tambem da tendencias de curto prazo.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """Uma leitura pontual dos recursos da VPS."""
+
+    ts: float
+    mem_total_mb: int
+    mem_available_mb: int
+    swap_total_mb: int
+    swap_free_mb: int
+    cpu_percent: Optional[float]
+    load_1m: Optional[float]
+    disk_total_gb: float
+    disk_free_gb: float
+
+    @property
+    def mem_used_mb(self) -> int:
+        return self.mem_total_mb - self.mem_available_mb
+
+    @property
+    def mem_used_percent(self) -> float:
+        if self.mem_total_mb <= 0:
+            return 0.0
+        return (self.mem_used_mb / self.mem_total_mb) * 100
+
+    @property
+    def disk_used_gb(self) -> float:
+        return self.disk_total_gb - self.disk_free_gb
+
+    @property
+    def disk_percent(self) -> float:
+        if self.disk_total_gb <= 0:
+            return 0.0
+        return (self.disk_used_gb / self.disk_total_gb) * 100
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(
+            mem_used_mb=self.mem_used_mb,
+            mem_used_percent=round(self.mem_used_percent, 2),
+            disk_used_gb=round(self.disk_used_gb, 2),
+            disk_percent=round(self.disk_percent, 2),
+        )
+        return data
+
+
+SMOOTHED_FIELDS = ("mem_used_percent", "mem_available_mb", "cpu_percent", "disk_percent")
+
+
+def _read_meminfo(proc_root: str) -> Dict[str, int]:
+    values = {}
+    with open(os.path.join(proc_root, "meminfo"), "r") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            parts = rest.split()
+            if parts:
+                values[key.strip()] = int(parts[0])
+    return values
+
+
+def _read_cpu_times(proc_root: str) -> Tuple[int, int]:
+    """Retorna (idle, total) em jiffies da linha agregada `cpu` de /proc/stat."""
+    with open(os.path.join(proc_root, "stat"), "r") as f:
+        fields = f.readline().split()[1:]
+    times = [int(v) for v in fields]
+    idle = times[3] + (times[4] if len(times) > 4 else 0)  # idle + iowait
+    return idle, sum(times[:8])
+
+
+class ResourceSampler:
+    """Amostrador periodico com ring buffer de leituras recentes."""
+
+    def __init__(
+        self,
+        interval_seconds: float = 5.0,
+        window_size: int = 120,
+        disk_path: str = "/",
+        proc_root: str = "/proc",
+    ):
+        self.interval_seconds = interval_seconds
+        self.disk_path = disk_path
+        self.proc_root = proc_root
+        self._samples: deque = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+        self._prev_cpu: Optional[Tuple[int, int]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def sample_now(self) -> ResourceSample:
+        """Le os recursos agora e adiciona a amostra ao buffer."""
+        mem = _read_meminfo(self.proc_root)
+
+        cpu_percent = None
+        try:
+            idle, total = _read_cpu_times(self.proc_root)
+            with self._lock:
+                prev = self._prev_cpu
+                self._prev_cpu = (idle, total)
+            # Sem leitura anterior, usa a media desde o boot.
+            prev_idle, prev_total = prev if prev else (0, 0)
+            delta_total = total - prev_total
+            if delta_total > 0:
+                cpu_percent = round((1 - (idle - prev_idle) / delta_total) * 100, 2)
+        except (OSError, ValueError, IndexError):
+            pass
+
+        try:
+            load_1m = os.getloadavg()[0]
+        except OSError:
+            load_1m = None
+
+        disk_total_gb = disk_free_gb = 0.0
+        try:
+            st = os.statvfs(self.disk_path)
+            disk_total_gb = st.f_blocks * st.f_frsize / (1024**3)
+            disk_free_gb = st.f_bavail * st.f_frsize / (1024**3)
+        except OSError:
+            pass
+
+        sample = ResourceSample(
+            ts=time.time(),
+            mem_total_mb=mem.get("MemTotal", 0) // 1024,
+            mem_available_mb=mem.get("MemAvailable", mem.get("MemFree", 0)) // 1024,
+            swap_total_mb=mem.get("SwapTotal", 0) // 1024,
+            swap_free_mb=mem.get("SwapFree", 0) // 1024,
+            cpu_percent=cpu_percent,
+            load_1m=load_1m,
+            disk_total_gb=disk_total_gb,
+            disk_free_gb=disk_free_gb,
+        )
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def latest(self) -> Optional[ResourceSample]:
+        """
+        Ultima amostra. Se o buffer estiver vazio ou velho (thread parada),
+        faz uma leitura sincrona — barata, sem subprocesso.
+
+        Returns:
+            ResourceSample ou None se /proc nao estiver disponivel
+        """
+        with self._lock:
+            sample = self._samples[-1] if self._samples else None
+        if sample is not None and (time.time() - sample.ts) <= self.interval_seconds * 3:
+            return sample
+        try:
+            return self.sample_now()
+        except OSError as e:
+            logger.debug("resource_sample_unavailable", error=str(e))
+            return sample
+
+    def window(self, seconds: float) -> List[ResourceSample]:
+        """Amostras dos ultimos `seconds` segundos (mais antiga primeiro)."""
+        cutoff = time.time() - seconds
+        with self._lock:
+            return [s for s in self._samples if s.ts >= cutoff]
+
+    def smoothed(self, seconds: float = 60.0) -> Dict[str, Optional[float]]:
+        """Media dos campos principais na janela (cai para a ultima amostra)."""
+        samples = self.window(seconds)
+        if not samples:
+            latest = self.latest()
+            samples = [latest] if latest else []
+
+        result: Dict[str, Optional[float]] = {}
+        for name in SMOOTHED_FIELDS:
+            values = [getattr(s, name) for s in samples if getattr(s, name) is not None]
+            result[name] = round(sum(values) / len(values), 2) if values else None
+        result["samples"] = len(samples)
+        return result
+
+    def trend(self, field_name: str, seconds: float = 300.0) -> Optional[float]:
+        """Variacao por minuto do campo na janela (regressao linear simples)."""
+        points = [
+            (s.ts, getattr(s, field_name))
+            for s in self.window(seconds)
+            if getattr(s, field_name) is not None
+        ]
+        if len(points) < 2:
+            return None
+        n = len(points)
+        mean_t = sum(t for t, _ in points) / n
+        mean_v = sum(v for _, v in points) / n
+        denom = sum((t - mean_t) ** 2 for t, _ in points)
+        if denom == 0:
+            return None
+        slope = sum((t - mean_t) * (v - mean_v) for t, v in points) / denom
+        return round(slope * 60, 4)
+
+    def start(self):
+        """Inicia a thread de amostragem (idempotente)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        logger.info("resource_sampler_started", interval=self.interval_seconds)
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample_now()
+            except Exception as e:
+                logger.debug("resource_sampler_error", error=str(e))
+            self._stop.wait(self.interval_seconds)
+
+
+# Singleton
+_sampler: Optional[ResourceSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """Retorna o amostrador global, iniciando a thread no primeiro uso."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                sampler = ResourceSampler(
+                    interval_seconds=float(os.getenv("RESOURCE_SAMPLER_INTERVAL_SECONDS", "5"))
+                )
+                if os.path.exists(os.path.join(sampler.proc_root, "meminfo")):
+                    sampler.start()
+                _sampler = sampler
+    return _sampler
@@ -14,6 +14,7 @@ from .allowlist import (
     ResourceType,
     SecurityAllowlist,
     create_default_allowlist,
+    get_allowlist,
     load_allowlist_from_file,
     save_allowlist_to_file,
 )
@@ -25,6 +26,7 @@ __all__ = [
     "AllowlistResult",
     "SecurityAllowlist",
     "create_default_allowlist",
+    "get_allowlist",
     "load_allowlist_from_file",
     "save_allowlist_to_file",
 ]
@@ -2,13 +2,30 @@
 Allowlist de Segurança - F1-07
 
 Sistema de allowlist para comandos e operações permitidas.
+
+As regras são compiladas uma vez por versão do conjunto: agrupadas por
+ResourceType e, dentro de cada tipo, juntas numa única regex de alternância
+por nível de permissão (um grupo nomeado por regra). `check` faz no máximo
+três `match` e guarda os veredictos recentes num LRU. `get_allowlist()` é o
+singleton usado pelo grafo; com SECURITY_ALLOWLIST_FILE ele recarrega o
+arquivo quando o mtime muda.
 """
 
 import json
+import os
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+VERDICT_CACHE_SIZE = 1024
 
 
 class PermissionLevel(Enum):
@@ -43,11 +60,64 @@ class AllowlistRule:
     def matches(self, value: str) -> bool:
         """Verifica se o valor corresponde ao padrão."""
         try:
-            return bool(re.match(self.pattern, value))
+            return bool(_compile(self.pattern).match(value))
         except re.error:
             return False
 
 
+_compile = lru_cache(maxsize=None)(re.compile)
+
+# Ordem de avaliação: DENY > REQUIRE_APPROVAL > ALLOW
+_TIER_ORDER = (PermissionLevel.DENY, PermissionLevel.REQUIRE_APPROVAL, PermissionLevel.ALLOW)
+
+
+class _CompiledTier:
+    """Regras de um (tipo, permissão) numa regex de alternância com grupos nomeados.
+
+    `re.match` da alternância casa se alguma regra casa, e a primeira
+    alternativa que casar é a primeira regra na ordem original. Padrões que
+    não podem ser combinados (grupos nomeados repetidos, backreferences
+    numéricas, flags inline) ficam numa lista avaliada regra a regra.
+    """
+
+    def __init__(self, rules: List[AllowlistRule]):
+        self.rules = rules
+        self.regex: Optional[re.Pattern] = None
+        self.groups: List[Tuple[str, AllowlistRule]] = []
+        self.fallback: List[AllowlistRule] = []
+
+        combinable = [rule for rule in rules if not _has_backreference(rule.pattern)]
+        self.fallback = [rule for rule in rules if rule not in combinable]
+        self.groups = [(f"_r{index}", rule) for index, rule in enumerate(combinable)]
+        if self.groups:
+            alternation = "|".join(f"(?P<{name}>{rule.pattern})" for name, rule in self.groups)
+            try:
+                self.regex = re.compile(alternation)
+            except re.error:
+                self.fallback = rules
+                self.groups = []
+
+    def first_match(self, value: str) -> Optional[AllowlistRule]:
+        """Primeira regra (na ordem original) que casa com o valor."""
+        candidates: List[AllowlistRule] = []
+        if self.regex is not None:
+            match = self.regex.match(value)
+            if match is not None:
+                for name, rule in self.groups:
+                    if match.group(name) is not None:
+                        candidates.append(rule)
+                        break
+        candidates.extend(rule for rule in self.fallback if rule.matches(value))
+        if not candidates:
+            return None
+        return min(candidates, key=self.rules.index)
+
+
+def _has_backreference(pattern: str) -> bool:
+    # \1..\9 mudariam de significado dentro da alternância (grupos renumerados)
+    return bool(re.search(r"(?<!\\)\\[1-9]", pattern))
+
+
 @dataclass
 class AllowlistResult:
     """Resultado da verificação de allowlist."""
@@ -64,6 +134,11 @@ class SecurityAllowlist:
 
     def __init__(self, rules: Optional[List[AllowlistRule]] = None):
         self.rules = rules or []
+        self.version = 0
+        self._index: Dict[ResourceType, Dict[PermissionLevel, _CompiledTier]] = {}
+        self._verdicts: "OrderedDict[Tuple[ResourceType, str], AllowlistResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
@@ -73,6 +148,22 @@ class SecurityAllowlist:
                 re.compile(rule.pattern)
             except re.error as e:
                 raise ValueError(f"Padrão inválido na regra '{rule.name}': {e}")
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Recompila o índice (chamar após alterar `rules` diretamente)."""
+        by_type: Dict[ResourceType, Dict[PermissionLevel, List[AllowlistRule]]] = {}
+        for rule in self.rules:
+            tiers = by_type.setdefault(rule.resource_type, {})
+            tiers.setdefault(rule.permission, []).append(rule)
+        index = {
+            resource_type: {permission: _CompiledTier(rules) for permission, rules in tiers.items()}
+            for resource_type, tiers in by_type.items()
+        }
+        with self._lock:
+            self._index = index
+            self._verdicts.clear()
+            self.version += 1
 
     def add_rule(self, rule: AllowlistRule) -> None:
         """Adiciona uma regra."""
@@ -81,12 +172,14 @@ class SecurityAllowlist:
             self.rules.append(rule)
         except re.error as e:
             raise ValueError(f"Padrão inválido: {e}")
+        self.invalidate()
 
     def remove_rule(self, rule_name: str) -> bool:
         """Remove uma regra pelo nome."""
         for i, rule in enumerate(self.rules):
             if rule.name == rule_name:
                 self.rules.pop(i)
+                self.invalidate()
                 return True
         return False
 
@@ -104,58 +197,51 @@ class SecurityAllowlist:
         Returns:
             Resultado da verificação
         """
-        # Buscar regras correspondentes
-        matching_rules = [
-            rule
-            for rule in self.rules
-            if rule.resource_type == resource_type and rule.matches(value)
-        ]
-
-        if not matching_rules:
-            # Sem regras correspondentes = DENY por padrão
-            return AllowlistResult(
-                allowed=False,
-                permission=PermissionLevel.DENY,
-                reason="Nenhuma regra correspondente encontrada",
-            )
-
+        key = (resource_type, value)
+        with self._lock:
+            cached = self._verdicts.get(key)
+            if cached is not None:
+                self._verdicts.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                return cached
+            self.cache_stats["misses"] += 1
+            tiers = self._index.get(resource_type, {})
+
+        result = self._evaluate(tiers, value)
+
+        with self._lock:
+            self._verdicts[key] = result
+            while len(self._verdicts) > VERDICT_CACHE_SIZE:
+                self._verdicts.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _evaluate(tiers: Dict[PermissionLevel, _CompiledTier], value: str) -> AllowlistResult:
         # Priorizar DENY > REQUIRE_APPROVAL > ALLOW
-        deny_rules = [r for r in matching_rules if r.permission == PermissionLevel.DENY]
-        if deny_rules:
+        for permission in _TIER_ORDER:
+            tier = tiers.get(permission)
+            rule = tier.first_match(value) if tier is not None else None
+            if rule is None:
+                continue
+            if permission == PermissionLevel.DENY:
+                reason = f"Negado pela regra: {rule.name}"
+            elif permission == PermissionLevel.REQUIRE_APPROVAL:
+                reason = f"Requer aprovação pela regra: {rule.name}"
+            else:
+                reason = f"Permitido pela regra: {rule.name}"
             return AllowlistResult(
-                allowed=False,
-                permission=PermissionLevel.DENY,
-                rule=deny_rules[0],
-                reason=f"Negado pela regra: {deny_rules[0].name}",
-                metadata={"rule_name": deny_rules[0].name},
-            )
-
-        approval_rules = [
-            r for r in matching_rules if r.permission == PermissionLevel.REQUIRE_APPROVAL
-        ]
-        if approval_rules:
-            return AllowlistResult(
-                allowed=False,
-                permission=PermissionLevel.REQUIRE_APPROVAL,
-                rule=approval_rules[0],
-                reason=f"Requer aprovação pela regra: {approval_rules[0].name}",
-                metadata={"rule_name": approval_rules[0].name},
-            )
-
-        allow_rules = [r for r in matching_rules if r.permission == PermissionLevel.ALLOW]
-        if allow_rules:
-            return AllowlistResult(
-                allowed=True,
-                permission=PermissionLevel.ALLOW,
-                rule=allow_rules[0],
-                reason=f"Permitido pela regra: {allow_rules[0].name}",
-                metadata={"rule_name": allow_rules[0].name},
+                allowed=permission == PermissionLevel.ALLOW,
+                permission=permission,
+                rule=rule,
+                reason=reason,
+                metadata={"rule_name": rule.name},
             )
 
+        # Sem regras correspondentes = DENY por padrão
         return AllowlistResult(
             allowed=False,
             permission=PermissionLevel.DENY,
-            reason="Nenhuma regra de permissão encontrada",
+            reason="Nenhuma regra correspondente encontrada",
         )
 
     def get_rules_by_type(self, resource_type: ResourceType) -> List[AllowlistRule]:
@@ -313,7 +399,9 @@ def load_allowlist_from_file(filepath: str) -> SecurityAllowlist:
     with open(filepath, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    return SecurityAllowlist(rules_data=data.get("rules", []))
+    allowlist = SecurityAllowlist()
+    allowlist.import_rules(data.get("rules", []))
+    return allowlist
 
 
 def save_allowlist_to_file(allowlist: SecurityAllowlist, filepath: str) -> None:
@@ -326,6 +414,57 @@ def save_allowlist_to_file(allowlist: SecurityAllowlist, filepath: str) -> None:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+# ============================================
+# SINGLETON (compilado uma vez, hot reload do arquivo)
+# ============================================
+
+_allowlist: Optional[SecurityAllowlist] = None
+_allowlist_source: Optional[Tuple[str, float]] = None
+_allowlist_lock = threading.Lock()
+
+
+def _file_signature(filepath: str) -> Optional[Tuple[str, float]]:
+    try:
+        return filepath, os.stat(filepath).st_mtime
+    except OSError:
+        return None
+
+
+def get_allowlist() -> SecurityAllowlist:
+    """
+    Allowlist compartilhada.
+
+    Usa SECURITY_ALLOWLIST_FILE (JSON de save_allowlist_to_file) se existir,
+    senão as regras padrão. O arquivo é relido quando o mtime muda; se a
+    nova versão for inválida, a anterior continua valendo.
+    """
+    global _allowlist, _allowlist_source
+    filepath = os.getenv("SECURITY_ALLOWLIST_FILE", "")
+    signature = _file_signature(filepath) if filepath else None
+    if _allowlist is not None and signature == _allowlist_source:
+        return _allowlist
+
+    with _allowlist_lock:
+        if _allowlist is not None and signature == _allowlist_source:
+            return _allowlist
+        if signature is None:
+            allowlist = create_default_allowlist()
+        else:
+            try:
+                allowlist = load_allowlist_from_file(filepath)
+            except (OSError, ValueError, KeyError) as e:
+                logger.error("allowlist_reload_failed", file=filepath, error=str(e))
+                if _allowlist is None:
+                    _allowlist = create_default_allowlist()
+                # Não tenta de novo até o arquivo mudar
+                _allowlist_source = signature
+                return _allowlist
+        if _allowlist is not None:
+            logger.info("allowlist_reloaded", file=filepath or None, rules=len(allowlist.rules))
+        _allowlist, _allowlist_source = allowlist, signature
+        return allowlist
+
+
 # ============================================
 # FUNÇÕES DE COMPATIBILIDADE PARA TESTES
 # ============================================
@@ -336,8 +475,7 @@ def is_allowed(action: str, resource: str = None) -> bool:
     Função de compatibilidade para testes.
     Verifica se uma ação é permitida.
     """
-    allowlist = create_default_allowlist()
-    result = allowlist.check(ResourceType.COMMAND, action)
+    result = get_allowlist().check(ResourceType.COMMAND, action)
     return result.allowed
 
 
@@ -346,8 +484,7 @@ def classify_action(action: str, resource: str = None) -> str:
     Função de compatibilidade para testes.
     Classifica o nível de segurança de uma ação.
     """
-    allowlist = create_default_allowlist()
-    result = allowlist.check(ResourceType.COMMAND, action)
+    result = get_allowlist().check(ResourceType.COMMAND, action)
 
     if result.permission == PermissionLevel.DENY:
         return "dangerous"
@@ -20,6 +20,7 @@ from core.skills.base import SkillBase
 logger = structlog.get_logger()
 
 _CNPJ_RE = re.compile(r"\b(\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}|\d{14})\b")
+_UNCACHED_TOOLS = frozenset({"health_check", "get_bootstrap_status"})
 
 
 class BrazilCNPJSkill(SkillBase):
@@ -27,7 +28,7 @@ class BrazilCNPJSkill(SkillBase):
         payload = args or {}
         query = str(payload.get("raw_input") or payload.get("query") or "").strip()
         if not query:
-            return "Informe um CNPJ, empresa, socios, grupo economico ou CNAE para consulta."
+            return "❌ Informe um CNPJ, empresa, socios, grupo economico ou CNAE para consulta."
 
         try:
             client = build_specialist_mcp_client(
@@ -35,18 +36,30 @@ class BrazilCNPJSkill(SkillBase):
                 client_name="agentvps-brazilcnpj",
             )
         except ConsumerSyncError as exc:
-            return str(exc)
+            return f"❌ {exc}"
 
         tool_name, tool_args = self._route(query)
         logger.info("brazilcnpj_execute", tool=tool_name)
         try:
             result = await client.call_tool(tool_name, tool_args)
         except ConsumerSyncError as exc:
-            return str(exc)
+            return f"❌ {exc}"
         except RemoteMCPError as exc:
             return await self._format_remote_failure(client=client, error=exc, tool_name=tool_name)
         return self._format(tool_name, result)
 
+    def is_cacheable(self, args: dict[str, Any] | None = None) -> bool:
+        # Health check e enrich (force_refresh) precisam ir sempre ao servidor
+        payload = args or {}
+        query = str(payload.get("raw_input") or payload.get("query") or "").strip()
+        if not query:
+            return True
+        try:
+            tool_name, tool_args = self._route(query)
+        except Exception:
+            return False
+        return tool_name not in _UNCACHED_TOOLS and not tool_args.get("force_refresh")
+
     def _route(self, query: str) -> tuple[str, dict[str, Any]]:
         msg = query.lower()
         cnpj = self._extract_cnpj(query)
@@ -187,7 +200,7 @@ class BrazilCNPJSkill(SkillBase):
 
         status_fragment = f"HTTP {error.status_code}" if error.status_code else error.error_type
         return (
-            "BrazilCNPJ\n\n"
+            "❌ BrazilCNPJ\n\n"
             f"A consulta falhou ao executar `{tool_name}`.\n"
             f"Falha detectada: {status_fragment} na etapa `{error.stage}`."
             f"{health_summary}\n"
@@ -15,6 +15,18 @@ from core.skills.base import SkillBase
 logger = structlog.get_logger()
 
 
+def _connect():
+    import psycopg2
+
+    return psycopg2.connect(
+        host=os.getenv("POSTGRES_HOST", "127.0.0.1"),
+        port=int(os.getenv("POSTGRES_PORT", 5432)),
+        dbname=os.getenv("POSTGRES_DB", "vps_agent"),
+        user=os.getenv("POSTGRES_USER"),
+        password=os.getenv("POSTGRES_PASSWORD"),
+    )
+
+
 class LogReaderSkill(SkillBase):
     """Lê logs internos do agente para auto-diagnóstico."""
 
@@ -57,31 +69,38 @@ class LogReaderSkill(SkillBase):
         return "\n".join(lines)
 
     def _read_skill_stats(self, limit: int) -> str:
-        """Lê estatísticas de uso de skills do Redis."""
-        import redis
+        """Lê estatísticas de uso de skills de agent_skills.
 
-        r = redis.Redis(
-            host=os.getenv("REDIS_HOST", "127.0.0.1"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            decode_responses=True,
-        )
-
-        stats = []
-        for key in r.scan_iter("skill_usage:*"):
-            skill_name = key.replace("skill_usage:", "")
-            count = r.get(key)
-            stats.append((skill_name, int(count or 0)))
-
-        r.close()
+        O agregador de métricas (core/hooks/metrics.py) persiste ali, a cada
+        SKILL_METRICS_FLUSH_SECONDS, as execuções e os contadores legados
+        `skill_usage:*` do Redis, que ele consome.
+        """
+        conn = _connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT skill_name, COALESCE(success_count, 0), COALESCE(failure_count, 0)
+                FROM agent_skills
+                WHERE COALESCE(success_count, 0) + COALESCE(failure_count, 0) > 0
+                ORDER BY COALESCE(success_count, 0) + COALESCE(failure_count, 0) DESC
+                LIMIT %s
+                """,
+                (limit,),
+            )
+            stats = cur.fetchall()
+        finally:
+            conn.close()
 
         if not stats:
             return "Nenhuma estatística de skills registrada ainda."
 
-        stats.sort(key=lambda x: x[1], reverse=True)
-
         lines = ["**Estatísticas de Skills**\n"]
-        for name, count in stats[:limit]:
-            lines.append(f"- **{name}**: {count} execuções")
+        for name, success, failure in stats:
+            line = f"- **{name}**: {success + failure} execuções"
+            if failure:
+                line += f" ({failure} falhas)"
+            lines.append(line)
 
         return "\n".join(lines)
 
@@ -101,15 +120,7 @@ class LogReaderSkill(SkillBase):
 
         # Contagem de conversas
         try:
-            import psycopg2
-
-            conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", "127.0.0.1"),
-                port=int(os.getenv("POSTGRES_PORT", 5432)),
-                dbname=os.getenv("POSTGRES_DB", "vps_agent"),
-                user=os.getenv("POSTGRES_USER"),
-                password=os.getenv("POSTGRES_PASSWORD"),
-            )
+            conn = _connect()
             cur = conn.cursor()
             cur.execute("SELECT COUNT(*) FROM conversation_log")
             count = cur.fetchone()[0]
@@ -2,6 +2,7 @@
 
 from typing import Any, Dict
 
+from core.resource_manager.sampler import get_resource_sampler
 from core.skills.base import SkillBase
 
 
@@ -10,25 +11,28 @@ class RamSkill(SkillBase):
 
     async def execute(self, args: Dict[str, Any] = None) -> str:
         try:
-            with open("/proc/meminfo", "r") as f:
-                meminfo = f.read()
-
-            values = {}
-            for line in meminfo.split("\n"):
-                if ":" in line:
-                    key, val = line.split(":", 1)
-                    values[key.strip()] = int(val.strip().split()[0])
-
-            total = values.get("MemTotal", 0) // 1024
-            available = values.get("MemAvailable", 0) // 1024
-            used = total - available
-            pct = (used / total * 100) if total > 0 else 0
-
-            return (
-                f"🧠 **Uso de RAM**\n\n"
-                f"Total: {total} MB\n"
-                f"Usado: {used} MB ({pct:.1f}%)\n"
-                f"Disponível: {available} MB"
-            )
+            sampler = get_resource_sampler()
+            sample = sampler.latest()
+            if sample is None:
+                return "❌ Erro ao ler RAM: /proc/meminfo indisponível"
+
+            total = sample.mem_total_mb
+            available = sample.mem_available_mb
+            used = sample.mem_used_mb
+            pct = sample.mem_used_percent
+
+            lines = [
+                "🧠 **Uso de RAM**\n",
+                f"Total: {total} MB",
+                f"Usado: {used} MB ({pct:.1f}%)",
+                f"Disponível: {available} MB",
+            ]
+
+            trend = sampler.trend("mem_used_percent", seconds=300)
+            if trend is not None and abs(trend) >= 0.5:
+                direction = "subindo" if trend > 0 else "caindo"
+                lines.append(f"Tendência (5 min): {direction} {abs(trend):.1f} p.p./min")
+
+            return "\n".join(lines)
         except Exception as e:
             return f"❌ Erro ao ler RAM: {e}"
@@ -7,115 +7,128 @@ Classificação de comandos:
   DANGEROUS:  rm, kill, systemctl, docker stop/rm, apt install, pip install
   FORBIDDEN:  rm -rf /, chmod 777, dd if=, mkfs, iptables -F
 
+Pipelines e cadeias (|, ;, &&) são classificados segmento a segmento; o pior
+nível vence (ver core/skills/shell_classifier.py).
+
 Este skill é uma FUNÇÃO PURA:
 - Recebe 'command' como argumento estruturado (do function calling)
 - Classifica segurança
 - Executa o comando
 - Retorna output RAW (o LLM formata a resposta)
+
+A saída é lida em streaming para um buffer head+tail limitado por
+max_output_chars (memória constante mesmo com `cat` de log gigante). Acima de
+SHELL_EXEC_MAX_STREAM_BYTES o processo é morto. Com save_full_output=true a
+saída completa vai para um arquivo temporário que o agente pode paginar.
 """
 
 import asyncio
-import re
-from typing import Any, Dict
+import os
+import signal
+import tempfile
+from typing import Any, Dict, Optional
 
 from core.skills.base import SecurityLevel, SkillBase
-
-# Padrões de classificação (ordem importa: FORBIDDEN primeiro)
-FORBIDDEN_PATTERNS = [
-    r"rm\s+-rf\s+/\s*$",
-    r"rm\s+-rf\s+/\*",
-    r"chmod\s+777\s+/",
-    r"dd\s+if=",
-    r"mkfs\.",
-    r"iptables\s+-F",
-    r":\(\)\s*:\s*\|\s*:\s*&",  # Fork bomb
-    r">\s*/dev/sd",
-    r"wget.*\|\s*sh",
-    r"curl.*\|\s*sh",
-]
-
-DANGEROUS_PATTERNS = [
-    r"^rm\s",
-    r"^kill\s",
-    r"^killall\s",
-    r"^systemctl\s+(stop|restart|disable|mask)",
-    r"^docker\s+(stop|rm|rmi|prune)",
-    r"^apt\s+(install|remove|purge)",
-    r"^pip\s+install",
-    r"^reboot",
-    r"^shutdown",
-    r"^passwd",
-    r"^chown\s",
-    r"^chmod\s",
-    r"^mv\s+/",
-]
-
-SAFE_PATTERNS = [
-    r"^ls\b",
-    r"^cat\b",
-    r"^head\b",
-    r"^tail\b",
-    r"^df\b",
-    r"^uptime",
-    r"^whoami",
-    r"^pwd",
-    r"^free\b",
-    r"^ps\b",
-    r"^docker\s+(ps|stats|logs|inspect|images)",
-    r"^uname\b",
-    r"^date\b",
-    r"^hostname",
-    r"^wc\b",
-    r"^grep\b",
-    r"^find\b",
-    r"^echo\b",
-    r"^id\b",
-    # Verificação de instalação (read-only)
-    r"^which\b",
-    r"^type\b",
-    r"^command\s+-v\b",
-    r"^dpkg\s+(-l|--list)",
-    r"^apt\s+list",
-    r"^pip3?\s+(list|show|--version)",
-    r"^npm\s+(list|--version)",
-    r"^node\s+--version",
-    r"^python3?\s+--version",
-    r"^.+\s+--version$",
-    # Informações do sistema (read-only)
-    r"^env\b",
-    r"^printenv\b",
-    r"^systemctl\s+(status|is-active|is-enabled|list-units)",
-    r"^service\s+\S+\s+status",
-    r"^ss\b",
-    r"^ip\s+(addr|route|link)\b",
-    r"^du\b",
-    r"^stat\b",
-    r"^file\b",
-    r"^lsb_release\b",
-    r"^lscpu\b",
-    r"^lsblk\b",
-    r"^getent\b",
-]
-
-
-def classify_command(command: str) -> SecurityLevel:
-    """Classifica nível de segurança de um comando."""
-    cmd = command.strip()
-
-    for pattern in FORBIDDEN_PATTERNS:
-        if re.search(pattern, cmd, re.IGNORECASE):
-            return SecurityLevel.FORBIDDEN
-
-    for pattern in DANGEROUS_PATTERNS:
-        if re.search(pattern, cmd, re.IGNORECASE):
-            return SecurityLevel.DANGEROUS
-
-    for pattern in SAFE_PATTERNS:
-        if re.search(pattern, cmd, re.IGNORECASE):
-            return SecurityLevel.SAFE
-
-    # Default: MODERATE (desconhecido mas não proibido)
-    return SecurityLevel.MODERATE
+from core.skills.sandbox import SandboxLimits, subprocess_preexec
+from core.skills.shell_classifier import classify_command
+
+READ_CHUNK_BYTES = 64 * 1024
+MAX_STREAM_BYTES = int(os.getenv("SHELL_EXEC_MAX_STREAM_BYTES", str(50 * 1024 * 1024)))
+SPILL_DIR = os.getenv("SHELL_EXEC_SPILL_DIR", tempfile.gettempdir())
+
+
+class OutputLimitExceededError(Exception):
+    """Saída total passou de MAX_STREAM_BYTES."""
+
+
+class OutputCapture:
+    """Buffer head+tail de memória limitada; opcionalmente grava tudo em arquivo."""
+
+    def __init__(self, max_bytes: int, spill_path: Optional[str] = None):
+        self.head_limit = max_bytes // 2
+        self.tail_limit = max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+        self.spill_path = spill_path
+        self._spill = open(spill_path, "wb") if spill_path else None
+
+    def feed(self, chunk: bytes) -> None:
+        self.total_bytes += len(chunk)
+        if self._spill is not None:
+            self._spill.write(chunk)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk and self.tail_limit:
+            self.tail += chunk[-self.tail_limit :]
+            if len(self.tail) > self.tail_limit:
+                del self.tail[: len(self.tail) - self.tail_limit]
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > len(self.head) + len(self.tail)
+
+    def close(self, keep_spill: bool) -> None:
+        if self._spill is None:
+            return
+        self._spill.close()
+        self._spill = None
+        if not keep_spill:
+            os.unlink(self.spill_path)
+            self.spill_path = None
+
+    def render(self) -> str:
+        head = self.head.decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + self.tail.decode("utf-8", errors="replace")
+        omitted = self.total_bytes - len(self.head) - len(self.tail)
+        note = f"\n... [truncated {omitted} of {self.total_bytes} bytes"
+        if self.spill_path:
+            note += f"; full output: {self.spill_path}"
+        note += "] ...\n"
+        return head + note + self.tail.decode("utf-8", errors="replace")
+
+
+async def _pump(stream, capture: OutputCapture, captures) -> None:
+    while True:
+        chunk = await stream.read(READ_CHUNK_BYTES)
+        if not chunk:
+            return
+        capture.feed(chunk)
+        if sum(c.total_bytes for c in captures) > MAX_STREAM_BYTES:
+            raise OutputLimitExceededError()
+
+
+def _spill_path() -> str:
+    fd, path = tempfile.mkstemp(prefix="shell_exec_", suffix=".log", dir=SPILL_DIR)
+    os.close(fd)
+    return path
+
+
+async def _discard(stream) -> None:
+    while await stream.read(READ_CHUNK_BYTES):
+        pass
+
+
+async def _kill(process, pumps) -> None:
+    """Mata o grupo de processos e drena o resto dos pipes (senão wait() não retorna)."""
+    for task in pumps:
+        task.cancel()
+    await asyncio.gather(*pumps, return_exceptions=True)
+    if process.returncode is None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(_discard(process.stdout), _discard(process.stderr), process.wait()),
+            timeout=5,
+        )
+    except asyncio.TimeoutError:
+        pass
 
 
 class ShellExecSkill(SkillBase):
@@ -166,25 +179,46 @@ class ShellExecSkill(SkillBase):
         if level == SecurityLevel.DANGEROUS:
             return f"WARNING: Comando PERIGOSO requer aprovação: {command}"
 
-        # Executar comando
+        # Executar comando (stdout/stderr lidos em streaming, memória limitada)
+        save_full = bool((args or {}).get("save_full_output"))
+        stdout_cap = stderr_cap = None
         try:
+            limits = SandboxLimits.from_config(self.config.sandbox)
             process = await asyncio.create_subprocess_shell(
                 command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                preexec_fn=subprocess_preexec(limits),
+                # Grupo próprio: timeout/limite mata o pipeline inteiro, não só o sh
+                start_new_session=True,
             )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=self.config.timeout_seconds,
-            )
-
-            output = stdout.decode("utf-8", errors="replace")
-            errors = stderr.decode("utf-8", errors="replace")
-
-            # Truncar output longo se necessário
             max_chars = self.config.max_output_chars
-            if len(output) > max_chars:
-                output = output[:max_chars] + f"\n... [truncated {len(output)} chars]"
+            stdout_cap = OutputCapture(max_chars, _spill_path() if save_full else None)
+            stderr_cap = OutputCapture(max_chars // 2)
+            captures = (stdout_cap, stderr_cap)
+
+            pumps = [
+                asyncio.create_task(_pump(process.stdout, stdout_cap, captures)),
+                asyncio.create_task(_pump(process.stderr, stderr_cap, captures)),
+            ]
+
+            async def _drain():
+                await asyncio.gather(*pumps)
+                await process.wait()
+
+            limit_note = ""
+            try:
+                await asyncio.wait_for(_drain(), timeout=self.config.timeout_seconds)
+            except asyncio.TimeoutError:
+                await _kill(process, pumps)
+                return f"ERROR: Timeout after {self.config.timeout_seconds}s: {command}"
+            except OutputLimitExceededError:
+                await _kill(process, pumps)
+                limit_note = f"\n[killed: output exceeded {MAX_STREAM_BYTES} bytes]"
+
+            stdout_cap.close(keep_spill=stdout_cap.truncated)
+            output = stdout_cap.render() + limit_note
+            errors = stderr_cap.render()
 
             # Retornar output RAW (sem formatação)
             # O LLM via node_format_response vai formatar a resposta
@@ -192,7 +226,9 @@ class ShellExecSkill(SkillBase):
                 return f"{output}\n[stderr: {errors}]"
             return output
 
-        except asyncio.TimeoutError:
-            return f"ERROR: Timeout after {self.config.timeout_seconds}s: {command}"
         except Exception as e:
             return f"ERROR: {e}"
+        finally:
+            if stdout_cap is not None:
+                # No-op se já fechado acima; senão (erro/timeout) descarta o arquivo
+                stdout_cap.close(keep_spill=False)
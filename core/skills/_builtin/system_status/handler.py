@@ -1,8 +1,9 @@
 """Skill: System Status — Mostra status geral do sistema."""
 
-import subprocess
 from typing import Any, Dict
 
+from core.resource_manager.docker_client import get_docker_client
+from core.resource_manager.sampler import get_resource_sampler
 from core.skills.base import SkillBase
 
 
@@ -12,65 +13,49 @@ class SystemStatusSkill(SkillBase):
     async def execute(self, args: Dict[str, Any] = None) -> str:
         checks = []
 
-        # Check RAM
+        sample = None
         try:
-            with open("/proc/meminfo", "r") as f:
-                meminfo = f.read()
-
-            mem_total = 0
-            mem_available = 0
-
-            for line in meminfo.strip().split("\n"):
-                if line.startswith("MemTotal:"):
-                    mem_total = int(line.split()[1])
-                elif line.startswith("MemAvailable:"):
-                    mem_available = int(line.split()[1])
+            sample = get_resource_sampler().latest()
+        except Exception:
+            pass
 
-            if mem_total > 0:
-                usage_pct = ((mem_total - mem_available) / mem_total) * 100
+        # Check RAM
+        if sample is not None and sample.mem_total_mb > 0:
+            usage_pct = sample.mem_used_percent
 
-                if usage_pct > 90:
-                    checks.append(("🚨 RAM", f"{usage_pct:.0f}% - CRÍTICO"))
-                elif usage_pct > 75:
-                    checks.append(("⚠️  RAM", f"{usage_pct:.0f}% - Alto"))
-                else:
-                    checks.append(("✅ RAM", f"{usage_pct:.0f}% - OK"))
+            if usage_pct > 90:
+                checks.append(("🚨 RAM", f"{usage_pct:.0f}% - CRÍTICO"))
+            elif usage_pct > 75:
+                checks.append(("⚠️  RAM", f"{usage_pct:.0f}% - Alto"))
             else:
-                checks.append(("❌ RAM", "Não disponível"))
-        except Exception:
+                checks.append(("✅ RAM", f"{usage_pct:.0f}% - OK"))
+        else:
             checks.append(("❌ RAM", "Não disponível"))
 
         # Check Disk
-        try:
-            result = subprocess.run(["df", "-h", "/"], capture_output=True, text=True, timeout=5)
-            lines = result.stdout.strip().split("\n")
-            disk_line = lines[1].split()
-            usage = disk_line[4].replace("%", "")
+        if sample is not None and sample.disk_total_gb > 0:
+            usage = round(sample.disk_percent)
 
-            if int(usage) > 90:
+            if usage > 90:
                 checks.append(("🚨 Disco", f"{usage}% - CRÍTICO"))
-            elif int(usage) > 75:
+            elif usage > 75:
                 checks.append(("⚠️  Disco", f"{usage}% - Alto"))
             else:
                 checks.append(("✅ Disco", f"{usage}% - OK"))
-        except Exception:
+        else:
             checks.append(("❌ Disco", "Não disponível"))
 
         # Check Docker
-        try:
-            result = subprocess.run(
-                ["docker", "info", "--format", "{{.ServerVersion}}"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                checks.append(("✅ Docker", f"v{version}"))
-            else:
-                checks.append(("❌ Docker", "Indisponível"))
-        except Exception:
+        docker = get_docker_client()
+        if not docker.available():
             checks.append(("❌ Docker", "Não instalado"))
+        else:
+            try:
+                version = (await docker.version()).get("Version", "?")
+                running = len(await docker.list_containers())
+                checks.append(("✅ Docker", f"v{version} ({running} containers)"))
+            except Exception:
+                checks.append(("❌ Docker", "Indisponível"))
 
         # Format output
         formatted = ["📊 **Status do Sistema**\n"]
@@ -30,7 +30,7 @@ class WebSearchSkill(SkillBase):
             query = self._extract_query(raw_input)
 
         if not query:
-            return "Forneca um termo de busca. Ex: 'pesquise python tutorials'"
+            return "❌ Forneca um termo de busca. Ex: 'pesquise python tutorials'"
 
         # Tentar Brave primeiro (se API key configurada)
         if BRAVE_API_KEY:
@@ -49,7 +49,7 @@ class WebSearchSkill(SkillBase):
             return await self._search_ddg(query)
         except Exception as e:
             logger.error("web_search_ddg_failed", error=str(e), query=query)
-            return f"Nao consegui buscar '{query}' — Brave e DuckDuckGo falharam. Erro: {e}"
+            return f"❌ Nao consegui buscar '{query}' — Brave e DuckDuckGo falharam. Erro: {e}"
 
     def _extract_query(self, text: str) -> str:
         """Extrai query do texto."""
@@ -121,7 +121,7 @@ class WebSearchSkill(SkillBase):
 
             if resp.status_code != 200:
                 logger.error("web_search_ddg_http_error", status=resp.status_code, query=query)
-                return f"Busca DuckDuckGo falhou com HTTP {resp.status_code}"
+                return f"❌ Busca DuckDuckGo falhou com HTTP {resp.status_code}"
 
             results = self._parse_ddg_html(resp.text, query)
             logger.info("web_search_ddg_success", query=query, results_count=len(results))
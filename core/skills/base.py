@@ -7,7 +7,7 @@ Cada skill deve herdar de SkillBase e implementar execute().
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 class SecurityLevel(Enum):
@@ -33,6 +33,12 @@ class SkillConfig:
     max_output_chars: int = 2000
     timeout_seconds: int = 30
     enabled: bool = True
+    # Cache de resultado (só para skills idempotentes; ver core/skills/result_cache.py)
+    cache_ttl_seconds: float = 0  # 0 = sem cache
+    cache_key_args: Optional[List[str]] = None  # None = todos os args entram na chave
+    cache_scope: str = "global"  # global | user
+    # Limites de recursos / execução isolada (ver core/skills/sandbox.py)
+    sandbox: Dict[str, Any] = field(default_factory=dict)
 
 
 class SkillBase(ABC):
@@ -66,6 +72,11 @@ class SkillBase(ABC):
         """Valida argumentos antes de executar. Override para validação custom."""
         return True
 
+    def is_cacheable(self, args: Dict[str, Any] = None) -> bool:
+        """Se a chamada pode usar o cache de resultados. Override para excluir
+        rotas não idempotentes (health checks, refresh forçado...)."""
+        return True
+
     @property
     def name(self) -> str:
         return self.config.name
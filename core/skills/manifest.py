@@ -0,0 +1,154 @@
+"""
+Skill Manifest — cache JSON dos config.yaml dos skills.
+
+O registry monta schemas e índices de triggers a partir do manifest, sem
+parsear YAML nem importar handler.py no startup. Cada entrada guarda mtime e
+tamanho (checagem barata via stat) e o sha256 de config.yaml e handler.py;
+o YAML só é relido quando o arquivo mudou de fato.
+
+Pré-gerar no build/deploy:
+    python -m core.skills.manifest
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import structlog
+import yaml
+
+logger = structlog.get_logger()
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".skills_manifest.json"
+)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_key(path: str) -> List[int]:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Lê o manifest; retorna um manifest vazio se ausente, corrompido ou de outra versão."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == MANIFEST_VERSION and isinstance(data.get("skills"), dict):
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "skills": {}}
+
+
+def save_manifest(path: str, manifest: Dict[str, Any]) -> bool:
+    """Grava o manifest de forma atômica. Falha (ex: FS read-only) só gera log."""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        logger.warning("skill_manifest_write_failed", path=path, error=str(e))
+        return False
+
+
+def _build_entry(
+    skill_path: str, config_path: str, handler_path: str, cached: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    config_stat = _stat_key(config_path)
+    handler_stat = _stat_key(handler_path)
+    if (
+        cached
+        and cached.get("config_stat") == config_stat
+        and cached.get("handler_stat") == handler_stat
+    ):
+        return cached
+
+    config_sha = _file_sha256(config_path)
+    handler_sha = _file_sha256(handler_path)
+    if cached and cached.get("config_sha256") == config_sha:
+        # Só o mtime mudou (checkout, touch): reaproveita o config já parseado.
+        raw_config = cached["config"]
+    else:
+        with open(config_path, "r", encoding="utf-8") as f:
+            raw_config = yaml.safe_load(f) or {}
+
+    return {
+        "path": skill_path,
+        "config": raw_config,
+        "config_stat": config_stat,
+        "handler_stat": handler_stat,
+        "config_sha256": config_sha,
+        "handler_sha256": handler_sha,
+    }
+
+
+def refresh_manifest(
+    skill_dirs: List[str], manifest: Dict[str, Any]
+) -> tuple[Dict[str, Any], bool]:
+    """
+    Revalida o manifest contra os diretórios de skills.
+
+    Returns:
+        (manifest atualizado, True se algo mudou)
+    """
+    old_skills = manifest.get("skills", {})
+    skills: Dict[str, Any] = {}
+
+    for skill_dir in skill_dirs:
+        if not os.path.isdir(skill_dir):
+            logger.warning("skill_dir_not_found", path=skill_dir)
+            continue
+
+        for entry in sorted(os.scandir(skill_dir), key=lambda e: e.name):
+            if not entry.is_dir() or entry.name.startswith("_"):
+                continue
+
+            config_path = os.path.join(entry.path, "config.yaml")
+            handler_path = os.path.join(entry.path, "handler.py")
+
+            if not os.path.exists(config_path):
+                logger.debug("skill_missing_config", path=entry.path)
+                continue
+
+            if not os.path.exists(handler_path):
+                logger.debug("skill_missing_handler", path=entry.path)
+                continue
+
+            key = os.path.abspath(entry.path)
+            try:
+                skills[key] = _build_entry(
+                    entry.path, config_path, handler_path, old_skills.get(key)
+                )
+            except Exception as e:
+                logger.error("skill_load_error", path=entry.path, error=str(e))
+
+    changed = skills != old_skills
+    return {"version": MANIFEST_VERSION, "skills": skills}, changed
+
+
+def build_manifest(skill_dirs: List[str], path: str = DEFAULT_MANIFEST_PATH) -> Dict[str, Any]:
+    """Carrega, revalida e (se mudou) regrava o manifest."""
+    manifest, changed = refresh_manifest(skill_dirs, load_manifest(path))
+    if changed:
+        save_manifest(path, manifest)
+        logger.info("skill_manifest_rebuilt", path=path, skills=len(manifest["skills"]))
+    return manifest
+
+
+if __name__ == "__main__":
+    builtin_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_builtin")
+    result = build_manifest([builtin_dir])
+    print(f"{len(result['skills'])} skills -> {DEFAULT_MANIFEST_PATH}")
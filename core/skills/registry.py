@@ -2,19 +2,137 @@
 Skill Registry — Descobre, registra e gerencia skills.
 
 Substitui o TOOLS_REGISTRY hardcoded de core/tools/system_tools.py.
+
+Configs vêm do manifest (core/skills/manifest.py); handler.py de cada skill
+só é importado na primeira execução (LazySkill).
+
+Hot reload: reload_changed() revalida o manifest e troca só os skills cujos
+arquivos mudaram (ver core/skills/watcher.py).
 """
 
+import asyncio
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
 
 import structlog
-import yaml
 
 from .base import SecurityLevel, SkillBase, SkillConfig
+from .manifest import DEFAULT_MANIFEST_PATH, build_manifest, refresh_manifest, save_manifest
+from .result_cache import SkillResultCache, cache_key
+from .sandbox import SandboxLimits, get_sandbox_pool, sandbox_enabled, wants_worker
+from .trigger_matcher import TriggerMatcher
 
 logger = structlog.get_logger()
 
 
+def _config_from_raw(raw_config: Dict[str, Any]) -> SkillConfig:
+    """Monta SkillConfig a partir do dict do config.yaml."""
+    raw_config = dict(raw_config)
+    # Converter security_level string para enum
+    sec_level = raw_config.get("security_level", "safe")
+    if isinstance(sec_level, str):
+        raw_config["security_level"] = SecurityLevel(sec_level)
+    return SkillConfig(**raw_config)
+
+
+def _import_handler(skill_path: str, dir_name: str, config: SkillConfig) -> SkillBase:
+    """Importa handler.py e instancia a classe que herda SkillBase."""
+    import importlib.util
+    import sys
+
+    started = time.perf_counter()
+    handler_path = os.path.join(skill_path, "handler.py")
+
+    # Criar módulo dinamicamente
+    module_name = f"core.skills.{dir_name}.handler"
+
+    spec = importlib.util.spec_from_file_location(module_name, handler_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"spec inválido para {handler_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+    # Procurar classe que herda SkillBase
+    handler_class = None
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if (
+            isinstance(attr, type)
+            and issubclass(attr, SkillBase)
+            and attr not in (SkillBase, LazySkill)
+        ):
+            handler_class = attr
+            break
+
+    if handler_class is None:
+        raise ImportError(f"nenhuma classe SkillBase em {handler_path}")
+
+    logger.info(
+        "skill_handler_imported",
+        name=config.name,
+        duration_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+    return handler_class(config)
+
+
+class LazySkill(SkillBase):
+    """
+    Proxy de skill: config disponível de imediato, handler importado sob demanda.
+    """
+
+    def __init__(self, config: SkillConfig, skill_path: str, dir_name: str):
+        super().__init__(config)
+        self.skill_path = skill_path
+        self.dir_name = dir_name
+        self._handler: Optional[SkillBase] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._handler is not None
+
+    def load(self) -> SkillBase:
+        """Importa o handler (uma vez) e retorna a instância real."""
+        if self._handler is None:
+            with self._lock:
+                if self._handler is None:
+                    self._handler = _import_handler(self.skill_path, self.dir_name, self.config)
+        return self._handler
+
+    async def execute(self, args: Dict[str, Any] = None) -> str:
+        return await self.load().execute(args)
+
+    def validate_args(self, args: Dict[str, Any] = None) -> bool:
+        return self.load().validate_args(args)
+
+
+def _same_content(old_entry: Dict[str, Any], new_entry: Dict[str, Any]) -> bool:
+    return old_entry.get("config_sha256") == new_entry.get("config_sha256") and old_entry.get(
+        "handler_sha256"
+    ) == new_entry.get("handler_sha256")
+
+
+@dataclass
+class ReloadResult:
+    """Resultado de um reload incremental."""
+
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    # Instâncias antigas substituídas/removidas (para drenar execuções em andamento)
+    retired: List[SkillBase] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
 class SkillRegistry:
     """
     Registry central de skills.
@@ -23,101 +141,184 @@ class SkillRegistry:
     Cada skill é um diretório com handler.py + config.yaml.
     """
 
-    def __init__(self, skill_dirs: List[str] = None):
+    def __init__(self, skill_dirs: List[str] = None, manifest_path: Optional[str] = None):
         self._skills: Dict[str, SkillBase] = {}
-        # Default: diretório _builtin junto deste arquivo
+        # Default: diretório _builtin junto deste arquivo, com manifest persistido
         if skill_dirs is None:
             base_dir = os.path.dirname(os.path.abspath(__file__))
             skill_dirs = [os.path.join(base_dir, "_builtin")]
+            if manifest_path is None:
+                manifest_path = os.getenv("SKILLS_MANIFEST_PATH", DEFAULT_MANIFEST_PATH)
         self._skill_dirs = skill_dirs
+        self._manifest_path = manifest_path
+        # Versão incrementada a cada mudança no conjunto de skills (invalida caches)
+        self._version = 0
+        self._schemas_cache: Optional[List[dict]] = None
+        self._schemas_version = -1
+        self._matcher: Optional[TriggerMatcher] = None
+        self._matcher_key: Optional[tuple] = None
+        # Estado para reload incremental
+        self._lock = threading.RLock()
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._paths: Dict[str, str] = {}  # diretório absoluto -> nome do skill
+        self._inflight: Dict[int, int] = {}  # id(skill) -> execuções em andamento
+        # Cache de resultados compartilhado por todos os chamadores deste registry
+        self._result_cache = SkillResultCache()
 
     def discover_and_register(self) -> int:
         """
         Descobre skills em todos os diretórios configurados.
 
+        Usa o manifest: nenhum handler.py é importado aqui.
+
         Returns:
             Número de skills registrados
         """
-        count = 0
-        for skill_dir in self._skill_dirs:
-            if not os.path.isdir(skill_dir):
-                logger.warning("skill_dir_not_found", path=skill_dir)
-                continue
-
-            logger.info("scanning_skill_dir", path=skill_dir)
+        started = time.perf_counter()
+        if self._manifest_path:
+            manifest = build_manifest(self._skill_dirs, self._manifest_path)
+        else:
+            manifest, _ = refresh_manifest(self._skill_dirs, {"skills": {}})
 
-            for entry in os.scandir(skill_dir):
-                if not entry.is_dir() or entry.name.startswith("_"):
-                    continue
+        self._manifest = manifest
+        count = 0
+        for key, entry in manifest["skills"].items():
+            try:
+                skill = self._load_skill(entry["path"], entry["config"])
+                if skill.config.enabled:
+                    self.register(skill)
+                    self._paths[key] = skill.name
+                    count += 1
+                    logger.debug("skill_registered", name=skill.name, path=entry["path"])
+            except Exception as e:
+                logger.error("skill_load_error", path=entry["path"], error=str(e))
+
+        logger.info(
+            "skill_discovery_complete",
+            total=count,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+        return count
 
-                config_path = os.path.join(entry.path, "config.yaml")
-                handler_path = os.path.join(entry.path, "handler.py")
+    def _load_skill(self, skill_path: str, raw_config: Dict[str, Any]) -> LazySkill:
+        """Cria o proxy do skill a partir do config do manifest."""
+        config = _config_from_raw(raw_config)
+        return LazySkill(config, skill_path, os.path.basename(os.path.normpath(skill_path)))
 
-                if not os.path.exists(config_path):
-                    logger.debug("skill_missing_config", path=entry.path)
-                    continue
+    def register(self, skill: SkillBase) -> None:
+        """Registra (ou substitui) um skill e invalida os caches derivados."""
+        with self._lock:
+            self._skills[skill.name] = skill
+            self._version += 1
 
-                if not os.path.exists(handler_path):
-                    logger.debug("skill_missing_handler", path=entry.path)
+    def reload_changed(self, preload: bool = True) -> ReloadResult:
+        """
+        Reload incremental: revalida o manifest e troca só os skills alterados.
+
+        Diretórios com config.yaml/handler.py de conteúdo igual (sha256) são
+        ignorados. Os novos proxies são montados fora do dict ativo e trocados
+        de uma vez, com um único incremento de versão (invalida schemas, índice
+        de triggers e prompt). Se a versão antiga já estava importada e
+        `preload` é True, o novo handler é importado antes da troca; se falhar,
+        a versão antiga continua ativa.
+        """
+        result = ReloadResult()
+        with self._lock:
+            if self._manifest is None:
+                return result
+            manifest, changed = refresh_manifest(self._skill_dirs, self._manifest)
+            if not changed:
+                return result
+
+            old_entries = self._manifest["skills"]
+            new_entries = manifest["skills"]
+            skills = dict(self._skills)
+            paths = dict(self._paths)
+
+            for key in old_entries.keys() - new_entries.keys():
+                name = paths.pop(key, None)
+                if name and name in skills:
+                    result.retired.append(skills.pop(name))
+                    result.removed.append(name)
+
+            for key, entry in new_entries.items():
+                old_entry = old_entries.get(key)
+                if old_entry is not None and _same_content(old_entry, entry):
                     continue
 
+                old_name = paths.get(key)
+                old_skill = skills.get(old_name) if old_name else None
                 try:
-                    skill = self._load_skill(entry.path, entry.name)
-                    if skill and skill.config.enabled:
-                        self._skills[skill.name] = skill
-                        count += 1
-                        logger.info("skill_registered", name=skill.name, path=entry.path)
+                    skill = self._load_skill(entry["path"], entry["config"])
+                    if preload and skill.config.enabled and getattr(old_skill, "loaded", False):
+                        skill.load()
                 except Exception as e:
-                    logger.error("skill_load_error", path=entry.path, error=str(e))
-
-        logger.info("skill_discovery_complete", total=count)
-        return count
-
-    def _load_skill(self, skill_path: str, dir_name: str) -> Optional[SkillBase]:
-        """Carrega um skill a partir do diretório."""
-        import importlib.util
-        import sys
-
-        # Carregar config.yaml
-        config_path = os.path.join(skill_path, "config.yaml")
-        with open(config_path, "r", encoding="utf-8") as f:
-            raw_config = yaml.safe_load(f)
-
-        # Converter security_level string para enum
-        sec_level = raw_config.get("security_level", "safe")
-        if isinstance(sec_level, str):
-            raw_config["security_level"] = SecurityLevel(sec_level)
-
-        config = SkillConfig(**raw_config)
-
-        # Importar handler.py dinamicamente
-        handler_path = os.path.join(skill_path, "handler.py")
-
-        # Criar módulo dinamicamente
-        module_name = f"core.skills.{dir_name}.handler"
-
-        spec = importlib.util.spec_from_file_location(module_name, handler_path)
-        if spec is None or spec.loader is None:
-            logger.error("skill_spec_error", path=skill_path)
-            return None
-
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)
-
-        # Procurar classe que herda SkillBase
-        handler_class = None
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if isinstance(attr, type) and issubclass(attr, SkillBase) and attr is not SkillBase:
-                handler_class = attr
-                break
+                    logger.error("skill_reload_error", path=entry["path"], error=str(e))
+                    result.failed.append(old_name or os.path.basename(key))
+                    continue
 
-        if handler_class is None:
-            logger.error("no_skill_class_found", path=skill_path)
-            return None
+                if old_skill is not None:
+                    del skills[old_name]
+                    del paths[key]
+                    result.retired.append(old_skill)
+                if skill.config.enabled:
+                    skills[skill.name] = skill
+                    paths[key] = skill.name
+                    (result.updated if old_skill is not None else result.added).append(skill.name)
+                elif old_skill is not None:
+                    result.removed.append(old_name)
+
+            self._manifest = manifest
+            if self._manifest_path:
+                save_manifest(self._manifest_path, manifest)
+            if result.changed:
+                self._skills = skills
+                self._paths = paths
+                self._version += 1
+                for name in result.updated + result.removed:
+                    self._result_cache.invalidate(name)
+
+        if result.changed or result.failed:
+            logger.info(
+                "skills_reloaded",
+                added=result.added,
+                updated=result.updated,
+                removed=result.removed,
+                failed=result.failed,
+                version=self._version,
+            )
+        return result
+
+    def inflight(self, skill: SkillBase) -> int:
+        """Execuções em andamento desta instância de skill."""
+        return self._inflight.get(id(skill), 0)
+
+    def _track(self, skill: SkillBase, delta: int) -> None:
+        with self._lock:
+            count = self._inflight.get(id(skill), 0) + delta
+            if count > 0:
+                self._inflight[id(skill)] = count
+            else:
+                self._inflight.pop(id(skill), None)
+
+    async def drain(self, skills: Iterable[SkillBase], timeout: float = 30.0) -> bool:
+        """Espera as execuções em andamento das instâncias dadas terminarem."""
+        skills = list(skills)
+        deadline = time.monotonic() + timeout
+        while any(self.inflight(skill) for skill in skills):
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    "skill_drain_timeout",
+                    skills=[skill.name for skill in skills if self.inflight(skill)],
+                )
+                return False
+            await asyncio.sleep(0.05)
+        return True
 
-        return handler_class(config)
+    @property
+    def version(self) -> int:
+        """Versão do conjunto de skills; muda a cada register()."""
+        return self._version
 
     def get(self, name: str) -> Optional[SkillBase]:
         """Retorna skill pelo nome."""
@@ -136,43 +337,105 @@ class SkillRegistry:
             for s in self._skills.values()
         ]
 
-    def find_by_trigger(self, text: str) -> Optional[SkillBase]:
-        """Encontra skill que melhor corresponde ao texto."""
-        text_lower = text.lower()
-
-        # Primeiro: procurar trigger exato (case insensitive)
-        for skill in self._skills.values():
-            for trigger in skill.config.triggers:
-                if trigger.lower() == text_lower:
-                    return skill
-
-        # Segundo: procurar trigger parcial
-        for skill in self._skills.values():
-            for trigger in skill.config.triggers:
-                if trigger.lower() in text_lower:
-                    return skill
-
-        # Terceiro: procurar pelo nome do skill
-        for skill in self._skills.values():
-            if skill.name.lower() in text_lower:
-                return skill
+    def trigger_matcher(self) -> TriggerMatcher:
+        """Autômato de triggers, recompilado só quando o conjunto de skills muda."""
+        key = (self._version, len(self._skills))
+        if self._matcher is None or self._matcher_key != key:
+            self._matcher = TriggerMatcher(
+                (skill.name, skill.config.triggers) for skill in self._skills.values()
+            )
+            self._matcher_key = key
+        return self._matcher
 
-        return None
+    def find_by_trigger(self, text: str) -> Optional[SkillBase]:
+        """Encontra skill que melhor corresponde ao texto.
 
-    async def execute_skill(self, name: str, args: Dict[str, Any] = None) -> str:
-        """Executa um skill pelo nome."""
+        Prioridade: trigger igual ao texto > trigger mais longo > nome do skill.
+        """
+        match = self.trigger_matcher().best(text)
+        return self._skills.get(match.skill) if match else None
+
+    async def execute_skill(
+        self,
+        name: str,
+        args: Dict[str, Any] = None,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Executa um skill pelo nome.
+
+        Skills com cache_ttl_seconds > 0 são servidos do cache compartilhado;
+        chamadas idênticas concorrentes compartilham uma única execução.
+        `user_id` só é usado por skills com cache_scope: user. Se `metadata`
+        for passado (ex: HookContext.metadata), recebe "resource_usage" da
+        execução.
+        """
         skill = self.get(name)
         if not skill:
             return f"❌ Skill '{name}' não encontrado. Use /skills para ver disponíveis."
 
-        if not skill.validate_args(args):
+        key = cache_key(skill.config, args, user_id) if skill.is_cacheable(args) else None
+        if key is not None:
+            return await self._result_cache.get_or_run(
+                key,
+                skill.config.cache_ttl_seconds,
+                lambda: self._run_skill(skill, name, args, metadata),
+            )
+        return await self._run_skill(skill, name, args, metadata)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hits/misses/coalescidas e hit ratio do cache de resultados, por skill."""
+        return self._result_cache.stats()
+
+    async def _run_skill(
+        self,
+        skill: SkillBase,
+        name: str,
+        args: Optional[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if isinstance(skill, LazySkill) and wants_worker(skill.config) and sandbox_enabled():
+            self._track(skill, 1)
+            try:
+                result, usage = await get_sandbox_pool().run(
+                    skill,
+                    args or {},
+                    SandboxLimits.from_config(skill.config.sandbox),
+                    skill.config.timeout_seconds,
+                )
+            except Exception as e:
+                # forkserver indisponível, pipe quebrado etc.: mesmo contrato do caminho local
+                logger.error("skill_sandbox_unavailable", skill=name, error=str(e))
+                return f"❌ Erro ao executar skill '{name}': {e}"
+            finally:
+                self._track(skill, -1)
+            if metadata is not None:
+                metadata["resource_usage"] = usage
+            return result
+
+        try:
+            valid = skill.validate_args(args)
+        except Exception as e:
+            logger.error("skill_handler_import_error", skill=name, error=str(e))
+            return f"❌ Erro ao carregar skill '{name}': {e}"
+
+        if not valid:
             return f"❌ Argumentos inválidos para skill '{name}'."
 
+        self._track(skill, 1)
+        started = time.perf_counter()
         try:
             return await skill.execute(args or {})
         except Exception as e:
             logger.error("skill_execution_error", skill=name, error=str(e))
             return f"❌ Erro ao executar skill '{name}': {e}"
+        finally:
+            self._track(skill, -1)
+            if metadata is not None:
+                metadata["resource_usage"] = {
+                    "sandboxed": False,
+                    "wall_ms": round((time.perf_counter() - started) * 1000, 2),
+                }
 
     def get_security_level(self, name: str, args: dict = None) -> str:
         """Retorna nível de segurança para executar este skill com estes args.
@@ -189,7 +452,7 @@ class SkillRegistry:
         # Para shell_exec, classificar o comando específico
         if name == "shell_exec" and args and args.get("command"):
             try:
-                from ._builtin.shell_exec.handler import classify_command
+                from .shell_classifier import classify_command
 
                 cmd_level = classify_command(args["command"])
                 return cmd_level.value
@@ -207,7 +470,11 @@ class SkillRegistry:
         Retorna lista de tool schemas para function calling.
 
         Formato compatível com OpenRouter/Gemini function calling.
+        Cacheado por versão do registry; não modifique a lista retornada.
         """
+        if self._schemas_cache is not None and self._schemas_version == self._version:
+            return self._schemas_cache
+
         tools = []
         for skill in self._skills.values():
             properties = {}
@@ -249,7 +516,9 @@ class SkillRegistry:
                 }
             )
 
-        logger.info("tool_schemas_generated", count=len(tools))
+        logger.info("tool_schemas_generated", count=len(tools), version=self._version)
+        self._schemas_cache = tools
+        self._schemas_version = self._version
         return tools
 
 
@@ -266,9 +535,17 @@ def get_skill_registry() -> SkillRegistry:
     return _registry
 
 
-def reload_skill_registry() -> SkillRegistry:
-    """Recarrega o registry (para desenvolvimento)."""
+def reload_skill_registry(full: bool = False) -> SkillRegistry:
+    """
+    Recarrega o registry.
+
+    Por padrão é incremental (só diretórios alterados); full=True descarta o
+    registry e redescobre tudo.
+    """
     global _registry
-    _registry = SkillRegistry()
-    _registry.discover_and_register()
+    if _registry is None or full:
+        _registry = SkillRegistry()
+        _registry.discover_and_register()
+    else:
+        _registry.reload_changed()
     return _registry
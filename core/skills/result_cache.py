@@ -0,0 +1,185 @@
+"""
+Skill Result Cache — cache compartilhado de resultados de skills idempotentes.
+
+Skills de leitura (get_ram, list_containers, check_postgres, web_search...)
+declaram no config.yaml:
+
+    cache_ttl_seconds: 10        # 0 = sem cache (default)
+    cache_key_args: [query]      # args que entram na chave (omitido = todos)
+    cache_scope: global          # global | user
+
+Chamadas idênticas e concorrentes compartilham uma única execução
+(single-flight). Resultados de erro ("❌ ...") e exceções não são cacheados;
+skills com rotas não idempotentes sobrescrevem SkillBase.is_cacheable().
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import structlog
+
+from .base import SkillConfig
+
+logger = structlog.get_logger()
+
+SCOPE_GLOBAL = "global"
+SCOPE_USER = "user"
+
+
+@dataclass
+class CacheCounters:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        served = self.hits + self.coalesced
+        total = served + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(served / total, 4) if total else None,
+        }
+
+
+def cache_key(
+    config: SkillConfig, args: Optional[Dict[str, Any]], user_id: Optional[str] = None
+) -> Optional[Tuple[Hashable, ...]]:
+    """Chave de cache para a chamada; None se o skill/chamada não é cacheável."""
+    if config.cache_ttl_seconds <= 0:
+        return None
+
+    scope = config.cache_scope or SCOPE_GLOBAL
+    if scope == SCOPE_USER:
+        if not user_id:
+            return None
+        scope_id = str(user_id)
+    elif scope == SCOPE_GLOBAL:
+        scope_id = ""
+    else:
+        logger.warning("skill_cache_unknown_scope", skill=config.name, scope=scope)
+        return None
+
+    args = args or {}
+    if config.cache_key_args is not None:
+        args = {name: args.get(name) for name in config.cache_key_args}
+    try:
+        args_key = json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        return None
+    return config.name, scope_id, args_key
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, str) and result.startswith("❌")
+
+
+class SkillResultCache:
+    """Cache LRU com TTL por entrada + single-flight por chave."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._counters: Dict[str, CacheCounters] = {}
+        self._lock = threading.Lock()
+
+    def _counter(self, skill_name: str) -> CacheCounters:
+        return self._counters.setdefault(skill_name, CacheCounters())
+
+    def _lookup(self, key: tuple) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: tuple, value: str, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_run(self, key: tuple, ttl: float, runner: Callable[[], Awaitable[str]]) -> str:
+        """Retorna o resultado cacheado, aguarda a execução em andamento ou executa."""
+        skill_name = key[0]
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self._counter(skill_name).hits += 1
+                return cached
+            waiting = self._inflight.get(key)
+            if waiting is not None and waiting.get_loop() is loop:
+                self._counter(skill_name).coalesced += 1
+            else:
+                # Sem execução em andamento (ou ela é de outro event loop)
+                waiting = None
+                self._counter(skill_name).misses += 1
+                future = loop.create_future()
+                self._inflight[key] = future
+
+        if waiting is not None:
+            try:
+                return await asyncio.shield(waiting)
+            except asyncio.CancelledError:
+                if not waiting.cancelled():
+                    raise
+                # A execução compartilhada foi cancelada: executa por conta própria
+                return await runner()
+
+        try:
+            result = await runner()
+        except asyncio.CancelledError:
+            self._release(key, future)
+            future.cancel()
+            raise
+        except Exception as e:
+            self._release(key, future)
+            future.set_exception(e)
+            # Evita "Future exception was never retrieved" quando ninguém aguardava
+            future.exception()
+            raise
+
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if not _is_error(result):
+                self._store(key, result, ttl)
+        future.set_result(result)
+        return result
+
+    def _release(self, key: tuple, future: asyncio.Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self, skill_name: Optional[str] = None) -> int:
+        """Remove entradas (de um skill ou todas). Retorna quantas saíram."""
+        with self._lock:
+            if skill_name is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            keys = [key for key in self._entries if key[0] == skill_name]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hits, misses, chamadas coalescidas e hit ratio por skill."""
+        with self._lock:
+            return {name: counters.to_dict() for name, counters in self._counters.items()}
+
+    def __len__(self) -> int:
+        return len(self._entries)
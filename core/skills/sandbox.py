@@ -0,0 +1,454 @@
+"""
+Skill Sandbox — execução isolada de skills com limites de recursos.
+
+Skills que declaram no config.yaml:
+
+    sandbox:
+      worker: true          # roda o handler no pool de workers pré-forkados
+      memory_mb: 256        # RLIMIT_AS
+      data_mb: 256          # RLIMIT_DATA
+      cpu_seconds: 20       # RLIMIT_CPU (tempo de CPU, não wall-clock)
+      file_size_mb: 50      # RLIMIT_FSIZE
+      max_processes: 64     # RLIMIT_NPROC
+      open_files: 256       # RLIMIT_NOFILE
+
+são executados fora do processo principal: um estouro de memória/CPU mata
+(ou derruba com MemoryError) só o worker, que é recriado. Sem `worker: true`
+os limites ainda podem ser aplicados aos subprocessos do próprio skill via
+`subprocess_preexec` (ex: shell_exec), que também os coloca no cgroup abaixo.
+
+Atenção com os rlimits: RLIMIT_AS limita memória virtual (Go e JVM reservam
+GBs de endereço só para iniciar; RLIMIT_DATA conta só memória privada
+gravável) e RLIMIT_NPROC conta todos os processos e threads do UID do serviço,
+não só os do skill — e é ignorado para root. Para um teto de verdade, use o
+cgroup v2 delegado (memory.max + pids.max), compartilhado pelos workers e
+pelos subprocessos dos skills:
+    SKILL_SANDBOX_CGROUP=/sys/fs/cgroup/agentvps-skills
+    SKILL_SANDBOX_CGROUP_MEMORY_MB=768
+    SKILL_SANDBOX_CGROUP_MAX_TASKS=256
+
+Config (env):
+    SKILL_SANDBOX_ENABLED=true|false   (default: true)
+    SKILL_SANDBOX_WORKERS=2
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from .base import SkillConfig
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = structlog.get_logger()
+
+MB = 1024 * 1024
+# Folga do pai sobre o timeout do skill antes de matar o worker
+KILL_GRACE_SECONDS = 2.0
+
+_SIGNAL_REASONS = {
+    getattr(signal, "SIGXCPU", None): "cpu_limit",
+    getattr(signal, "SIGXFSZ", None): "file_size_limit",
+    signal.SIGKILL: "killed",
+    signal.SIGSEGV: "crashed",
+}
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    """Limites de recursos declarados em `sandbox:` no config.yaml."""
+
+    memory_mb: Optional[int] = None
+    data_mb: Optional[int] = None
+    cpu_seconds: Optional[int] = None
+    file_size_mb: Optional[int] = None
+    max_processes: Optional[int] = None
+    open_files: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, raw: Optional[Dict[str, Any]]) -> "SandboxLimits":
+        raw = raw or {}
+        return cls(**{name: raw.get(name) for name in cls.__dataclass_fields__})
+
+    def rlimits(self, cpu_used: float = 0.0) -> List[Tuple[int, int]]:
+        """Pares (RLIMIT_*, valor). CPU é relativo ao já consumido pelo processo."""
+        if resource is None:
+            return []
+        limits = []
+        if self.memory_mb:
+            limits.append((resource.RLIMIT_AS, int(self.memory_mb) * MB))
+        if self.data_mb:
+            limits.append((resource.RLIMIT_DATA, int(self.data_mb) * MB))
+        if self.cpu_seconds:
+            limits.append((resource.RLIMIT_CPU, int(cpu_used) + int(self.cpu_seconds)))
+        if self.file_size_mb:
+            limits.append((resource.RLIMIT_FSIZE, int(self.file_size_mb) * MB))
+        if self.max_processes:
+            limits.append((resource.RLIMIT_NPROC, int(self.max_processes)))
+        if self.open_files:
+            limits.append((resource.RLIMIT_NOFILE, int(self.open_files)))
+        return limits
+
+    def apply(self) -> None:
+        """Aplica os limites (soft e hard) ao processo atual — uso em preexec_fn."""
+        for limit, value in self.rlimits():
+            _, hard = resource.getrlimit(limit)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.setrlimit(limit, (value, value))
+
+    @contextmanager
+    def applied(self) -> Iterator[None]:
+        """Baixa só os soft limits durante o bloco e restaura depois (workers reusáveis)."""
+        if resource is None:
+            yield
+            return
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        previous = []
+        for limit, value in self.rlimits(cpu_used=usage.ru_utime + usage.ru_stime):
+            soft, hard = resource.getrlimit(limit)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.setrlimit(limit, (value, hard))
+            previous.append((limit, soft, hard))
+        try:
+            yield
+        finally:
+            for limit, soft, hard in reversed(previous):
+                resource.setrlimit(limit, (soft, hard))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+def wants_worker(config: SkillConfig) -> bool:
+    """True se o skill pediu execução no pool de workers."""
+    return bool((config.sandbox or {}).get("worker"))
+
+
+def _rusage_snapshot() -> Dict[str, float]:
+    if resource is None:
+        return {}
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "cpu_user_s": own.ru_utime + children.ru_utime,
+        "cpu_system_s": own.ru_stime + children.ru_stime,
+        "max_rss_kb": max(own.ru_maxrss, children.ru_maxrss),
+    }
+
+
+def _usage_delta(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, Any]:
+    if not before or not after:
+        return {}
+    return {
+        "cpu_user_s": round(after["cpu_user_s"] - before["cpu_user_s"], 4),
+        "cpu_system_s": round(after["cpu_system_s"] - before["cpu_system_s"], 4),
+        # ru_maxrss é pico do processo (não delta): inclui execuções anteriores do worker
+        "max_rss_kb": int(after["max_rss_kb"]),
+    }
+
+
+# ============================================
+# Worker (processo filho)
+# ============================================
+
+
+def _worker_main(conn) -> None:
+    """Loop do worker: recebe (skill, args, limites), executa e devolve resultado + uso."""
+    from .registry import _import_handler
+
+    # SIGXFSZ mataria o worker; ignorado, a escrita falha com OSError (EFBIG)
+    if hasattr(signal, "SIGXFSZ"):
+        signal.signal(signal.SIGXFSZ, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    handlers: Dict[str, Tuple[Any, Any]] = {}
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+
+        skill_path, dir_name, config, args, limits, timeout = request
+        before = _rusage_snapshot()
+        started = time.perf_counter()
+        status, payload = "ok", None
+        try:
+            # Reimporta se handler.py ou o config mudaram (hot reload no processo pai)
+            version = (os.stat(os.path.join(skill_path, "handler.py")).st_mtime_ns, config)
+            cached = handlers.get(skill_path)
+            if cached is None or cached[0] != version:
+                cached = (version, _import_handler(skill_path, dir_name, config))
+                handlers[skill_path] = cached
+            handler = cached[1]
+            if not handler.validate_args(args):
+                status, payload = "invalid_args", None
+            else:
+                with limits.applied():
+                    payload = asyncio.run(asyncio.wait_for(handler.execute(args), timeout))
+        except MemoryError:
+            status, payload = "error", "memory_limit"
+        except asyncio.TimeoutError:
+            status, payload = "error", "timeout"
+        except Exception as e:
+            status, payload = "error", f"{type(e).__name__}: {e}"
+
+        usage = _usage_delta(before, _rusage_snapshot())
+        usage["wall_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        try:
+            conn.send((status, payload, usage))
+        except (OSError, ValueError):
+            return
+
+
+# ============================================
+# Pool (processo principal)
+# ============================================
+
+
+class _Worker:
+    def __init__(self, context, cgroup_path: Optional[str]):
+        parent_conn, child_conn = context.Pipe()
+        self.conn = parent_conn
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn,), name="skill-sandbox", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        if cgroup_path:
+            _join_cgroup(cgroup_path, self.process.pid)
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        try:
+            self.process.kill()
+            self.process.join(timeout=1)
+        except Exception:
+            pass
+        self.conn.close()
+
+
+def _join_cgroup(cgroup_path: str, pid: int) -> None:
+    try:
+        with open(os.path.join(cgroup_path, "cgroup.procs"), "w") as f:
+            f.write(str(pid))
+    except OSError as e:
+        logger.warning("skill_sandbox_cgroup_join_failed", path=cgroup_path, error=str(e))
+
+
+def _configure_cgroup(
+    cgroup_path: str, memory_mb: Optional[int], max_tasks: Optional[int] = None
+) -> Optional[str]:
+    try:
+        os.makedirs(cgroup_path, exist_ok=True)
+        if memory_mb:
+            with open(os.path.join(cgroup_path, "memory.max"), "w") as f:
+                f.write(str(int(memory_mb) * MB))
+        if max_tasks:
+            with open(os.path.join(cgroup_path, "pids.max"), "w") as f:
+                f.write(str(int(max_tasks)))
+        return cgroup_path
+    except OSError as e:
+        logger.warning("skill_sandbox_cgroup_unavailable", path=cgroup_path, error=str(e))
+        return None
+
+
+def _exit_reason(exitcode: Optional[int]) -> str:
+    if exitcode is not None and exitcode < 0:
+        return _SIGNAL_REASONS.get(-exitcode, f"signal_{-exitcode}")
+    return f"exit_{exitcode}"
+
+
+class SandboxPool:
+    """Pool de workers pré-forkados (forkserver) para skills isolados."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        cgroup_path: Optional[str] = None,
+        cgroup_memory_mb: Optional[int] = None,
+        cgroup_max_tasks: Optional[int] = None,
+    ):
+        self.size = max(1, size)
+        self._context = multiprocessing.get_context("forkserver")
+        # Imports pesados ficam no forkserver: cada worker novo nasce já aquecido
+        self._context.set_forkserver_preload(["core.skills.registry"])
+        self._cgroup = (
+            _configure_cgroup(cgroup_path, cgroup_memory_mb, cgroup_max_tasks)
+            if cgroup_path
+            else None
+        )
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[_Worker] = []
+        self.stats = {"executions": 0, "worker_restarts": 0, "limit_kills": 0}
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context, self._cgroup)
+        self._workers.append(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.kill()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self.stats["worker_restarts"] += 1
+        return self._spawn()
+
+    def start(self) -> None:
+        """Pré-forka os workers (no event loop atual)."""
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(self._spawn())
+        logger.info("skill_sandbox_started", workers=self.size, cgroup=self._cgroup)
+
+    async def run(
+        self,
+        skill: Any,
+        args: Dict[str, Any],
+        limits: SandboxLimits,
+        timeout: float,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Executa o handler do skill num worker.
+
+        Returns:
+            (resultado ou mensagem de erro "❌ ...", uso de recursos da execução)
+        """
+        self.start()
+        worker = await self._idle.get()
+        if not worker.alive():
+            worker = self._replace(worker)
+
+        request = (skill.skill_path, skill.dir_name, skill.config, args, limits, timeout)
+        loop = asyncio.get_running_loop()
+        status, payload, usage = "error", "crashed", {}
+        # Só volta ao pool um worker sem resposta pendente no pipe
+        clean = False
+        try:
+            worker.conn.send(request)
+            ready = await loop.run_in_executor(None, worker.conn.poll, timeout + KILL_GRACE_SECONDS)
+            if ready:
+                status, payload, usage = worker.conn.recv()
+                clean = True
+            else:
+                status, payload = "error", "timeout"
+        except (EOFError, OSError, BrokenPipeError):
+            worker.process.join(timeout=1)
+            status, payload = "error", _exit_reason(worker.process.exitcode)
+        finally:
+            # Timeout, crash ou chamador cancelado (CancelledError): a resposta ainda
+            # pode chegar e seria entregue à próxima execução, então o worker é trocado
+            worker.tasks += 1
+            if self._idle is None:
+                worker.kill()  # pool fechado durante a execução
+            else:
+                if not clean:
+                    worker = self._replace(worker)
+                self._idle.put_nowait(worker)
+
+        self.stats["executions"] += 1
+        usage = {**usage, "sandboxed": True, "limits": limits.to_dict()}
+        if status == "ok":
+            return payload, usage
+
+        if status == "invalid_args":
+            return f"❌ Argumentos inválidos para skill '{skill.name}'.", usage
+        usage["error"] = payload
+        if payload in ("memory_limit", "cpu_limit", "file_size_limit", "timeout", "killed"):
+            self.stats["limit_kills"] += 1
+            logger.warning("skill_sandbox_limit_exceeded", skill=skill.name, reason=payload)
+            return f"❌ Skill '{skill.name}' excedeu o limite do sandbox ({payload}).", usage
+        logger.error("skill_sandbox_error", skill=skill.name, error=payload)
+        return f"❌ Erro ao executar skill '{skill.name}': {payload}", usage
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            worker.kill()
+        self._workers.clear()
+        self._idle = None
+
+
+_pool: Optional[SandboxPool] = None
+_cgroup: Optional[str] = None
+_cgroup_checked = False
+
+
+async def close_sandbox_pool() -> None:
+    """Encerra os workers do pool global (shutdown do bot/gateway)."""
+    if _pool is not None:
+        await _pool.close()
+
+
+def sandbox_enabled() -> bool:
+    return os.getenv("SKILL_SANDBOX_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def delegated_cgroup() -> Optional[str]:
+    """cgroup v2 delegado (SKILL_SANDBOX_CGROUP), configurado no primeiro uso."""
+    global _cgroup, _cgroup_checked
+    if not _cgroup_checked:
+        _cgroup_checked = True
+        path = os.getenv("SKILL_SANDBOX_CGROUP")
+        if path:
+            memory = os.getenv("SKILL_SANDBOX_CGROUP_MEMORY_MB")
+            tasks = os.getenv("SKILL_SANDBOX_CGROUP_MAX_TASKS")
+            _cgroup = _configure_cgroup(
+                path, int(memory) if memory else None, int(tasks) if tasks else None
+            )
+    return _cgroup
+
+
+def subprocess_preexec(limits: SandboxLimits) -> Optional[Callable[[], None]]:
+    """preexec_fn para subprocessos de skills: entra no cgroup delegado e aplica os rlimits.
+
+    None se não há nada a aplicar.
+    """
+    cgroup = delegated_cgroup()
+    if not cgroup and not limits.to_dict():
+        return None
+    procs = os.path.join(cgroup, "cgroup.procs") if cgroup else None
+
+    def _preexec() -> None:
+        if procs:
+            try:
+                # "0" = o próprio processo (já é o filho, antes do exec)
+                with open(procs, "w") as f:
+                    f.write("0")
+            except OSError:
+                pass  # sem logging no filho; os rlimits ainda valem
+        limits.apply()
+
+    return _preexec
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """Pool global (workers criados no primeiro uso)."""
+    global _pool
+    if _pool is None:
+        _pool = SandboxPool(
+            size=int(os.getenv("SKILL_SANDBOX_WORKERS", "2")),
+            cgroup_path=delegated_cgroup(),
+        )
+    return _pool
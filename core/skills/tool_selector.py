@@ -0,0 +1,160 @@
+"""
+Tool Selector — pré-seleção das tools relevantes por mensagem.
+
+Em vez de mandar os schemas de todos os skills a cada passo do ReAct, um
+scorer local escolhe os top-k mais relevantes:
+- índice de triggers (TriggerMatcher: Aho-Corasick, sem acentos)
+- "embedding" leve: vetor esparso de trigramas de caracteres (feature
+  hashing) da descrição + triggers do skill, comparado por cosseno
+
+Tools core (shell_exec, web_search, file_manager) vão sempre. O índice é
+reconstruído só quando a versão do registry muda.
+"""
+
+import hashlib
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+from .trigger_matcher import KIND_TRIGGER, TriggerMatcher, normalize_text
+
+logger = structlog.get_logger()
+
+DEFAULT_CORE_TOOLS = ("shell_exec", "web_search", "file_manager")
+EMBEDDING_DIM = 1024
+TRIGGER_WEIGHT = 1.0
+# Candidato precisa de score >= max(min_score, RELATIVE_CUTOFF * melhor score)
+RELATIVE_CUTOFF = 0.25
+
+# Frases (normalizadas) que indicam que o modelo sentiu falta de uma tool
+MISSING_TOOL_SIGNALS = (
+    "nao tenho acesso",
+    "nao tenho ferramenta",
+    "nao tenho uma ferramenta",
+    "nao tenho a ferramenta",
+    "nao possuo ferramenta",
+    "nenhuma ferramenta",
+    "ferramenta nao disponivel",
+    "ferramenta indisponivel",
+    "nao consigo acessar",
+    "i don t have access",
+    "no tool available",
+)
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> Dict[int, float]:
+    """Vetor esparso L2-normalizado de trigramas de caracteres por palavra."""
+    counts: Dict[int, float] = {}
+    for word in normalize_text(text).split():
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            gram = padded[i : i + 3]
+            bucket = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=4).digest(), "big")
+            counts[bucket % dim] = counts.get(bucket % dim, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values()))
+    if norm == 0:
+        return {}
+    return {k: v / norm for k, v in counts.items()}
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+def signals_missing_tool(text: Optional[str]) -> bool:
+    """True se a resposta do modelo sugere que faltou uma tool no conjunto exposto."""
+    if not text:
+        return False
+    padded = f" {normalize_text(text)} "
+    return any(f" {signal} " in padded for signal in MISSING_TOOL_SIGNALS)
+
+
+class ToolSelector:
+    """Escolhe os schemas de tools mais relevantes para uma mensagem."""
+
+    def __init__(
+        self,
+        top_k: int = 6,
+        core_tools: Iterable[str] = DEFAULT_CORE_TOOLS,
+        min_score: float = 0.15,
+    ):
+        self.top_k = top_k
+        self.core_tools = tuple(core_tools)
+        self.min_score = min_score
+        self._index_key: Optional[Tuple[int, Any]] = None
+        self._matcher: Optional[TriggerMatcher] = None
+        self._vectors: Dict[str, Dict[int, float]] = {}
+
+    def _ensure_index(self, registry: Any) -> None:
+        version = getattr(registry, "version", None)
+        key = (id(registry), version)
+        if version is not None and key == self._index_key:
+            return
+
+        skills = registry.list_skills()
+        vectors: Dict[str, Dict[int, float]] = {}
+        for skill in skills:
+            name = skill["name"]
+            document = " ".join(
+                [name.replace("_", " "), skill.get("description", ""), *skill["triggers"]]
+            )
+            vectors[name] = embed_text(document)
+
+        self._matcher = TriggerMatcher((skill["name"], skill["triggers"]) for skill in skills)
+        self._vectors = vectors
+        self._index_key = key
+        logger.debug("tool_selector_index_built", skills=len(vectors), version=version)
+
+    def score(self, registry: Any, message: str) -> List[Tuple[str, float]]:
+        """Scores de relevância por skill (maior primeiro)."""
+        self._ensure_index(registry)
+        matches = self._matcher.match_all(message)
+        message_vector = embed_text(message)
+
+        scores = []
+        for name, vector in self._vectors.items():
+            match = matches.get(name)
+            trigger_hits = match.hits if match and match.kind >= KIND_TRIGGER else 0
+            score = cosine(message_vector, vector) + TRIGGER_WEIGHT * min(trigger_hits, 3)
+            scores.append((name, round(score, 4)))
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores
+
+    def select(self, registry: Any, message: str, tools: List[dict]) -> List[dict]:
+        """
+        Filtra `tools` (schemas do registry) para core + top-k da mensagem.
+
+        Mantém a ordem original dos schemas (prefixo estável para o provider).
+        """
+        if self.top_k <= 0 or len(tools) <= self.top_k + len(self.core_tools):
+            return tools
+
+        scores = self.score(registry, message)
+        best = scores[0][1] if scores else 0.0
+        threshold = max(self.min_score, RELATIVE_CUTOFF * best)
+        ranked = [name for name, score in scores if score >= threshold]
+        chosen = set(self.core_tools) | set(ranked[: self.top_k])
+        selected = [tool for tool in tools if tool["function"]["name"] in chosen]
+
+        logger.info(
+            "tool_selection",
+            selected=len(selected),
+            total=len(tools),
+            top=ranked[:3],
+        )
+        return selected
+
+
+_selector: Optional[ToolSelector] = None
+
+
+def get_tool_selector() -> ToolSelector:
+    """Selector global; REACT_TOOL_TOP_K=0 desliga a filtragem."""
+    global _selector
+    if _selector is None:
+        _selector = ToolSelector(top_k=int(os.getenv("REACT_TOOL_TOP_K", "6")))
+    return _selector
@@ -0,0 +1,160 @@
+"""
+Trigger Matcher — autômato Aho-Corasick sobre os triggers dos skills.
+
+Triggers e texto são normalizados (minúsculas, sem acentos, pontuação exceto
+"/" e "_" vira espaço), então "memória", "Memoria" e "MEMÓRIA!" casam igual.
+O autômato é montado uma vez por versão do registry e a busca é uma única
+passada no texto.
+
+Só conta match em fronteira de palavra ("ram" não casa em "programa").
+O melhor skill é escolhido de forma determinística por:
+1. tipo do match: texto inteiro == trigger > trigger > nome do skill
+2. tamanho do match (mais longo vence)
+3. número de triggers distintos do skill encontrados
+4. ordem de registro
+"""
+
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_NON_WORD = re.compile(r"[^a-z0-9/_]+")
+
+KIND_NAME = 1
+KIND_TRIGGER = 2
+KIND_EXACT = 3
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas, sem acentos, pontuação vira espaço (ex: 'Memória!' -> 'memoria').
+
+    "/" e "_" são mantidos para casar comandos (/status) e nomes (get_ram).
+    """
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", folded).strip()
+
+
+@dataclass(frozen=True)
+class TriggerMatch:
+    """Melhor match de um skill no texto."""
+
+    skill: str
+    pattern: str
+    kind: int
+    start: int
+    hits: int
+
+
+class AhoCorasick:
+    """Autômato Aho-Corasick mínimo (transições em dict por estado)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            if pattern not in self._out[state]:
+                self._out[state].append(pattern)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, str]]:
+        """Gera (início, pattern) de todas as ocorrências, numa única passada."""
+        state = 0
+        for index, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for pattern in self._out[state]:
+                yield index - len(pattern) + 1, pattern
+
+
+class TriggerMatcher:
+    """Índice compilado de triggers -> skills."""
+
+    def __init__(self, skills: Iterable[Tuple[str, Iterable[str]]]):
+        self._order: Dict[str, int] = {}
+        # pattern normalizado -> [(skill, kind)]
+        self._owners: Dict[str, List[Tuple[str, int]]] = {}
+
+        for position, (name, triggers) in enumerate(skills):
+            self._order[name] = position
+            for trigger in triggers:
+                self._add(normalize_text(trigger), name, KIND_TRIGGER)
+            self._add(normalize_text(name), name, KIND_NAME)
+
+        self._automaton = AhoCorasick(self._owners)
+
+    def _add(self, pattern: str, skill: str, kind: int) -> None:
+        if not pattern:
+            return
+        owners = self._owners.setdefault(pattern, [])
+        if (skill, kind) not in owners:
+            owners.append((skill, kind))
+
+    def match_all(self, text: str) -> Dict[str, TriggerMatch]:
+        """Melhor match de cada skill presente no texto."""
+        haystack = normalize_text(text)
+        best: Dict[str, TriggerMatch] = {}
+        seen: Dict[str, set] = {}
+
+        for start, pattern in self._automaton.iter_matches(haystack):
+            end = start + len(pattern)
+            if not _at_boundary(haystack, start, end):
+                continue
+            exact = start == 0 and end == len(haystack)
+            for skill, kind in self._owners[pattern]:
+                match_kind = KIND_EXACT if exact and kind == KIND_TRIGGER else kind
+                seen.setdefault(skill, set()).add(pattern)
+                current = best.get(skill)
+                candidate = TriggerMatch(skill, pattern, match_kind, start, 0)
+                if current is None or _rank(candidate) > _rank(current):
+                    best[skill] = candidate
+
+        return {
+            skill: TriggerMatch(m.skill, m.pattern, m.kind, m.start, len(seen[skill]))
+            for skill, m in best.items()
+        }
+
+    def best(self, text: str) -> Optional[TriggerMatch]:
+        """Skill que melhor corresponde ao texto (ou None)."""
+        matches = self.match_all(text)
+        if not matches:
+            return None
+        return max(
+            matches.values(),
+            key=lambda m: (*_rank(m), m.hits, -self._order.get(m.skill, 0)),
+        )
+
+
+def _rank(match: TriggerMatch) -> Tuple[int, int]:
+    return match.kind, len(match.pattern)
+
+
+def _at_boundary(text: str, start: int, end: int) -> bool:
+    before_ok = start == 0 or not text[start - 1].isalnum()
+    after_ok = end == len(text) or not text[end].isalnum()
+    return before_ok and after_ok
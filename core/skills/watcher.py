@@ -0,0 +1,122 @@
+"""
+Skill Watcher — hot reload dos skills sem reiniciar o processo.
+
+Faz polling barato (stat de config.yaml/handler.py via manifest) nos
+diretórios de skills. Quando algo muda (catalog sync, self_edit, deploy):
+1. registry.reload_changed() reimporta só os diretórios alterados e troca
+   os skills de forma atômica (nova versão do registry)
+2. caches dependentes são invalidados (schemas/triggers pela versão; prompt
+   do ReAct explicitamente)
+3. execuções em andamento da versão antiga são drenadas antes de logar a
+   conclusão do reload
+
+Config (env):
+    SKILLS_HOT_RELOAD=true|false        (default: true)
+    SKILLS_WATCH_INTERVAL_SECONDS=2
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+import structlog
+
+from .registry import ReloadResult, SkillRegistry, get_skill_registry
+
+logger = structlog.get_logger()
+
+WATCH_INTERVAL_SECONDS = float(os.getenv("SKILLS_WATCH_INTERVAL_SECONDS", "2"))
+DRAIN_TIMEOUT_SECONDS = 30.0
+
+
+def _invalidate_dependent_caches() -> None:
+    try:
+        from core.vps_langgraph.prompt_cache import invalidate_prompt_cache
+
+        invalidate_prompt_cache()
+    except Exception as e:
+        logger.debug("skill_watcher_prompt_invalidate_failed", error=str(e))
+
+
+class SkillWatcher:
+    """Task de polling que aplica reloads incrementais no registry."""
+
+    def __init__(
+        self,
+        registry: Optional[SkillRegistry] = None,
+        interval: float = WATCH_INTERVAL_SECONDS,
+        drain_timeout: float = DRAIN_TIMEOUT_SECONDS,
+    ):
+        self._registry = registry
+        self.interval = interval
+        self.drain_timeout = drain_timeout
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    @property
+    def registry(self) -> SkillRegistry:
+        return self._registry or get_skill_registry()
+
+    async def poll_once(self) -> ReloadResult:
+        """Verifica mudanças uma vez e aplica o reload (se houver)."""
+        registry = self.registry
+        result = await asyncio.to_thread(registry.reload_changed)
+        if not result.changed:
+            return result
+
+        self.reloads += 1
+        _invalidate_dependent_caches()
+        if result.retired:
+            drained = await registry.drain(result.retired, self.drain_timeout)
+            logger.info(
+                "skills_old_versions_drained",
+                skills=[skill.name for skill in result.retired],
+                drained=drained,
+            )
+        return result
+
+    async def _run(self) -> None:
+        logger.info("skill_watcher_started", interval=self.interval)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("skill_watcher_error", error=str(e))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_watcher: Optional[SkillWatcher] = None
+
+
+def start_skill_watcher() -> Optional[SkillWatcher]:
+    """Inicia o watcher global (no event loop atual), se habilitado."""
+    global _watcher
+    if os.getenv("SKILLS_HOT_RELOAD", "true").lower() not in ("1", "true", "yes"):
+        return None
+    if _watcher is None:
+        _watcher = SkillWatcher()
+    _watcher.start()
+    return _watcher
+
+
+async def stop_skill_watcher() -> None:
+    global _watcher
+    if _watcher is not None:
+        await _watcher.stop()
+        _watcher = None
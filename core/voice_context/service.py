@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import multiprocessing
 import os
 import re
 import shutil
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -52,6 +58,94 @@ class TranscriptQualityReport:
     metrics: dict[str, Any]
 
 
+@dataclass(slots=True)
+class _InboxFile:
+    """One inbox file moving through the sync_inbox stages."""
+
+    index: int
+    source_path: Path
+    sha256: str
+    processing_path: Path
+    file_id: int
+    transcript: TranscriptResult | None = None
+    quality: TranscriptQualityReport | None = None
+    transcript_path: Path | None = None
+    extracted: dict[str, Any] | None = None
+    error: Exception | None = None
+
+
+@dataclass(slots=True)
+class _PipelineStage:
+    """Concurrency limit plus timing and queue-depth counters for one stage."""
+
+    limit: int
+    runs: int = 0
+    busy_ms: float = 0.0
+    waiting: int = 0
+    max_queue_depth: int = 0
+    semaphore: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.semaphore = asyncio.Semaphore(self.limit)
+
+    @asynccontextmanager
+    async def slot(self):
+        self.waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.waiting)
+        async with self.semaphore:
+            self.waiting -= 1
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.runs += 1
+                self.busy_ms += (time.perf_counter() - started) * 1000
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "runs": self.runs,
+            "busy_ms": round(self.busy_ms, 1),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+_transcription_executor: ProcessPoolExecutor | None = None
+_transcription_executor_workers = 0
+
+
+def _init_transcription_worker(threads: int) -> None:
+    # Split the cores between workers instead of every model using all of them.
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+
+
+def _transcribe_in_worker(model_size: str, device: str, file_path: str) -> TranscriptResult:
+    # The Whisper model is cached per worker process by WhisperTranscriber.
+    return WhisperTranscriber(model_size=model_size, device=device).transcribe_file(file_path)
+
+
+def _transcription_pool(workers: int) -> ProcessPoolExecutor:
+    global _transcription_executor, _transcription_executor_workers
+    if _transcription_executor is None or _transcription_executor_workers != workers:
+        _reset_transcription_pool()
+        _transcription_executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_transcription_worker,
+            initargs=(max(1, (os.cpu_count() or 1) // workers),),
+        )
+        _transcription_executor_workers = workers
+    return _transcription_executor
+
+
+def _reset_transcription_pool() -> None:
+    global _transcription_executor, _transcription_executor_workers
+    if _transcription_executor is not None:
+        _transcription_executor.shutdown(wait=False, cancel_futures=True)
+    _transcription_executor = None
+    _transcription_executor_workers = 0
+
+
 class VoiceContextService:
     """Coordinates voice ingestion, extraction, memory commit, and review proposals."""
 
@@ -233,12 +327,13 @@ class VoiceContextService:
         stats["missing_requested_files"] = missing_names
 
         try:
-            for path in selected:
-                file_result = await self._process_one_file(
-                    job_id=job_id,
-                    source_path=path,
-                    user_id=resolved_user_id,
-                )
+            file_results = await self._run_inbox_pipeline(
+                job_id=job_id,
+                selected=selected,
+                user_id=resolved_user_id,
+                stats=stats,
+            )
+            for file_result in file_results:
                 self._merge_file_result(stats, file_result)
 
             stats["batch_recommendation"] = self._recommend_batch_action(stats)
@@ -266,133 +361,277 @@ class VoiceContextService:
                 **stats,
             }
 
-    async def _process_one_file(
+    async def _run_inbox_pipeline(
         self,
         *,
         job_id: int,
-        source_path: Path,
+        selected: list[Path],
         user_id: str,
-    ) -> dict[str, Any]:
-        sha256 = self._compute_sha256(source_path)
-        if self._sha_already_processed(sha256):
-            self._archive_duplicate(source_path, sha256)
-            self._record_duplicate_file(job_id=job_id, sha256=sha256, source_path=source_path)
-            return {"success": True, "duplicate": True, "context_items": 0}
-
-        processing_path = (
-            Path(self.settings.processing_dir) / f"{sha256}{source_path.suffix.lower()}"
-        )
-        shutil.move(str(source_path), processing_path)
-        file_id = self._register_file(
-            job_id=job_id,
-            sha256=sha256,
-            filename=source_path.name,
-            status="processing",
+        stats: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """Processes one batch as stages instead of file by file.
+
+        Hashing runs in threads with a single duplicate lookup; each file then
+        goes through transcription (process pool) and LLM extraction on its own,
+        bounded per stage; persistence runs once per job on one connection.
+        Results keep the order of ``selected``.
+        """
+        started = time.perf_counter()
+        results: list[dict[str, Any] | None] = [None] * len(selected)
+
+        shas = await asyncio.gather(
+            *(asyncio.to_thread(self._compute_sha256, path) for path in selected)
         )
-
+        known = self._processed_shas(set(shas))
+        entries: list[_InboxFile] = []
+        conn = self._get_conn()
         try:
-            transcript = self.transcriber.transcribe_file(processing_path)
-            quality = self.evaluate_transcript_quality(transcript)
-            force_review = (
-                float(transcript.duration_seconds)
-                >= float(self.settings.auto_commit_max_duration_minutes) * 60.0
-            ) or quality.score < float(self.settings.quality_warn_score)
-            transcript_path = self._write_transcript(sha256=sha256, transcript=transcript)
-            if quality.score < float(self.settings.quality_min_score):
-                archive_path = Path(self.settings.archive_dir) / processing_path.name
-                shutil.move(str(processing_path), archive_path)
-                reason = "; ".join(quality.reasons) or "low transcript quality"
-                self._update_file_status(
+            cur = conn.cursor()
+            for index, (path, sha256) in enumerate(zip(selected, shas)):
+                # Same audio twice in one batch counts as a duplicate too.
+                if sha256 in known:
+                    self._archive_duplicate(path, sha256)
+                    self._record_duplicate_file(cur, job_id=job_id, sha256=sha256, source_path=path)
+                    conn.commit()
+                    results[index] = {"success": True, "duplicate": True, "context_items": 0}
+                    continue
+                known.add(sha256)
+                # Register (and commit) before moving, so a file in processing_dir
+                # always has its row and a failure here only affects this file.
+                try:
+                    file_id = self._register_file(
+                        cur, job_id=job_id, sha256=sha256, filename=path.name, status="processing"
+                    )
+                    conn.commit()
+                except Exception as exc:
+                    # e.g. UNIQUE(sha256) with an earlier failed/discarded_quality row
+                    conn.rollback()
+                    results[index] = self._fail_unregistered_file(path, sha256=sha256, error=exc)
+                    continue
+                entry = _InboxFile(
+                    index=index,
+                    source_path=path,
+                    sha256=sha256,
+                    processing_path=Path(self.settings.processing_dir)
+                    / f"{sha256}{path.suffix.lower()}",
                     file_id=file_id,
-                    status="discarded_quality",
-                    duration_seconds=transcript.duration_seconds,
-                    transcript_path=str(transcript_path),
-                    archive_path=str(archive_path),
-                    error=f"quality_score={quality.score:.2f}; {reason}",
                 )
-                return {
-                    "success": True,
-                    "discarded_low_quality": 1,
-                    "context_items": 0,
-                    "auto_committed": 0,
-                    "pending_review": 0,
-                    "review_required_files": 1 if force_review else 0,
-                    "report": self._build_file_report(
-                        file_name=source_path.name,
-                        transcript=transcript,
-                        quality=quality,
-                        status="discarded_quality",
-                        reason=reason,
-                        recommended_action="discard",
-                        review_required=force_review,
-                    ),
-                }
-            extracted = await self.extractor.extract_structured_context(
-                transcript.text,
-                source_name=source_path.name,
-            )
-            items = self._build_context_items(
-                extraction=extracted,
-                job_id=job_id,
-                file_id=file_id,
-                batch_date=datetime.utcnow().date().isoformat(),
-                transcript_duration_seconds=float(transcript.duration_seconds),
-                force_review=force_review,
-                quality=quality,
-            )
-            commit_stats = self._persist_context_items(
-                job_id=job_id,
-                file_id=file_id,
-                user_id=user_id,
-                items=items,
-            )
-            archive_path = Path(self.settings.archive_dir) / processing_path.name
-            shutil.move(str(processing_path), archive_path)
+                try:
+                    shutil.move(str(path), entry.processing_path)
+                except OSError as exc:
+                    results[index] = self._fail_inbox_file(conn, entry=entry, error=exc)
+                    continue
+                entries.append(entry)
+        finally:
+            conn.close()
+        hashed_at = time.perf_counter()
+
+        transcribe_stage = _PipelineStage(limit=self._transcription_workers())
+        extract_stage = _PipelineStage(
+            limit=max(1, int(getattr(self.settings, "extraction_concurrency", 3) or 1))
+        )
+
+        async def transcribe_and_extract(entry: _InboxFile) -> None:
+            try:
+                async with transcribe_stage.slot():
+                    entry.transcript = await self._transcribe(entry.processing_path)
+                entry.quality = self.evaluate_transcript_quality(entry.transcript)
+                entry.transcript_path = self._write_transcript(
+                    sha256=entry.sha256, transcript=entry.transcript
+                )
+                if entry.quality.score < float(self.settings.quality_min_score):
+                    return
+                async with extract_stage.slot():
+                    entry.extracted = await self.extractor.extract_structured_context(
+                        entry.transcript.text,
+                        source_name=entry.source_path.name,
+                    )
+            except Exception as exc:
+                entry.error = exc
+
+        await asyncio.gather(*(transcribe_and_extract(entry) for entry in entries))
+        extracted_at = time.perf_counter()
+
+        if entries:
+            conn = self._get_conn()
+            try:
+                for entry in entries:
+                    try:
+                        if entry.error is not None:
+                            raise entry.error
+                        results[entry.index] = self._persist_inbox_file(
+                            conn, job_id=job_id, user_id=user_id, entry=entry
+                        )
+                    except Exception as exc:
+                        conn.rollback()
+                        results[entry.index] = self._fail_inbox_file(conn, entry=entry, error=exc)
+            finally:
+                conn.close()
+
+        finished_at = time.perf_counter()
+        stats["pipeline"] = {
+            "files": len(selected),
+            "hash_dedup_ms": round((hashed_at - started) * 1000, 1),
+            "transcribe_extract_ms": round((extracted_at - hashed_at) * 1000, 1),
+            "persist_ms": round((finished_at - extracted_at) * 1000, 1),
+            "total_ms": round((finished_at - started) * 1000, 1),
+            "transcribe": transcribe_stage.to_dict(),
+            "extract": extract_stage.to_dict(),
+        }
+        return [result for result in results if result is not None]
+
+    def _persist_inbox_file(
+        self,
+        conn,
+        *,
+        job_id: int,
+        user_id: str,
+        entry: _InboxFile,
+    ) -> dict[str, Any]:
+        transcript = entry.transcript
+        quality = entry.quality
+        source_path = entry.source_path
+        processing_path = entry.processing_path
+        force_review = (
+            float(transcript.duration_seconds)
+            >= float(self.settings.auto_commit_max_duration_minutes) * 60.0
+        ) or quality.score < float(self.settings.quality_warn_score)
+        archive_path = Path(self.settings.archive_dir) / processing_path.name
+        cur = conn.cursor()
+
+        if entry.extracted is None:
+            reason = "; ".join(quality.reasons) or "low transcript quality"
             self._update_file_status(
-                file_id=file_id,
-                status="completed",
+                cur,
+                file_id=entry.file_id,
+                status="discarded_quality",
                 duration_seconds=transcript.duration_seconds,
-                transcript_path=str(transcript_path),
+                transcript_path=str(entry.transcript_path),
                 archive_path=str(archive_path),
-                error=self._file_status_reason(force_review=force_review, quality=quality),
+                error=f"quality_score={quality.score:.2f}; {reason}",
             )
+            conn.commit()
+            shutil.move(str(processing_path), archive_path)
             return {
                 "success": True,
-                **commit_stats,
-                "review_required_files": 1
-                if force_review or commit_stats.get("pending_review")
-                else 0,
+                "discarded_low_quality": 1,
+                "context_items": 0,
+                "auto_committed": 0,
+                "pending_review": 0,
+                "review_required_files": 1 if force_review else 0,
                 "report": self._build_file_report(
                     file_name=source_path.name,
                     transcript=transcript,
                     quality=quality,
-                    status="completed",
-                    reason=self._file_status_reason(force_review=force_review, quality=quality),
-                    committed_targets=commit_stats.get("committed_targets"),
-                    pending_targets=commit_stats.get("pending_targets"),
-                    item_counts=self._count_items_by_type(items),
-                    recommended_action=self._recommend_file_action(
-                        quality=quality,
-                        force_review=force_review,
-                        pending_review=int(commit_stats.get("pending_review", 0)),
-                    ),
-                    review_required=force_review or bool(commit_stats.get("pending_review")),
-                    would_auto_commit=int(commit_stats.get("auto_committed", 0)),
-                    would_require_review=int(commit_stats.get("pending_review", 0)),
+                    status="discarded_quality",
+                    reason=reason,
+                    recommended_action="discard",
+                    review_required=force_review,
                 ),
             }
-        except Exception as exc:
-            failed_path = Path(self.settings.failed_dir) / processing_path.name
-            if processing_path.exists():
-                shutil.move(str(processing_path), failed_path)
-            self._update_file_status(
-                file_id=file_id,
-                status="failed",
-                error=str(exc),
-                archive_path=str(failed_path),
+
+        items = self._build_context_items(
+            extraction=entry.extracted,
+            job_id=job_id,
+            file_id=entry.file_id,
+            batch_date=datetime.utcnow().date().isoformat(),
+            transcript_duration_seconds=float(transcript.duration_seconds),
+            force_review=force_review,
+            quality=quality,
+        )
+        commit_stats = self._persist_context_items(
+            conn,
+            job_id=job_id,
+            file_id=entry.file_id,
+            user_id=user_id,
+            items=items,
+        )
+        status_reason = self._file_status_reason(force_review=force_review, quality=quality)
+        self._update_file_status(
+            cur,
+            file_id=entry.file_id,
+            status="completed",
+            duration_seconds=transcript.duration_seconds,
+            transcript_path=str(entry.transcript_path),
+            archive_path=str(archive_path),
+            error=status_reason,
+        )
+        conn.commit()
+        shutil.move(str(processing_path), archive_path)
+        return {
+            "success": True,
+            **commit_stats,
+            "review_required_files": 1 if force_review or commit_stats.get("pending_review") else 0,
+            "report": self._build_file_report(
+                file_name=source_path.name,
+                transcript=transcript,
+                quality=quality,
+                status="completed",
+                reason=status_reason,
+                committed_targets=commit_stats.get("committed_targets"),
+                pending_targets=commit_stats.get("pending_targets"),
+                item_counts=self._count_items_by_type(items),
+                recommended_action=self._recommend_file_action(
+                    quality=quality,
+                    force_review=force_review,
+                    pending_review=int(commit_stats.get("pending_review", 0)),
+                ),
+                review_required=force_review or bool(commit_stats.get("pending_review")),
+                would_auto_commit=int(commit_stats.get("auto_committed", 0)),
+                would_require_review=int(commit_stats.get("pending_review", 0)),
+            ),
+        }
+
+    def _fail_inbox_file(self, conn, *, entry: _InboxFile, error: Exception) -> dict[str, Any]:
+        failed_path = Path(self.settings.failed_dir) / entry.processing_path.name
+        if entry.processing_path.exists():
+            shutil.move(str(entry.processing_path), failed_path)
+        self._update_file_status(
+            conn.cursor(),
+            file_id=entry.file_id,
+            status="failed",
+            error=str(error),
+            archive_path=str(failed_path),
+        )
+        conn.commit()
+        logger.error("voice_context.file_failed", file=str(entry.source_path), error=str(error))
+        return {"success": False, "context_items": 0, "auto_committed": 0, "pending_review": 0}
+
+    def _fail_unregistered_file(
+        self, source_path: Path, *, sha256: str, error: Exception
+    ) -> dict[str, Any]:
+        failed_path = Path(self.settings.failed_dir) / f"{sha256}{source_path.suffix.lower()}"
+        if source_path.exists():
+            shutil.move(str(source_path), failed_path)
+        logger.error(
+            "voice_context.file_register_failed",
+            file=str(source_path),
+            moved_to=str(failed_path),
+            error=str(error),
+        )
+        return {"success": False, "context_items": 0, "auto_committed": 0, "pending_review": 0}
+
+    def _transcription_workers(self) -> int:
+        configured = int(getattr(self.settings, "transcription_workers", 0) or 0)
+        return max(1, configured or os.cpu_count() or 1)
+
+    async def _transcribe(self, path: Path) -> TranscriptResult:
+        """Runs the transcriber off the event loop (process pool for local Whisper)."""
+        workers = self._transcription_workers()
+        if type(self.transcriber) is not WhisperTranscriber or workers < 2:
+            return await asyncio.to_thread(self.transcriber.transcribe_file, path)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                _transcription_pool(workers),
+                _transcribe_in_worker,
+                self.transcriber.model_size,
+                self.transcriber.device,
+                str(path),
             )
-            logger.error("voice_context.file_failed", file=str(source_path), error=str(exc))
-            return {"success": False, "context_items": 0, "auto_committed": 0, "pending_review": 0}
+        except BrokenProcessPool:
+            _reset_transcription_pool()
+            raise
 
     async def _inspect_one_file(self, *, source_path: Path) -> dict[str, Any]:
         sha256 = self._compute_sha256(source_path)
@@ -569,6 +808,7 @@ class VoiceContextService:
 
     def _persist_context_items(
         self,
+        conn,
         *,
         job_id: int,
         file_id: int,
@@ -590,44 +830,46 @@ class VoiceContextService:
         committed_targets: dict[str, int] = {}
         pending_targets: dict[str, int] = {}
         proposal_ids: list[int] = []
-        conn = self._get_conn()
+        to_commit: list[tuple[int, dict[str, Any]]] = []
         cur = conn.cursor()
 
-        try:
-            for item in items:
-                decision = self.assess_item_decision(item)
-                item_id = self._insert_context_item(
-                    cur,
-                    job_id=job_id,
-                    file_id=file_id,
-                    item=item,
-                    risk_level=decision.risk_level,
-                )
-                conn.commit()
-                if decision.auto_commit:
-                    self._commit_item(
-                        item_id=item_id, user_id=user_id, item=item, actor="voice_context"
-                    )
-                    auto_committed += 1
-                    target = str(item.get("memory_target") or "unknown")
-                    committed_targets[target] = committed_targets.get(target, 0) + 1
-                else:
-                    proposal_id = self._create_review_proposal(cur, item_id=item_id, item=item)
-                    cur.execute(
-                        """
-                        UPDATE voice_context_items
-                        SET commit_status = 'pending_review', proposal_id = %s
-                        WHERE id = %s
-                        """,
-                        (proposal_id, item_id),
-                    )
-                    conn.commit()
-                    pending_review += 1
-                    proposal_ids.append(proposal_id)
-                    target = str(item.get("memory_target") or "unknown")
-                    pending_targets[target] = pending_targets.get(target, 0) + 1
-        finally:
-            conn.close()
+        for item in items:
+            decision = self.assess_item_decision(item)
+            item_id = self._insert_context_item(
+                cur,
+                job_id=job_id,
+                file_id=file_id,
+                item=item,
+                risk_level=decision.risk_level,
+            )
+            if decision.auto_commit:
+                to_commit.append((item_id, item))
+                continue
+            proposal_id = self._create_review_proposal(cur, item_id=item_id, item=item)
+            cur.execute(
+                """
+                UPDATE voice_context_items
+                SET commit_status = 'pending_review', proposal_id = %s
+                WHERE id = %s
+                """,
+                (proposal_id, item_id),
+            )
+            pending_review += 1
+            proposal_ids.append(proposal_id)
+            target = str(item.get("memory_target") or "unknown")
+            pending_targets[target] = pending_targets.get(target, 0) + 1
+        # Items exist before their memories are written, as with per-item commits.
+        conn.commit()
+
+        for item_id, item in to_commit:
+            self._commit_item(
+                item_id=item_id, user_id=user_id, item=item, actor="voice_context", cur=cur
+            )
+            # The memory is already stored: record its key before the next item can fail.
+            conn.commit()
+            auto_committed += 1
+            target = str(item.get("memory_target") or "unknown")
+            committed_targets[target] = committed_targets.get(target, 0) + 1
 
         return {
             "context_items": len(items),
@@ -752,6 +994,7 @@ class VoiceContextService:
         user_id: str,
         item: dict[str, Any],
         actor: str,
+        cur=None,
     ) -> dict[str, Any]:
         payload = item.get("payload") or {}
         memory_target = MemoryType(str(item.get("memory_target")))
@@ -778,8 +1021,11 @@ class VoiceContextService:
             source="voice_context",
         )
 
-        conn = self._get_conn()
-        cur = conn.cursor()
+        # With a caller cursor (batched persistence) the caller commits.
+        conn = None
+        if cur is None:
+            conn = self._get_conn()
+            cur = conn.cursor()
         try:
             cur.execute(
                 """
@@ -789,9 +1035,11 @@ class VoiceContextService:
                 """,
                 (memory_key, item_id),
             )
-            conn.commit()
+            if conn is not None:
+                conn.commit()
         finally:
-            conn.close()
+            if conn is not None:
+                conn.close()
 
         return {"success": True, "memory_key": memory_key}
 
@@ -1142,47 +1390,36 @@ class VoiceContextService:
 
     def _register_file(
         self,
+        cur,
         *,
         job_id: int,
         sha256: str,
         filename: str,
         status: str,
     ) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        try:
-            cur.execute(
-                """
-                INSERT INTO voice_audio_files (job_id, sha256, filename, status)
-                VALUES (%s, %s, %s, %s)
-                RETURNING id
-                """,
-                (job_id, sha256, filename, status),
-            )
-            file_id = int(cur.fetchone()[0])
-            conn.commit()
-            return file_id
-        finally:
-            conn.close()
+        cur.execute(
+            """
+            INSERT INTO voice_audio_files (job_id, sha256, filename, status)
+            VALUES (%s, %s, %s, %s)
+            RETURNING id
+            """,
+            (job_id, sha256, filename, status),
+        )
+        return int(cur.fetchone()[0])
 
-    def _record_duplicate_file(self, *, job_id: int, sha256: str, source_path: Path) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        try:
-            cur.execute(
-                """
-                INSERT INTO voice_audio_files (job_id, sha256, filename, status)
-                VALUES (%s, %s, %s, 'duplicate')
-                ON CONFLICT (sha256) DO NOTHING
-                """,
-                (job_id, sha256, source_path.name),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+    def _record_duplicate_file(self, cur, *, job_id: int, sha256: str, source_path: Path) -> None:
+        cur.execute(
+            """
+            INSERT INTO voice_audio_files (job_id, sha256, filename, status)
+            VALUES (%s, %s, %s, 'duplicate')
+            ON CONFLICT (sha256) DO NOTHING
+            """,
+            (job_id, sha256, source_path.name),
+        )
 
     def _update_file_status(
         self,
+        cur,
         *,
         file_id: int,
         status: str,
@@ -1191,23 +1428,35 @@ class VoiceContextService:
         archive_path: str | None = None,
         error: str | None = None,
     ) -> None:
+        cur.execute(
+            """
+            UPDATE voice_audio_files
+            SET status = %s,
+                duration_seconds = COALESCE(%s, duration_seconds),
+                transcript_path = COALESCE(%s, transcript_path),
+                archive_path = COALESCE(%s, archive_path),
+                error = COALESCE(%s, error),
+                updated_at = NOW()
+            WHERE id = %s
+            """,
+            (status, duration_seconds, transcript_path, archive_path, error, file_id),
+        )
+
+    def _processed_shas(self, shas: set[str]) -> set[str]:
+        """Subset of shas already ingested (one query for the whole batch)."""
+        if not shas:
+            return set()
         conn = self._get_conn()
         cur = conn.cursor()
         try:
             cur.execute(
                 """
-                UPDATE voice_audio_files
-                SET status = %s,
-                    duration_seconds = COALESCE(%s, duration_seconds),
-                    transcript_path = COALESCE(%s, transcript_path),
-                    archive_path = COALESCE(%s, archive_path),
-                    error = COALESCE(%s, error),
-                    updated_at = NOW()
-                WHERE id = %s
+                SELECT sha256 FROM voice_audio_files
+                WHERE sha256 = ANY(%s) AND status IN ('processing', 'completed', 'duplicate')
                 """,
-                (status, duration_seconds, transcript_path, archive_path, error, file_id),
+                (sorted(shas),),
             )
-            conn.commit()
+            return {row[0] for row in cur.fetchall()}
         finally:
             conn.close()
 
@@ -350,8 +350,6 @@ def check_system_health() -> Dict[str, Any]:
     Returns:
         Dicionário com status de saúde
     """
-    import subprocess
-
     checks = {}
 
     # Verificar PostgreSQL
@@ -389,18 +387,15 @@ def check_system_health() -> Dict[str, Any]:
 
     # Verificar memória
     try:
-        result = subprocess.run(["free", "-m"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            lines = result.stdout.strip().split("\n")
-            mem_line = lines[1].split()
-            total = mem_line[1]
-            used = mem_line[2]
-            free = mem_line[3]
+        from core.resource_manager.sampler import get_resource_sampler
+
+        sample = get_resource_sampler().latest()
+        if sample is not None:
             checks["memory"] = {
                 "status": "healthy",
-                "total_mb": total,
-                "used_mb": used,
-                "free_mb": free,
+                "total_mb": sample.mem_total_mb,
+                "used_mb": sample.mem_used_mb,
+                "free_mb": sample.mem_available_mb,
             }
     except Exception as e:
         checks["memory"] = {"status": "unknown", "error": str(e)[:100]}
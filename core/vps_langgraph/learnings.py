@@ -15,6 +15,9 @@ Estrutura da tabela learnings:
 
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
 from typing import Any, Dict, List, Optional
 
@@ -22,6 +25,31 @@ import structlog
 
 logger = structlog.get_logger()
 
+# Cache in-process de search_learnings (consultas quentes: cada turno ReAct e
+# cada execucao de skill). add_learning limpa o cache.
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("LEARNINGS_SEARCH_CACHE_TTL_SECONDS", "30"))
+SEARCH_CACHE_MAX_ENTRIES = 256
+TRIGRAM_ENABLED = os.getenv("LEARNINGS_TRIGRAM_ENABLED", "true") == "true"
+
+# Janela do "falhou recentemente" em dias do rollup (2 = hoje e ontem, UTC)
+FAILURE_WINDOW_DAYS = int(os.getenv("LEARNINGS_FAILURE_WINDOW_DAYS", "2"))
+UTC_TODAY = "(NOW() AT TIME ZONE 'UTC')::date"
+
+LEARNING_COLUMNS = ["id", "category", "trigger", "lesson", "success", "metadata", "created_at"]
+
+# Mesmas expressoes dos indices GIN (learnings_trigger_idx / learnings_lesson_idx):
+# o planner so usa o indice se a expressao for identica.
+TRIGGER_TSV = "to_tsvector('portuguese', trigger)"
+LESSON_TSV = "to_tsvector('portuguese', lesson)"
+
+# websearch_to_tsquery junta os termos com AND; match_any troca por OR
+# (mensagens longas do usuario raramente contem todos os termos).
+TSQUERY_ALL = "websearch_to_tsquery('portuguese', %(q)s)"
+# (o texto do tsquery ja vem com stems; 'simple' so o re-parseia)
+TSQUERY_ANY = (
+    "to_tsquery('simple', replace(websearch_to_tsquery('portuguese', %(q)s)::text, ' & ', ' | '))"
+)
+
 
 # Conexão com PostgreSQL
 def get_db_connection():
@@ -79,11 +107,51 @@ def init_learnings_table():
     -- Índice para buscar por categoria
     CREATE INDEX IF NOT EXISTS learnings_category_idx ON learnings(category);
 
+    -- Janelas recentes dos triggers autônomos (error_repeated: 1h, self_improvement: 24h)
+    CREATE INDEX IF NOT EXISTS learnings_category_created_idx ON learnings(category, created_at);
+    CREATE INDEX IF NOT EXISTS learnings_failures_created_idx ON learnings(created_at)
+        WHERE success = FALSE;
+
     -- Índice para buscar por gatilho (uso de texto simples)
     CREATE INDEX IF NOT EXISTS learnings_trigger_idx ON learnings USING gin(to_tsvector('portuguese', trigger));
 
     -- Índice para buscar por lição
     CREATE INDEX IF NOT EXISTS learnings_lesson_idx ON learnings USING gin(to_tsvector('portuguese', lesson));
+
+    -- Rollup por (categoria, gatilho, dia UTC), mantido por add_learning.
+    -- Contagens por dia (get_summary, recent_failure_count) leem daqui; janelas
+    -- de horas (triggers autônomos) contam as linhas de learnings.
+    CREATE TABLE IF NOT EXISTS learnings_rollup (
+        category VARCHAR(100) NOT NULL,
+        trigger TEXT NOT NULL,
+        day DATE NOT NULL,
+        total_count INTEGER NOT NULL DEFAULT 0,
+        failure_count INTEGER NOT NULL DEFAULT 0,
+        first_seen_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        last_seen_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        last_failure_at TIMESTAMP WITH TIME ZONE,
+        PRIMARY KEY (category, trigger, day)
+    );
+
+    CREATE INDEX IF NOT EXISTS learnings_rollup_day_idx ON learnings_rollup(day);
+
+    -- Backfill único a partir das linhas existentes (rollup recém-criado)
+    INSERT INTO learnings_rollup (
+        category, trigger, day, total_count, failure_count,
+        first_seen_at, last_seen_at, last_failure_at
+    )
+    SELECT
+        category,
+        trigger,
+        (created_at AT TIME ZONE 'UTC')::date,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE success = FALSE),
+        MIN(created_at),
+        MAX(created_at),
+        MAX(created_at) FILTER (WHERE success = FALSE)
+    FROM learnings
+    WHERE NOT EXISTS (SELECT 1 FROM learnings_rollup)
+    GROUP BY 1, 2, 3;
     """
 
     try:
@@ -96,19 +164,75 @@ def init_learnings_table():
         return False
 
 
+def init_trigram_index() -> bool:
+    """
+    Habilita busca fuzzy em `trigger` com pg_trgm (opcional).
+
+    CREATE EXTENSION exige privilegio; sem ele a busca segue so com full-text.
+
+    Returns:
+        True se o indice trigram esta disponivel
+    """
+    if not TRIGRAM_ENABLED:
+        return False
+
+    trigram_sql = """
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS learnings_trigger_trgm_idx ON learnings USING gin(trigger gin_trgm_ops);
+    """
+
+    try:
+        with db_cursor() as cursor:
+            cursor.execute(trigram_sql)
+        return True
+    except Exception as e:
+        logger.info("learnings_trigram_unavailable", error=str(e))
+        return False
+
+
 class LearningsManager:
     """Gerenciador de aprendizados do agente."""
 
-    def __init__(self):
+    def __init__(self, cache_ttl: float = SEARCH_CACHE_TTL_SECONDS):
         """Inicializa o gerenciador."""
         self._initialized = False
+        self._trigram = False
+        self.cache_ttl = cache_ttl
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
 
     def ensure_initialized(self):
         """Garante que a tabela existe."""
         if not self._initialized:
-            init_learnings_table()
+            if init_learnings_table():
+                self._trigram = init_trigram_index()
             self._initialized = True
 
+    def _cache_get(self, key: tuple) -> Optional[List[Dict[str, Any]]]:
+        with self._cache_lock:
+            entry = self._search_cache.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.cache_stats["misses"] += 1
+                return None
+            self._search_cache.move_to_end(key)
+            self.cache_stats["hits"] += 1
+            return list(entry[1])
+
+    def _cache_put(self, key: tuple, results: List[Dict[str, Any]]):
+        if self.cache_ttl <= 0:
+            return
+        with self._cache_lock:
+            self._search_cache[key] = (time.monotonic() + self.cache_ttl, results)
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > SEARCH_CACHE_MAX_ENTRIES:
+                self._search_cache.popitem(last=False)
+
+    def invalidate_search_cache(self):
+        """Descarta resultados de busca cacheados."""
+        with self._cache_lock:
+            self._search_cache.clear()
+
     def add_learning(
         self,
         category: str,
@@ -138,14 +262,30 @@ class LearningsManager:
         RETURNING id
         """
 
+        rollup_sql = f"""
+        INSERT INTO learnings_rollup (
+            category, trigger, day, total_count, failure_count,
+            first_seen_at, last_seen_at, last_failure_at
+        )
+        VALUES (%s, %s, {UTC_TODAY}, 1, %s, NOW(), NOW(), CASE WHEN %s THEN NULL ELSE NOW() END)
+        ON CONFLICT (category, trigger, day) DO UPDATE SET
+            total_count = learnings_rollup.total_count + 1,
+            failure_count = learnings_rollup.failure_count + EXCLUDED.failure_count,
+            last_seen_at = EXCLUDED.last_seen_at,
+            last_failure_at = COALESCE(EXCLUDED.last_failure_at, learnings_rollup.last_failure_at)
+        """
+
         try:
+            # Mesma transacao: a linha e o rollup nunca divergem
             with db_cursor() as cursor:
                 cursor.execute(
                     insert_sql, (category, trigger, lesson, success, json.dumps(metadata or {}))
                 )
                 result = cursor.fetchone()
                 learning_id = result[0] if result else None
+                cursor.execute(rollup_sql, (category, trigger, 0 if success else 1, success))
 
+            self.invalidate_search_cache()
             logger.info(
                 "learning_added", category=category, learning_id=learning_id, success=success
             )
@@ -198,46 +338,62 @@ class LearningsManager:
             logger.error("learnings_fetch_failed", error=str(e))
             return []
 
-    def search_learnings(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def search_learnings(
+        self, query: str, limit: int = 10, match_any: bool = False
+    ) -> List[Dict[str, Any]]:
         """
-        Busca aprendizados por palavra-chave.
+        Busca aprendizados por relevancia (full-text em portugues).
+
+        Usa websearch_to_tsquery + ts_rank sobre os indices GIN de `trigger` e
+        `lesson` (trigger pesa o dobro). Com pg_trgm disponivel, triggers
+        parecidos (ex: nome de skill com erro de digitacao) tambem entram.
+        Resultados ficam em cache por LEARNINGS_SEARCH_CACHE_TTL_SECONDS.
 
         Args:
-            query: Termo de busca
+            query: Termo de busca (vazio = aprendizados mais recentes)
             limit: Número máximo de resultados
+            match_any: Aceita qualquer termo (OR) em vez de todos (AND)
 
         Returns:
-            Lista de aprendizados encontrados
+            Lista de aprendizados encontrados, mais relevantes primeiro
         """
+        query = (query or "").strip()
+        if not query:
+            return self.get_learnings(limit=limit)
+
+        key = (query.lower(), limit, match_any)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         self.ensure_initialized()
 
-        search_sql = """
-        SELECT * FROM learnings
-        WHERE trigger ILIKE %s OR lesson ILIKE %s
-        ORDER BY created_at DESC
-        LIMIT %s
+        tsquery = TSQUERY_ANY if match_any else TSQUERY_ALL
+        fuzzy_match = "OR %(q)s <%% trigger" if self._trigram else ""
+        fuzzy_rank = "+ word_similarity(%(q)s, trigger)" if self._trigram else ""
+        search_sql = f"""
+        SELECT {", ".join(LEARNING_COLUMNS)}
+        FROM learnings, {tsquery} AS q
+        WHERE {TRIGGER_TSV} @@ q OR {LESSON_TSV} @@ q {fuzzy_match}
+        ORDER BY
+            2 * ts_rank({TRIGGER_TSV}, q) + ts_rank({LESSON_TSV}, q) {fuzzy_rank} DESC,
+            created_at DESC
+        LIMIT %(limit)s
         """
 
         try:
             with db_cursor() as cursor:
-                cursor.execute(search_sql, (f"%{query}%", f"%{query}%", limit))
+                cursor.execute(search_sql, {"q": query, "limit": limit})
                 rows = cursor.fetchall()
-
-                columns = [
-                    "id",
-                    "category",
-                    "trigger",
-                    "lesson",
-                    "success",
-                    "metadata",
-                    "created_at",
-                ]
-                return [dict(zip(columns, row)) for row in rows]
+                results = [dict(zip(LEARNING_COLUMNS, row)) for row in rows]
 
         except Exception as e:
             logger.error("learnings_search_failed", error=str(e))
             return []
 
+        self._cache_put(key, results)
+        return list(results)
+
     def get_recent_failures(self, days: int = 7, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Recupera falhas recentes para análise.
@@ -279,6 +435,43 @@ class LearningsManager:
             logger.error("failures_fetch_failed", error=str(e))
             return []
 
+    def recent_failure_count(
+        self,
+        trigger: str,
+        category: str = "execution_error",
+        days: int = FAILURE_WINDOW_DAYS,
+    ) -> int:
+        """
+        Falhas recentes de um gatilho (ex: nome do skill), pelo rollup.
+
+        Leitura por chave primaria de no maximo `days` linhas, em vez de
+        recontar learnings.
+
+        Args:
+            trigger: Gatilho exato (learning_hook usa o nome do skill)
+            category: Categoria do aprendizado
+            days: Dias do rollup considerados (hoje incluso, UTC)
+
+        Returns:
+            Número de falhas na janela (0 se o banco estiver indisponível)
+        """
+        self.ensure_initialized()
+
+        query = f"""
+        SELECT COALESCE(SUM(failure_count), 0) FROM learnings_rollup
+        WHERE category = %s AND trigger = %s AND day > {UTC_TODAY} - %s
+        """
+
+        try:
+            with db_cursor() as cursor:
+                cursor.execute(query, (category, trigger, days))
+                row = cursor.fetchone()
+                return int(row[0]) if row else 0
+
+        except Exception as e:
+            logger.error("learnings_failure_count_failed", error=str(e))
+            return 0
+
     def get_lessons_for_action(self, action_type: str, context: str = "") -> List[str]:
         """
         Recupera lições relevantes antes de executar uma ação.
@@ -358,12 +551,12 @@ class LearningsManager:
         query = """
         SELECT
             category,
-            COUNT(*) as total,
-            SUM(CASE WHEN success = TRUE THEN 1 ELSE 0 END) as successes,
-            SUM(CASE WHEN success = FALSE THEN 1 ELSE 0 END) as failures,
-            MIN(created_at) as oldest,
-            MAX(created_at) as newest
-        FROM learnings
+            SUM(total_count) as total,
+            SUM(total_count - failure_count) as successes,
+            SUM(failure_count) as failures,
+            MIN(first_seen_at) as oldest,
+            MAX(last_seen_at) as newest
+        FROM learnings_rollup
         GROUP BY category
         ORDER BY total DESC
         """
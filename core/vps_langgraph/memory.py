@@ -290,17 +290,6 @@ class AgentMemory:
         except ValueError:
             return False
 
-    @staticmethod
-    def _was_redacted(original: Any, redacted: Any) -> bool:
-        try:
-            return json.dumps(original, sort_keys=True, default=str) != json.dumps(
-                redacted,
-                sort_keys=True,
-                default=str,
-            )
-        except Exception:
-            return original != redacted
-
     def _record_audit(
         self,
         action: str,
@@ -523,7 +512,7 @@ class AgentMemory:
         if isinstance(resolved_scope, str):
             resolved_scope = MemoryScope(resolved_scope)
 
-        redacted_value = self.policy.redact_value(value)
+        redacted_value, was_redacted = self.policy.redact(value)
         effective_ttl = self.policy.ttl_for(typed) if ttl_seconds is None else ttl_seconds
         expires_at = (
             datetime.now(timezone.utc) + timedelta(seconds=effective_ttl)
@@ -586,7 +575,7 @@ class AgentMemory:
             key=key,
             scope=resolved_scope,
             project_id=project_id,
-            redacted=self._was_redacted(value, redacted_value),
+            redacted=was_redacted,
             outcome=outcome,
             details={"ttl_seconds": effective_ttl, "source": source},
         )
@@ -938,7 +927,7 @@ class AgentMemory:
 
     def save_fact(self, user_id: str, key: str, value: dict, confidence: float = 1.0):
         """Save or update one user fact (legacy API)."""
-        redacted_value = self.policy.redact_value(value)
+        redacted_value, was_redacted = self.policy.redact(value)
         outcome = "success"
         try:
             conn = self._get_conn()
@@ -970,7 +959,7 @@ class AgentMemory:
             key=key,
             scope=MemoryScope.USER,
             project_id=None,
-            redacted=self._was_redacted(value, redacted_value),
+            redacted=was_redacted,
             outcome=outcome,
             details={"legacy_memory_type": "fact"},
         )
@@ -1014,7 +1003,7 @@ class AgentMemory:
 
     def save_conversation(self, user_id: str, role: str, content: str):
         """Persist one conversation message (legacy API)."""
-        redacted_content = self.policy.redact_value(content)
+        redacted_content, was_redacted = self.policy.redact(content)
         timestamp = datetime.now(timezone.utc).isoformat()
         outcome = "success"
 
@@ -1077,7 +1066,7 @@ class AgentMemory:
             key=f"turn:{role}",
             scope=MemoryScope.USER,
             project_id=None,
-            redacted=self._was_redacted(content, redacted_content),
+            redacted=was_redacted,
             outcome=outcome,
         )
 
@@ -1109,7 +1098,7 @@ class AgentMemory:
 
     def set_system_state(self, key: str, value: dict):
         """Update one global system state entry."""
-        redacted_value = self.policy.redact_value(value)
+        redacted_value, was_redacted = self.policy.redact(value)
         outcome = "success"
         try:
             conn = self._get_conn()
@@ -1140,7 +1129,7 @@ class AgentMemory:
             key=key,
             scope=MemoryScope.GLOBAL,
             project_id=None,
-            redacted=self._was_redacted(value, redacted_value),
+            redacted=was_redacted,
             outcome=outcome,
         )
 
@@ -45,7 +45,7 @@ def node_security_check(state: AgentState) -> AgentState:
     Consulta allowlist para bloquear comandos perigosos.
     """
 
-    from ..security.allowlist import ResourceType, create_default_allowlist
+    from ..security.allowlist import ResourceType, get_allowlist
 
     plan = state.get("plan", [])
     step = state.get("current_step", 0)
@@ -73,8 +73,8 @@ def node_security_check(state: AgentState) -> AgentState:
     debug_info["action_type"] = action_type
     debug_info["action"] = action
 
-    # Carregar allowlist padrÃ£o
-    allowlist = create_default_allowlist()
+    # Allowlist compartilhada (compilada uma vez por versao das regras)
+    allowlist = get_allowlist()
 
     # Verificar comando se for do tipo command ou execute
     if action_type in ["command", "execute"]:
@@ -161,7 +161,9 @@ async def _execute_with_hooks(registry, skill_name, skill_args, user_id):
 
     start = time.time()
     try:
-        result = await registry.execute_skill(skill_name, skill_args)
+        result = await registry.execute_skill(
+            skill_name, skill_args, user_id=user_id, metadata=ctx.metadata
+        )
         ctx.duration_ms = (time.time() - start) * 1000
         ctx.result = str(result)
     except Exception as e:
@@ -0,0 +1,119 @@
+"""
+Prompt Cache — cache versionado do system prompt do ReAct.
+
+O prompt base (identidade + capacidades + alma + lista de skills + regras) só
+muda quando o registry de skills, o registry de capacidades ou os artifacts
+da alma mudam. Guardamos o texto pronto com a versão combinada dessas fontes
+e só reconstruímos quando ela muda (ou após um TTL, para pegar artifacts da
+alma alterados por outro processo direto no banco).
+
+Partes dinâmicas (learnings, contexto temporal) são anexadas DEPOIS do prompt
+base, então o prefixo enviado ao provider é byte-a-byte estável entre turnos e
+o prompt caching do lado do provider consegue reaproveitá-lo.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+PROMPT_CACHE_TTL_SECONDS = float(os.getenv("REACT_PROMPT_CACHE_TTL_SECONDS", "300"))
+
+
+def _capabilities_version() -> Any:
+    try:
+        from ..capabilities import capabilities_registry
+
+        return getattr(capabilities_registry, "version", None)
+    except Exception:
+        return None
+
+
+def _soul_version() -> Any:
+    try:
+        from core.identity import get_soul_manager
+
+        return getattr(get_soul_manager(), "revision", None)
+    except Exception:
+        return None
+
+
+def prompt_version(registry: Any) -> Optional[Tuple[Any, ...]]:
+    """Versão combinada das fontes do prompt; None se o registry não é versionado."""
+    registry_version = getattr(registry, "version", None)
+    if registry_version is None:
+        return None
+    return (id(registry), registry_version, _capabilities_version(), _soul_version())
+
+
+class SystemPromptCache:
+    """Guarda o último prompt base por versão, com TTL de segurança."""
+
+    def __init__(self, ttl_seconds: float = PROMPT_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple[Any, ...]] = None
+        self._built_at = 0.0
+        self._prompt: Optional[str] = None
+        self._prefix_hash: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, registry: Any, builder: Callable[[], str]) -> str:
+        version = prompt_version(registry)
+        if version is None:
+            return builder()
+
+        with self._lock:
+            fresh = (time.monotonic() - self._built_at) < self.ttl_seconds
+            if self._prompt is not None and self._version == version and fresh:
+                self.hits += 1
+                return self._prompt
+
+        prompt = builder()
+        prefix_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        with self._lock:
+            changed = prefix_hash != self._prefix_hash
+            self._version = version
+            self._built_at = time.monotonic()
+            self._prompt = prompt
+            self._prefix_hash = prefix_hash
+            self.misses += 1
+        logger.info(
+            "react_system_prompt_built",
+            chars=len(prompt),
+            prefix_hash=prefix_hash,
+            changed=changed,
+        )
+        return prompt
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+            self._prompt = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "prefix_hash": self._prefix_hash,
+                "version": self._version[1:] if self._version else None,
+            }
+
+
+_prompt_cache = SystemPromptCache()
+
+
+def get_prompt_cache() -> SystemPromptCache:
+    return _prompt_cache
+
+
+def invalidate_prompt_cache() -> None:
+    """Força reconstrução do prompt base no próximo turno."""
+    _prompt_cache.invalidate()
@@ -10,6 +10,7 @@ Substitui: node_classify_intent + node_plan + interpretação do shell_exec.
 Este é o núcleo da mudança de "botões pré-codificados" para "inteligência real".
 """
 
+import asyncio
 import json
 
 import structlog
@@ -26,7 +27,9 @@ from ..integrations import (
 from ..orchestration import RuntimeExecutionRequest, RuntimeProtocol, get_runtime_router
 from ..progress import emit_progress
 from ..skills.registry import get_skill_registry
+from ..skills.tool_selector import get_tool_selector, signals_missing_tool
 from .external_workflows import detect_external_workflow, run_external_workflow
+from .prompt_cache import get_prompt_cache
 from .state import AgentState
 
 logger = structlog.get_logger()
@@ -137,12 +140,15 @@ async def node_react(state: AgentState) -> AgentState:
     conversation_history = state.get("conversation_history", [])
 
     registry = get_skill_registry()
-    tools = registry.list_tool_schemas()
+    all_tools = registry.list_tool_schemas()
+    # Pré-seleção: core + top-k relevantes; o conjunto completo é o fallback.
+    tools = get_tool_selector().select(registry, user_message, all_tools)
 
     logger.info(
         "react_start",
         message=user_message[:80],
         tools_count=len(tools),
+        tools_total=len(all_tools),
     )
 
     external_workflow = detect_external_workflow(user_message)
@@ -354,13 +360,16 @@ async def node_react(state: AgentState) -> AgentState:
                 )
                 # Falhou; continua para o loop LLM normal.
     provider = get_llm_provider()
-    system_prompt = build_react_system_prompt()
+    # Prefixo estável (cacheado por versão); partes dinâmicas vêm depois.
+    system_prompt = get_prompt_cache().get(registry, build_react_system_prompt)
 
     # T4: Consultar learnings relevantes antes de responder
     try:
         from .learnings import learnings_manager
 
-        recent_lessons = learnings_manager.search_learnings(user_message[:80], limit=3)
+        recent_lessons = await asyncio.to_thread(
+            learnings_manager.search_learnings, user_message[:80], limit=3, match_any=True
+        )
         if recent_lessons:
             lessons_text = "\n".join([f"- {lesson['lesson']}" for lesson in recent_lessons])
             system_prompt += f"\n\n## Licoes Aprendidas (evite repetir estes erros)\n{lessons_text}"
@@ -438,6 +447,13 @@ async def node_react(state: AgentState) -> AgentState:
                 "response": "Desculpe, tive um problema ao processar sua mensagem. Tente novamente.",
             }
 
+        # Modelo sinalizou falta de tool → repergunta uma vez com o conjunto completo
+        if not response.tool_calls and len(tools) < len(all_tools):
+            if signals_missing_tool(response.content):
+                logger.info("react_tool_fallback_full_set", reason="missing_tool", step=step)
+                tools = all_tools
+                continue
+
         # Se LLM respondeu diretamente (sem tool call) → pronto
         if not response.tool_calls:
             logger.info("react_direct_response", step=step)
@@ -457,6 +473,13 @@ async def node_react(state: AgentState) -> AgentState:
 
         logger.info("react_tool_call", tool=tool_name, args=str(tool_args)[:200], step=step)
 
+        # Tool fora do conjunto pré-selecionado (ex: listada no system prompt)
+        if len(tools) < len(all_tools) and tool_name not in {
+            tool["function"]["name"] for tool in tools
+        }:
+            logger.info("react_tool_fallback_full_set", reason="unexposed_tool", tool=tool_name)
+            tools = all_tools
+
         # Verificar nível de segurança
         security_level = registry.get_security_level(tool_name, tool_args)
 
@@ -481,7 +504,9 @@ async def node_react(state: AgentState) -> AgentState:
 
         # SAFE → executar inline e alimentar resultado ao LLM
         try:
-            result = await registry.execute_skill(tool_name, tool_args)
+            result = await registry.execute_skill(
+                tool_name, tool_args, user_id=state.get("user_id")
+            )
             last_result = str(result)
         except Exception as e:
             last_result = f"Erro ao executar {tool_name}: {e}"
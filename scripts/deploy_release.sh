@@ -74,6 +74,7 @@ docker exec -i "$POSTGRES_CONTAINER" psql -U "$POSTGRES_USER" -d "$POSTGRES_DB"
 docker exec -i "$POSTGRES_CONTAINER" psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" < configs/migration-memory-soul.sql
 docker exec -i "$POSTGRES_CONTAINER" psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" < configs/migration-skills-catalog.sql
 docker exec -i "$POSTGRES_CONTAINER" psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" < configs/migration-voice-context.sql
+docker exec -i "$POSTGRES_CONTAINER" psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" < configs/migration-skill-metrics.sql
 
 mkdir -p /opt/vps-agent/data/qdrant-storage
 docker network inspect vps-core-network >/dev/null 2>&1 || docker network create vps-core-network
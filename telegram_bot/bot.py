@@ -8,8 +8,7 @@ import logging
 import os
 import time
 
-import psycopg2
-import redis
+import redis.asyncio as aioredis
 import structlog
 from telegram import Update
 from telegram.constants import ChatAction
@@ -23,9 +22,14 @@ from telegram.ext import (
 )
 
 # VPS-Agent Core (nosso mÃƒÂ³dulo)
+from core.database import close_db_pool, get_db_pool, init_db_pool
 from core.env import load_project_env
+from core.hooks.runner import close_hook_runner
 from core.integrations import warmup_consumer_sync
+from core.skills.sandbox import close_sandbox_pool
+from core.skills.watcher import start_skill_watcher, stop_skill_watcher
 from core.vps_agent.agent import process_message_async
+from telegram_bot.dispatcher import MessageDispatcher, QueuedTurn, default_max_concurrency
 
 # Telegram Log Handler (F0-06)
 
@@ -48,6 +52,12 @@ PROGRESS_MESSAGE_THRESHOLD_SECONDS = float(
     os.getenv("TELEGRAM_PROGRESS_MESSAGE_THRESHOLD_SECONDS", "2.0")
 )
 TYPING_INTERVAL_SECONDS = float(os.getenv("TELEGRAM_TYPING_INTERVAL_SECONDS", "4.0"))
+BOT_DB_POOL_MAX_SIZE = int(os.getenv("TELEGRAM_DB_POOL_MAX_SIZE", "4"))
+BOT_REDIS_MAX_CONNECTIONS = int(os.getenv("TELEGRAM_REDIS_MAX_CONNECTIONS", "10"))
+BOT_MAX_CONCURRENT_TURNS = int(
+    os.getenv("TELEGRAM_MAX_CONCURRENT_TURNS", str(default_max_concurrency()))
+)
+BOT_MAX_PENDING_PER_USER = int(os.getenv("TELEGRAM_MAX_PENDING_PER_USER", "10"))
 
 
 class TelegramProgressSession:
@@ -159,24 +169,63 @@ class TelegramProgressSession:
 
 
 # ConexÃƒÂµes
-def get_db_conn():
-    """Retorna conexÃƒÂ£o com PostgreSQL."""
-    return psycopg2.connect(
-        host=os.getenv("POSTGRES_HOST", "127.0.0.1"),
-        port=int(os.getenv("POSTGRES_PORT", 5432)),
-        dbname=os.getenv("POSTGRES_DB", "vps_agent"),
-        user=os.getenv("POSTGRES_USER"),
-        password=os.getenv("POSTGRES_PASSWORD"),
-    )
+_redis: aioredis.Redis | None = None
+
+
+async def init_connection_pools() -> None:
+    """Cria os pools async (PostgreSQL + Redis) da aplicacao. Falhas nao impedem o boot."""
+    global _redis
+    if _redis is None:
+        _redis = aioredis.Redis(
+            host=os.getenv("REDIS_HOST", "127.0.0.1"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            decode_responses=True,
+            max_connections=BOT_REDIS_MAX_CONNECTIONS,
+        )
+    try:
+        await init_db_pool(min_size=1, max_size=BOT_DB_POOL_MAX_SIZE)
+    except Exception as e:
+        # DatabasePool.acquire() reinicializa sob demanda no primeiro comando.
+        logger.warning("bot_db_pool_init_deferred", error=str(e))
 
 
-def get_redis():
-    """Retorna conexÃƒÂ£o com Redis."""
-    return redis.Redis(
-        host=os.getenv("REDIS_HOST", "127.0.0.1"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        decode_responses=True,
-    )
+async def close_connection_pools() -> None:
+    """Fecha os pools criados em init_connection_pools."""
+    global _redis
+    await close_db_pool()
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Retorna o cliente Redis async compartilhado da aplicacao."""
+    if _redis is None:
+        raise RuntimeError("Redis pool not initialized. Call init_connection_pools() first.")
+    return _redis
+
+
+async def _post_init(application: Application) -> None:
+    await init_connection_pools()
+    start_skill_watcher()
+
+
+async def _post_shutdown(application: Application) -> None:
+    await stop_skill_watcher()
+    if _dispatcher is not None:
+        logger.info("dispatcher_shutdown", **_dispatcher.stats())
+        await _dispatcher.close()
+    await close_hook_runner()
+    await close_sandbox_pool()
+    await close_connection_pools()
+
+
+def _affected_rows(status: str) -> int:
+    """Extrai o numero de linhas do status do asyncpg (ex: 'UPDATE 1')."""
+    try:
+        return int(str(status).rsplit(" ", 1)[-1])
+    except (TypeError, ValueError):
+        return 0
 
 
 def _parse_db_json(value):
@@ -223,6 +272,21 @@ async def _run_agent_request(
         await progress.close()
 
 
+_dispatcher: MessageDispatcher | None = None
+
+
+def get_dispatcher() -> MessageDispatcher:
+    """Dispatcher global: fila por usuario na frente do LangGraph."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = MessageDispatcher(
+            _process_turn,
+            max_concurrency=BOT_MAX_CONCURRENT_TURNS,
+            max_pending_per_user=BOT_MAX_PENDING_PER_USER,
+        )
+    return _dispatcher
+
+
 # Handlers
 @authorized_only
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -250,13 +314,42 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     logger.info("mensagem_recebida", user_id=user_id, message=message[:100])
 
+    # Enfileira na fila do usuario; o turno roda em ordem no dispatcher.
+    if not get_dispatcher().submit(user_id, message, (update, context)):
+        await update.message.reply_text(
+            "Ainda estou processando suas mensagens anteriores. Aguarde um pouco."
+        )
+
+
+async def _submit_command(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    *,
+    user_id: str,
+    command: str,
+) -> None:
+    """Comandos roteados pelo grafo entram na mesma fila FIFO do usuario."""
+    if not get_dispatcher().submit(user_id, command, (update, context), coalesce=False):
+        await update.message.reply_text(
+            "Ainda estou processando suas mensagens anteriores. Aguarde um pouco."
+        )
+
+
+async def _process_turn(turn: QueuedTurn):
+    """Executa um turno do dispatcher (mensagens agrupadas) e responde a ultima."""
+    update, context = turn.payload
+    user_id = turn.user_id
+
+    if len(turn.messages) > 1:
+        logger.info("mensagens_agrupadas", user_id=user_id, count=len(turn.messages))
+
     try:
         # Processar atravÃƒÂ©s do LangGraph
         response = await _run_agent_request(
             update,
             context,
             user_id=user_id,
-            message=message,
+            message=turn.text,
         )
 
         # Garantir que temos uma resposta vÃƒÂ¡lida
@@ -293,9 +386,8 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     logger.info("comando_status", user_id=user_id)
 
-    # Roteia pelo grafo com /status para ativar intent de comando
-    response = await _run_agent_request(update, context, user_id=user_id, message="/status")
-    await update.message.reply_text(response)
+    # Roteia pelo grafo com /status para ativar intent de comando (na fila do usuario)
+    await _submit_command(update, context, user_id=user_id, command="/status")
 
 
 @authorized_only
@@ -304,9 +396,8 @@ async def cmd_ram(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     logger.info("comando_ram", user_id=user_id)
 
-    # Roteia pelo grafo com /ram para ativar intent de comando
-    response = await _run_agent_request(update, context, user_id=user_id, message="/ram")
-    await update.message.reply_text(response)
+    # Roteia pelo grafo com /ram para ativar intent de comando (na fila do usuario)
+    await _submit_command(update, context, user_id=user_id, command="/ram")
 
 
 @authorized_only
@@ -315,9 +406,8 @@ async def cmd_containers(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     logger.info("comando_containers", user_id=user_id)
 
-    # Roteia pelo grafo com /containers para ativar intent de comando
-    response = await _run_agent_request(update, context, user_id=user_id, message="/containers")
-    await update.message.reply_text(response)
+    # Roteia pelo grafo com /containers para ativar intent de comando (na fila do usuario)
+    await _submit_command(update, context, user_id=user_id, command="/containers")
 
 
 @authorized_only
@@ -326,9 +416,8 @@ async def cmd_health(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
     logger.info("comando_health", user_id=user_id)
 
-    # Roteia pelo grafo com /health para ativar intent de comando
-    response = await _run_agent_request(update, context, user_id=user_id, message="/health")
-    await update.message.reply_text(response)
+    # Roteia pelo grafo com /health para ativar intent de comando (na fila do usuario)
+    await _submit_command(update, context, user_id=user_id, command="/health")
 
 
 @authorized_only
@@ -365,17 +454,13 @@ Este bot controla o VPS-Agent, um agente autonomo com ReAct + function calling.
 async def cmd_proposals(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler para /proposals - lista proposals pendentes."""
     try:
-        conn = get_db_conn()
-        cur = conn.cursor()
-        cur.execute(
+        proposals = await get_db_pool().fetch(
             """SELECT id, trigger_name, suggested_action, condition_data, created_at
             FROM agent_proposals
             WHERE status = 'pending' AND requires_approval = TRUE
             ORDER BY priority ASC, created_at ASC
             LIMIT 10"""
         )
-        proposals = cur.fetchall()
-        conn.close()
 
         if not proposals:
             await update.message.reply_text("Nenhuma proposal pendente de aprovacao.")
@@ -416,17 +501,13 @@ async def cmd_proposal(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     try:
         proposal_id = int(context.args[0])
-        conn = get_db_conn()
-        cur = conn.cursor()
-        cur.execute(
+        row = await get_db_pool().fetchrow(
             """SELECT id, trigger_name, status, requires_approval, suggested_action, condition_data, created_at
             FROM agent_proposals
-            WHERE id = %s
+            WHERE id = $1
             LIMIT 1""",
-            (proposal_id,),
+            proposal_id,
         )
-        row = cur.fetchone()
-        conn.close()
 
         if not row:
             await update.message.reply_text(f"Proposal #{proposal_id} nao encontrada.")
@@ -464,23 +545,20 @@ async def cmd_approve(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     try:
         proposal_id = int(context.args[0])
-        conn = get_db_conn()
-        cur = conn.cursor()
-        cur.execute(
+        status = await get_db_pool().execute(
             """UPDATE agent_proposals
             SET status = 'approved', approval_note = 'Aprovado via Telegram'
-            WHERE id = %s AND status = 'pending'""",
-            (proposal_id,),
+            WHERE id = $1 AND status = 'pending'""",
+            proposal_id,
         )
-        affected = cur.rowcount
-        conn.commit()
-        conn.close()
+        affected = _affected_rows(status)
 
         if affected:
             try:
                 from core.voice_context import VoiceContextService
 
-                VoiceContextService().sync_proposal_state(
+                await asyncio.to_thread(
+                    VoiceContextService().sync_proposal_state,
                     proposal_id=proposal_id,
                     decision="approved",
                     actor=f"tg:{update.effective_user.id}",
@@ -511,23 +589,21 @@ async def cmd_reject(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         proposal_id = int(context.args[0])
         note = " ".join(context.args[1:]) if len(context.args) > 1 else "Rejeitado via Telegram"
-        conn = get_db_conn()
-        cur = conn.cursor()
-        cur.execute(
+        status = await get_db_pool().execute(
             """UPDATE agent_proposals
-            SET status = 'rejected', approval_note = %s
-            WHERE id = %s AND status = 'pending'""",
-            (note, proposal_id),
+            SET status = 'rejected', approval_note = $1
+            WHERE id = $2 AND status = 'pending'""",
+            note,
+            proposal_id,
         )
-        affected = cur.rowcount
-        conn.commit()
-        conn.close()
+        affected = _affected_rows(status)
 
         if affected:
             try:
                 from core.voice_context import VoiceContextService
 
-                VoiceContextService().sync_proposal_state(
+                await asyncio.to_thread(
+                    VoiceContextService().sync_proposal_state,
                     proposal_id=proposal_id,
                     decision="rejected",
                     actor=f"tg:{update.effective_user.id}",
@@ -868,11 +944,11 @@ async def cmd_updatestatus(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         from core.updater.deploy_safety import collect_deploy_safety_snapshot
 
-        redis_conn = get_redis()
-        last_check_raw = redis_conn.get("updater:last_check")
-        last_summary_raw = redis_conn.get("updater:last_summary")
+        last_check_raw, last_summary_raw = await get_redis().mget(
+            "updater:last_check", "updater:last_summary"
+        )
         summary = _parse_db_json(last_summary_raw)
-        deploy_safety = collect_deploy_safety_snapshot()
+        deploy_safety = await asyncio.to_thread(collect_deploy_safety_snapshot)
 
         last_check_text = "never"
         if last_check_raw:
@@ -882,26 +958,23 @@ async def cmd_updatestatus(update: Update, context: ContextTypes.DEFAULT_TYPE):
             except Exception:
                 last_check_text = str(last_check_raw)
 
-        conn = get_db_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT run_mode, status, stats, created_at
-            FROM skills_catalog_sync_runs
-            ORDER BY id DESC
-            LIMIT 1
-            """
-        )
-        latest_sync = cur.fetchone()
-        cur.execute(
-            """
-            SELECT COUNT(*) FROM agent_proposals
-            WHERE trigger_name LIKE '%_update_available'
-            AND status IN ('pending', 'approved', 'executing')
-            """
-        )
-        open_proposals = cur.fetchone()[0]
-        conn.close()
+        db_pool = get_db_pool()
+        async with db_pool.acquire() as conn:
+            latest_sync = await conn.fetchrow(
+                """
+                SELECT run_mode, status, stats, created_at
+                FROM skills_catalog_sync_runs
+                ORDER BY id DESC
+                LIMIT 1
+                """
+            )
+            open_proposals = await conn.fetchval(
+                """
+                SELECT COUNT(*) FROM agent_proposals
+                WHERE trigger_name LIKE '%_update_available'
+                AND status IN ('pending', 'approved', 'executing')
+                """
+            )
 
         lines = [
             "Updater status",
@@ -1058,6 +1131,8 @@ def main():
         .write_timeout(30.0)  # Timeout de escrita
         .pool_timeout(30.0)  # Timeout do pool de conexÃƒÂµes
         .concurrent_updates(10)  # AtualizaÃƒÂ§ÃƒÂµes simultÃƒÂ¢neas
+        .post_init(_post_init)
+        .post_shutdown(_post_shutdown)
         .connection_pool_size(20)  # Tamanho do pool de conexÃƒÂµes
         .build()
     )
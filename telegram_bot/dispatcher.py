@@ -0,0 +1,213 @@
+"""
+Dispatcher de mensagens — fila FIFO por usuario com paralelismo entre usuarios.
+
+Garante que mensagens do mesmo usuario (mesmo thread_id/checkpoint no
+LangGraph) sejam processadas em ordem estrita, uma de cada vez. Mensagens que
+chegam enquanto o turno anterior ainda roda sao agrupadas num unico turno.
+Usuarios sao atendidos em round-robin sob um orcamento global de concorrencia,
+entao um usuario pesado nao ocupa todos os slots.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+def default_max_concurrency() -> int:
+    """Orcamento padrao: 1 turno por core, limitado a 4 (VPS de 2 GB)."""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+@dataclass
+class QueuedTurn:
+    """Um turno do agente: uma ou mais mensagens consecutivas do mesmo usuario."""
+
+    user_id: str
+    messages: List[str] = field(default_factory=list)
+    payloads: List[Any] = field(default_factory=list)
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # Comandos (/status) rodam sozinhos: nao absorvem nem sao absorvidos
+    coalesce: bool = True
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.messages)
+
+    @property
+    def payload(self) -> Any:
+        """Payload da mensagem mais recente (usado para responder)."""
+        return self.payloads[-1] if self.payloads else None
+
+
+class MessageDispatcher:
+    """Fila por usuario + agendamento round-robin com concorrencia global limitada."""
+
+    def __init__(
+        self,
+        handler: Callable[[QueuedTurn], Awaitable[None]],
+        *,
+        max_concurrency: Optional[int] = None,
+        max_pending_per_user: int = 10,
+        max_messages_per_turn: int = 5,
+    ):
+        self._handler = handler
+        self.max_concurrency = max_concurrency or default_max_concurrency()
+        self.max_pending_per_user = max_pending_per_user
+        self.max_messages_per_turn = max_messages_per_turn
+
+        self._queues: Dict[str, Deque[QueuedTurn]] = {}
+        self._active: Set[str] = set()
+        self._scheduled: Set[str] = set()
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        self._processed_turns = 0
+        self._coalesced_messages = 0
+        self._rejected_messages = 0
+        self._max_depth_seen = 0
+
+    def submit(
+        self, user_id: str, message: str, payload: Any = None, *, coalesce: bool = True
+    ) -> bool:
+        """
+        Enfileira uma mensagem do usuario.
+
+        Com coalesce=False a mensagem vira um turno proprio (comandos do bot),
+        ainda em ordem na fila do usuario.
+
+        Returns:
+            False se a fila do usuario estiver cheia (mensagem descartada)
+        """
+        self._ensure_workers()
+        queue = self._queues.setdefault(user_id, deque())
+
+        if self.pending_messages(user_id) >= self.max_pending_per_user:
+            self._rejected_messages += 1
+            logger.warning("dispatcher_queue_full", user_id=user_id, depth=len(queue))
+            return False
+
+        # Coalescing: o turno na cauda ainda nao comecou (o anterior esta em voo).
+        tail = queue[-1] if queue else None
+        if (
+            coalesce
+            and tail is not None
+            and tail.coalesce
+            and len(tail.messages) < self.max_messages_per_turn
+        ):
+            tail.messages.append(message)
+            tail.payloads.append(payload)
+            self._coalesced_messages += 1
+        else:
+            queue.append(
+                QueuedTurn(
+                    user_id=user_id, messages=[message], payloads=[payload], coalesce=coalesce
+                )
+            )
+
+        self._max_depth_seen = max(self._max_depth_seen, len(queue))
+        self._schedule(user_id)
+        logger.info(
+            "dispatcher_enqueued",
+            user_id=user_id,
+            depth=len(queue),
+            active=len(self._active),
+            ready=self._ready.qsize(),
+        )
+        return True
+
+    def pending_messages(self, user_id: str) -> int:
+        return sum(len(turn.messages) for turn in self._queues.get(user_id, ()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Metricas de profundidade de fila e throughput."""
+        depths = {uid: len(q) for uid, q in self._queues.items() if q}
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active_turns": len(self._active),
+            "ready_users": self._ready.qsize() if self._ready else 0,
+            "pending_turns": sum(depths.values()),
+            "pending_messages": sum(self.pending_messages(uid) for uid in depths),
+            "queue_depth_by_user": depths,
+            "max_depth_seen": self._max_depth_seen,
+            "processed_turns": self._processed_turns,
+            "coalesced_messages": self._coalesced_messages,
+            "rejected_messages": self._rejected_messages,
+        }
+
+    async def join(self):
+        """Aguarda ate todas as filas esvaziarem (uso em testes/shutdown)."""
+        if self._ready is not None:
+            await self._ready.join()
+
+    async def close(self):
+        """Cancela os workers; turnos pendentes sao descartados."""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        self._ready = None
+        self._scheduled.clear()
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        self._ready = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"dispatcher-worker-{index}")
+            for index in range(self.max_concurrency)
+        ]
+        logger.info("dispatcher_started", workers=self.max_concurrency)
+
+    def _schedule(self, user_id: str):
+        # Usuario entra na rodada so uma vez e nunca enquanto tem turno em voo.
+        if user_id in self._active or user_id in self._scheduled:
+            return
+        if not self._queues.get(user_id):
+            return
+        self._scheduled.add(user_id)
+        self._ready.put_nowait(user_id)
+
+    async def _worker(self, index: int):
+        while True:
+            user_id = await self._ready.get()
+            self._scheduled.discard(user_id)
+            queue = self._queues.get(user_id)
+            if not queue:
+                self._ready.task_done()
+                continue
+
+            turn = queue.popleft()
+            self._active.add(user_id)
+            started = time.monotonic()
+            try:
+                await self._handler(turn)
+            except Exception as e:
+                logger.error("dispatcher_turn_error", user_id=user_id, error=str(e))
+            finally:
+                self._active.discard(user_id)
+                self._processed_turns += 1
+                logger.info(
+                    "dispatcher_turn_done",
+                    user_id=user_id,
+                    messages=len(turn.messages),
+                    wait_ms=round((started - turn.enqueued_at) * 1000, 1),
+                    duration_ms=round((time.monotonic() - started) * 1000, 1),
+                    remaining=len(queue),
+                )
+                if not queue:
+                    self._queues.pop(user_id, None)
+                else:
+                    # Volta para o fim da rodada: round-robin entre usuarios.
+                    self._schedule(user_id)
+                self._ready.task_done()
@@ -2,14 +2,19 @@
 Testes para o Allowlist de Segurança.
 """
 
+import os
+
 import pytest
 
+from core.security import allowlist as allowlist_module
 from core.security.allowlist import (
     AllowlistRule,
     PermissionLevel,
     ResourceType,
     SecurityAllowlist,
     create_default_allowlist,
+    get_allowlist,
+    save_allowlist_to_file,
 )
 
 
@@ -285,5 +290,106 @@ class TestDefaultAllowlist:
         assert result.permission == PermissionLevel.REQUIRE_APPROVAL
 
 
+class TestCompiledAllowlist:
+    """Testes para o índice compilado, cache de veredictos e hot reload."""
+
+    COMMANDS = [
+        "ram",
+        "docker ps",
+        "docker ps -a",
+        "docker rm web",
+        "rm -rf",
+        "rm -rf /",
+        "ls -la /tmp",
+        "python3 --version",
+        "systemctl status nginx",
+        "systemctl restart nginx",
+        "curl http://x",
+        "",
+    ]
+
+    @staticmethod
+    def _naive_check(allowlist, resource_type, value):
+        """Avaliação regra a regra (comportamento anterior)."""
+        matching = [
+            r for r in allowlist.rules if r.resource_type == resource_type and r.matches(value)
+        ]
+        for permission in (
+            PermissionLevel.DENY,
+            PermissionLevel.REQUIRE_APPROVAL,
+            PermissionLevel.ALLOW,
+        ):
+            tier = [r for r in matching if r.permission == permission]
+            if tier:
+                return permission, tier[0].name
+        return PermissionLevel.DENY, None
+
+    def test_compiled_check_matches_rule_by_rule_evaluation(self):
+        """Testa que a alternância compilada dá o mesmo veredicto e regra."""
+        allowlist = create_default_allowlist()
+        allowlist.add_rule(
+            AllowlistRule(
+                name="backreference",
+                resource_type=ResourceType.COMMAND,
+                pattern=r"^(\w+) \1$",
+                permission=PermissionLevel.DENY,
+            )
+        )
+
+        for command in self.COMMANDS + ["echo echo"]:
+            result = allowlist.check(ResourceType.COMMAND, command)
+            expected = self._naive_check(allowlist, ResourceType.COMMAND, command)
+            assert (result.permission, result.rule.name if result.rule else None) == expected
+
+    def test_verdict_cache_is_invalidated_by_rule_changes(self):
+        """Testa o LRU de veredictos e a invalidação ao mudar regras."""
+        allowlist = create_default_allowlist()
+
+        assert allowlist.check(ResourceType.COMMAND, "curl http://x").allowed is False
+        assert allowlist.check(ResourceType.COMMAND, "curl http://x").allowed is False
+        assert allowlist.cache_stats == {"hits": 1, "misses": 1}
+
+        allowlist.add_rule(
+            AllowlistRule(
+                name="curl",
+                resource_type=ResourceType.COMMAND,
+                pattern=r"^curl ",
+                permission=PermissionLevel.ALLOW,
+            )
+        )
+        assert allowlist.check(ResourceType.COMMAND, "curl http://x").allowed is True
+
+    def test_get_allowlist_reloads_file_when_it_changes(self, tmp_path, monkeypatch):
+        """Testa o singleton com hot reload de SECURITY_ALLOWLIST_FILE."""
+        path = tmp_path / "allowlist.json"
+        source = create_default_allowlist()
+        save_allowlist_to_file(source, str(path))
+        monkeypatch.setenv("SECURITY_ALLOWLIST_FILE", str(path))
+        monkeypatch.setattr(allowlist_module, "_allowlist", None)
+
+        first = get_allowlist()
+        assert get_allowlist() is first
+        assert first.check(ResourceType.COMMAND, "curl http://x").allowed is False
+
+        source.add_rule(
+            AllowlistRule(
+                name="curl",
+                resource_type=ResourceType.COMMAND,
+                pattern=r"^curl ",
+                permission=PermissionLevel.ALLOW,
+            )
+        )
+        save_allowlist_to_file(source, str(path))
+        os.utime(path, (1, os.stat(path).st_mtime + 5))
+
+        reloaded = get_allowlist()
+        assert reloaded is not first
+        assert reloaded.check(ResourceType.COMMAND, "curl http://x").allowed is True
+
+        path.write_text("{invalid", encoding="utf-8")
+        os.utime(path, (1, os.stat(path).st_mtime + 10))
+        assert get_allowlist() is reloaded
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
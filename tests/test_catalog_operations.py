@@ -3,6 +3,7 @@ import json
 import pytest
 
 from core.catalog import SkillsCatalogSyncEngine
+from core.catalog.blob_cache import BlobCache
 
 
 def _raise_db_unavailable():
@@ -39,6 +40,7 @@ async def test_catalog_pin_and_unpin_fallback(tmp_path):
 
     engine = SkillsCatalogSyncEngine(sources_file=str(tmp_path / "sources.json"))
     engine._get_conn = _raise_db_unavailable
+    engine._blobs = BlobCache(tmp_path / "blobs")
     engine._fallback_cache_path = str(cache_file)
     engine._history_file_path = str(history_file)
     engine._pins_file_path = str(pins_file)
@@ -119,6 +121,7 @@ async def test_catalog_provenance_and_rollback_fallback(tmp_path):
 
     engine = SkillsCatalogSyncEngine(sources_file=str(tmp_path / "sources.json"))
     engine._get_conn = _raise_db_unavailable
+    engine._blobs = BlobCache(tmp_path / "blobs")
     engine._fallback_cache_path = str(cache_file)
     engine._history_file_path = str(history_file)
     engine._pins_file_path = str(pins_file)
@@ -139,3 +142,79 @@ async def test_catalog_provenance_and_rollback_fallback(tmp_path):
     cache_data_after = json.loads(cache_file.read_text(encoding="utf-8"))
     skill = cache_data_after["skills"][0]
     assert skill["version"] == "1.0.0"
+
+
+def test_history_log_records_per_skill_diffs_and_compacts(tmp_path, monkeypatch):
+    from core.catalog import history_log
+    from core.catalog.history_log import CatalogHistoryLog
+
+    def skill(name, version):
+        return {
+            "skill_name": name,
+            "source_name": "lc",
+            "version": version,
+            "schema_hash": f"{name}-{version}",
+            "payload": {"name": name, "version": version},
+            "status": "active",
+        }
+
+    path = tmp_path / "history.jsonl"
+    log = CatalogHistoryLog(path, max_versions=2)
+    catalog = {f"s{i}:lc": skill(f"s{i}", "1.0.0") for i in range(3)}
+    assert log.record_snapshot(catalog) == 3
+    assert log.record_snapshot(catalog) == 0
+
+    catalog["s1:lc"] = skill("s1", "1.1.0")
+    del catalog["s2:lc"]
+    assert log.record_snapshot(catalog) == 2
+
+    # A second instance (e.g. another process) reuses the sidecar index.
+    other = CatalogHistoryLog(path, max_versions=2)
+    records = other.lookup("s1", "lc")
+    assert [r["version"] for r in records] == ["1.1.0", "1.0.0"]
+    assert other.lookup("s2")[0]["change_type"] == "removed"
+    assert other.lookup("s0", "lc", limit=1)[0]["change_type"] == "added"
+
+    other.append([other.build_record(skill("s1", "1.2.0"), "updated")])
+    assert log.lookup("s1", "lc", limit=1)[0]["version"] == "1.2.0"
+
+    monkeypatch.setattr(history_log, "COMPACT_MIN_RECORDS", 0)
+    for minor in range(3, 9):
+        log.append([log.build_record(skill("s1", f"1.{minor}.0"), "updated")])
+    # Compaction ran once superseded records outnumbered the retained ones.
+    versions = [r["version"] for r in log.lookup("s1", "lc")]
+    assert versions[0] == "1.8.0" and len(versions) < 9
+
+    log.compact()
+    assert [r["version"] for r in log.lookup("s1", "lc")] == ["1.8.0", "1.7.0"]
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 5
+    assert CatalogHistoryLog(path).lookup("s2")[0]["change_type"] == "removed"
+
+
+def test_history_log_migrates_legacy_json_next_to_new_jsonl(tmp_path):
+    legacy = tmp_path / "skills-catalog-history.json"
+    snapshot = {
+        "skill_name": "external_shell",
+        "source_name": "lc",
+        "version": "1.0.0",
+        "schema_hash": "hash_v1",
+        "status": "active",
+    }
+    _write_json(
+        legacy,
+        [
+            {"ts": "2026-03-01T00:00:00Z", "skills": [snapshot]},
+            {
+                "ts": "2026-03-02T00:00:00Z",
+                "skills": [{**snapshot, "version": "2.0.0", "schema_hash": "hash_v2"}],
+            },
+        ],
+    )
+    engine = SkillsCatalogSyncEngine(sources_file=str(tmp_path / "sources.json"))
+    engine._history_file_path = str(tmp_path / "skills-catalog-history.jsonl")
+
+    records = engine._history().lookup("external_shell", "lc")
+
+    assert [r["version"] for r in records] == ["2.0.0", "1.0.0"]
+    assert (tmp_path / "skills-catalog-history.jsonl").is_file()
+    assert (tmp_path / "skills-catalog-history.jsonl.idx").is_file()
@@ -1,8 +1,11 @@
+import csv
+import io
 import json
 
 import pytest
 
 from core.catalog import SkillsCatalogSyncEngine
+from core.catalog.blob_cache import BlobCache
 
 
 def _raise_db_unavailable():
@@ -45,6 +48,7 @@ async def test_catalog_sync_check_detects_added_skills(tmp_path):
 
     engine = SkillsCatalogSyncEngine(sources_file=str(sources_file))
     engine._fallback_cache_path = str(cache_file)
+    engine._blobs = BlobCache(tmp_path / "blobs")
     engine._get_conn = _raise_db_unavailable
 
     result = await engine.sync(mode="check")
@@ -88,6 +92,8 @@ async def test_catalog_sync_apply_persists_and_detects_updates(tmp_path):
     )
     engine = SkillsCatalogSyncEngine(sources_file=str(sources_file))
     engine._fallback_cache_path = str(cache_file)
+    engine._blobs = BlobCache(tmp_path / "blobs")
+    engine._history_file_path = str(tmp_path / "history.jsonl")
     engine._get_conn = _raise_db_unavailable
 
     first = await engine.sync(mode="apply")
@@ -159,6 +165,7 @@ async def test_catalog_sync_parses_langchain_skills_source(tmp_path):
 
     engine = SkillsCatalogSyncEngine(sources_file=str(sources_file))
     engine._fallback_cache_path = str(cache_file)
+    engine._blobs = BlobCache(tmp_path / "blobs")
     engine._get_conn = _raise_db_unavailable
 
     result = await engine.sync(mode="check")
@@ -169,10 +176,17 @@ async def test_catalog_sync_parses_langchain_skills_source(tmp_path):
 
 
 class _MockResponse:
-    def __init__(self, *, status_code=200, json_data=None, text=""):
+    def __init__(self, *, status_code=200, json_data=None, text="", headers=None):
         self.status_code = status_code
         self._json_data = json_data
         self.text = text
+        self.headers = headers or {}
+
+    @property
+    def content(self):
+        if self._json_data is not None:
+            return json.dumps(self._json_data).encode()
+        return self.text.encode()
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -245,6 +259,7 @@ async def test_catalog_sync_parses_langchain_skills_github_repo_source(tmp_path,
 
     engine = SkillsCatalogSyncEngine(sources_file=str(sources_file))
     engine._fallback_cache_path = str(cache_file)
+    engine._blobs = BlobCache(tmp_path / "blobs")
     engine._get_conn = _raise_db_unavailable
 
     result = await engine.sync(mode="check")
@@ -258,3 +273,230 @@ async def test_catalog_sync_parses_langchain_skills_github_repo_source(tmp_path,
         item for item in discovered.values() if item["skill_name"] == "fleetintel-orchestrator"
     )
     assert "Response Contract" in fleet_skill["payload"]["instructions_markdown"]
+
+
+class _RecordingCursor:
+    def __init__(self):
+        self.statements = []
+        self.copied = ""
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+
+    def copy_expert(self, sql, file):
+        self.statements.append(" ".join(sql.split()))
+        self.copied = file.read()
+
+    def fetchall(self):
+        return [("added", 2), ("unchanged", 1)]
+
+
+class _RecordingConn:
+    def __init__(self):
+        self.cursor_obj = _RecordingCursor()
+        self.committed = False
+
+    def cursor(self, *args, **kwargs):
+        return self.cursor_obj
+
+    def commit(self):
+        self.committed = True
+
+    def close(self):
+        pass
+
+
+def test_catalog_apply_is_set_based_regardless_of_catalog_size(tmp_path):
+    engine = SkillsCatalogSyncEngine(sources_file=str(tmp_path / "sources.json"))
+    engine._fallback_cache_path = str(tmp_path / "cache.json")
+    engine._blobs = BlobCache(tmp_path / "blobs")
+
+    def run(count):
+        conn = _RecordingConn()
+        engine._get_conn = lambda: conn
+        discovered = {}
+        for i in range(count):
+            item = engine._normalize_skill(
+                {"name": f"skill_{i}", "description": 'multi\nline, "quoted"'}, source_name="lc"
+            )
+            discovered[engine._catalog_key(item["skill_name"], "lc")] = item
+        engine._apply_catalog({"removed": 0}, discovered)
+        return conn, discovered
+
+    small, _ = run(2)
+    large, discovered = run(200)
+
+    assert large.committed is True
+    assert len(large.cursor_obj.statements) == len(small.cursor_obj.statements)
+    assert any(s.startswith("COPY skills_catalog_stage") for s in large.cursor_obj.statements)
+    rows = list(csv.reader(io.StringIO(large.cursor_obj.copied)))
+    assert len(rows) == 200
+    first = next(iter(discovered.values()))
+    assert rows[0][:4] == [
+        first["skill_name"],
+        "lc",
+        first["version"],
+        first["schema_hash"],
+    ]
+    assert json.loads(rows[0][4]) == first["payload"]
+    assert not (tmp_path / "cache.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_catalog_github_fetch_skips_tree_walk_when_commit_unchanged(tmp_path, monkeypatch):
+    sources_file = tmp_path / "sources.json"
+    _write_json(
+        sources_file,
+        {
+            "sources": [
+                {
+                    "name": "repo",
+                    "type": "langchain_skills_github_repo",
+                    "location": "acme/pack",
+                    "enabled": True,
+                }
+            ]
+        },
+    )
+    calls = []
+    etag = {"value": '"v1"'}
+    sha = {"value": "abc123"}
+
+    async def fake_get(self, url, headers=None):
+        calls.append((url, dict(headers or {})))
+        if "commits/main" in url:
+            if (headers or {}).get("If-None-Match") == etag["value"]:
+                return _MockResponse(status_code=304)
+            return _MockResponse(json_data={"sha": sha["value"]}, headers={"ETag": etag["value"]})
+        if "/git/trees/" in url:
+            tree = [{"path": f"skills/s{i}/SKILL.md"} for i in range(5)]
+            return _MockResponse(json_data={"tree": tree})
+        name = url.split("/skills/")[1].split("/")[0]
+        if (headers or {}).get("If-None-Match") == f'"{name}"':
+            return _MockResponse(status_code=304)
+        return _MockResponse(
+            text=f"---\nname: {name}\ndescription: d\n---\n# {name}\n",
+            headers={"ETag": f'"{name}"'},
+        )
+
+    monkeypatch.setattr("httpx.AsyncClient.get", fake_get)
+
+    def make_engine():
+        engine = SkillsCatalogSyncEngine(sources_file=str(sources_file))
+        engine._fallback_cache_path = str(tmp_path / "cache.json")
+        engine._blobs = BlobCache(tmp_path / "blobs")
+        engine._get_conn = _raise_db_unavailable
+        return engine
+
+    first = await make_engine().sync(mode="check")
+    assert first["skills_discovered"] == 5
+    assert first["fetch"]["repo"]["requests"] == 7
+    assert first["fetch"]["repo"]["not_modified"] == 0
+
+    # New engine instance: ETags and memo come from the blob cache; the commit 304s.
+    calls.clear()
+    second = await make_engine().sync(mode="check")
+    assert second["skills_discovered"] == 5
+    assert [url for url, _ in calls] == ["https://api.github.com/repos/acme/pack/commits/main"]
+    assert second["fetch"]["repo"]["not_modified"] == 1
+    assert second["fetch"]["repo"]["memoized"] is True
+    assert "duration_ms" in second["fetch"]["repo"]
+
+    # ETag changed but the commit SHA did not: still no tree walk.
+    etag["value"] = '"v2"'
+    calls.clear()
+    third = await make_engine().sync(mode="check")
+    assert third["skills_discovered"] == 5
+    assert len(calls) == 1
+
+    # New commit: tree walk again, but unchanged SKILL.md files answer 304.
+    etag["value"], sha["value"] = '"v3"', "def456"
+    fourth = await make_engine().sync(mode="check")
+    assert fourth["skills_discovered"] == 5
+    assert fourth["fetch"]["repo"]["memoized"] is False
+    assert fourth["fetch"]["repo"]["not_modified"] == 5
+
+
+@pytest.mark.asyncio
+async def test_catalog_unchanged_source_skips_normalize_and_cache_rewrite(tmp_path, monkeypatch):
+    local_source = tmp_path / "source.json"
+    sources_file = tmp_path / "sources.json"
+    cache_file = tmp_path / "cache.json"
+    _write_json(local_source, {"skills": [{"name": "a"}, {"name": "b"}]})
+    _write_json(
+        sources_file,
+        {"sources": [{"name": "local", "type": "local_json", "location": str(local_source)}]},
+    )
+
+    def make_engine():
+        engine = SkillsCatalogSyncEngine(sources_file=str(sources_file))
+        engine._fallback_cache_path = str(cache_file)
+        engine._blobs = BlobCache(tmp_path / "blobs")
+        engine._history_file_path = str(tmp_path / "history.json")
+        engine._get_conn = _raise_db_unavailable
+        return engine
+
+    assert (await make_engine().sync(mode="apply"))["added"] == 2
+    # The second run only records the new diff (nothing added) in the file
+    assert (await make_engine().sync(mode="apply"))["added"] == 0
+    written = cache_file.stat().st_mtime_ns
+
+    def fail_normalize(*args, **kwargs):
+        raise AssertionError("normalize should be memoized")
+
+    engine = make_engine()
+    monkeypatch.setattr(engine, "_normalize_skill", fail_normalize)
+    result = await engine.sync(mode="apply")
+
+    assert result["success"] is True
+    assert result["fetch"]["local"]["memoized"] is True
+    assert cache_file.stat().st_mtime_ns == written
+
+
+@pytest.mark.asyncio
+async def test_catalog_fallback_file_rewritten_when_pins_change(tmp_path):
+    local_source = tmp_path / "source.json"
+    sources_file = tmp_path / "sources.json"
+    cache_file = tmp_path / "cache.json"
+    _write_json(local_source, {"skills": [{"name": "a", "version": "1.0.0"}]})
+    _write_json(
+        sources_file,
+        {"sources": [{"name": "local", "type": "local_json", "location": str(local_source)}]},
+    )
+    engine = SkillsCatalogSyncEngine(sources_file=str(sources_file))
+    engine._fallback_cache_path = str(cache_file)
+    engine._blobs = BlobCache(tmp_path / "blobs")
+    engine._history_file_path = str(tmp_path / "history.jsonl")
+    engine._pins_file_path = str(tmp_path / "pins.json")
+    engine._get_conn = _raise_db_unavailable
+
+    await engine.sync(mode="apply")
+    await engine.sync(mode="apply")
+    pinned = await engine.pin(
+        skill_name="a", source_name="local", version="1.0.0", reason="freeze", pinned_by="test"
+    )
+    assert pinned["success"] is True
+    await engine.sync(mode="apply")
+
+    skills = json.loads(cache_file.read_text(encoding="utf-8"))["skills"]
+    assert skills[0]["pinned"] is True
+    assert skills[0]["pinned_version"] == "1.0.0"
+    aliases = json.loads((tmp_path / "blobs" / "index.json").read_text(encoding="utf-8"))["aliases"]
+    assert [name for name in aliases if name.startswith("fallback_catalog:")] == [
+        f"fallback_catalog:{cache_file}"
+    ]
+
+
+def test_blob_cache_evicts_least_recently_used(tmp_path):
+    cache = BlobCache(tmp_path, max_bytes=10)
+    first = cache.put(b"aaaa", url="http://x/a", etag='"a"')
+    cache.put(b"bbbb")
+    cache.get(first)
+    cache.put(b"cccc")
+    cache.flush()
+
+    reloaded = BlobCache(tmp_path, max_bytes=10)
+    assert reloaded.lookup_url("http://x/a") == ('"a"', first)
+    assert reloaded.get(first) == b"aaaa"
+    assert reloaded.total_bytes() == 8
+    assert cache.stats["evictions"] == 1
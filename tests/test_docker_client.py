@@ -0,0 +1,98 @@
+import json
+
+import httpx
+import pytest
+
+from core.resource_manager import docker_client as docker_module
+from core.resource_manager.docker_client import DockerClient, normalize_container
+
+CONTAINERS = [
+    {
+        "Id": "abc123def4567890",
+        "Names": ["/vps-postgres"],
+        "Image": "postgres:16",
+        "State": "running",
+        "Status": "Up 3 hours",
+        "Ports": [
+            {"IP": "127.0.0.1", "PrivatePort": 5432, "PublicPort": 5432, "Type": "tcp"},
+            {"PrivatePort": 8080, "Type": "tcp"},
+        ],
+    },
+]
+
+
+def _transports(requests, events=b""):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/containers/json":
+            return httpx.Response(200, json=CONTAINERS)
+        if request.url.path == "/version":
+            return httpx.Response(200, json={"Version": "27.1.1"})
+        if request.url.path == "/events":
+            return httpx.Response(200, content=events)
+        return httpx.Response(404, json={"message": "not found"})
+
+    return httpx.MockTransport(handler), httpx.MockTransport(handler)
+
+
+def test_normalize_container_matches_cli_format():
+    container = normalize_container(CONTAINERS[0])
+
+    assert container["name"] == "vps-postgres"
+    assert container["id"] == "abc123def456"
+    assert container["ports"] == "127.0.0.1:5432->5432/tcp, 8080/tcp"
+
+
+@pytest.mark.asyncio
+async def test_container_list_is_cached_and_shared_with_sync_callers(monkeypatch):
+    monkeypatch.setenv("DOCKER_EVENTS_ENABLED", "false")
+    requests = []
+    transport, sync_transport = _transports(requests)
+    client = DockerClient(cache_ttl=60, transport=transport, sync_transport=sync_transport)
+
+    first = await client.list_containers()
+    second = await client.list_containers()
+    names = [c["name"] for c in client.list_containers_sync()]
+
+    assert first is second
+    assert names == ["vps-postgres"]
+    assert requests == ["/containers/json"]
+
+    client.invalidate()
+    await client.list_containers()
+    assert requests.count("/containers/json") == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_events_invalidate_cache(monkeypatch):
+    monkeypatch.setenv("DOCKER_EVENTS_ENABLED", "false")
+    requests = []
+    event = {"Type": "container", "Action": "die", "Actor": {"Attributes": {"name": "x"}}}
+    transport, sync_transport = _transports(requests, events=(json.dumps(event) + "\n").encode())
+    client = DockerClient(cache_ttl=60, transport=transport, sync_transport=sync_transport)
+
+    await client.list_containers()
+    await client._consume_events()
+
+    assert client.stats["events"] == 1
+    assert client._cached(False) is None
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_containers_skill_uses_shared_client(monkeypatch):
+    from core.skills._builtin.containers.handler import ContainersSkill
+    from core.skills.base import SkillConfig
+
+    monkeypatch.setenv("DOCKER_EVENTS_ENABLED", "false")
+    transport, sync_transport = _transports([])
+    client = DockerClient(transport=transport, sync_transport=sync_transport)
+    monkeypatch.setattr("core.skills._builtin.containers.handler.get_docker_client", lambda: client)
+
+    result = await ContainersSkill(SkillConfig(name="list_containers", description="")).execute()
+
+    assert "vps-postgres" in result
+    assert "127.0.0.1:5432->5432/tcp" in result
+    assert docker_module.get_docker_client() is not client
+    await client.close()
@@ -14,6 +14,7 @@ from core.skills._builtin.fleetintel.handler import FleetIntelSkill
 from core.skills._builtin.fleetintel_analyst.handler import FleetIntelAnalystSkill
 from core.skills._builtin.fleetintel_orchestrator.handler import FleetIntelOrchestratorSkill
 from core.skills.base import SecurityLevel, SkillConfig
+from core.skills.registry import SkillRegistry
 
 
 class _FakeClient:
@@ -149,6 +150,44 @@ async def test_brazilcnpj_skill_routes_socios(monkeypatch):
     assert calls == [("brazilcnpj", "get_socios", {"cnpj": "12345678000199"})]
 
 
+@pytest.mark.asyncio
+async def test_brazilcnpj_cache_skips_failures_health_and_refresh(monkeypatch):
+    calls = []
+    fail = {"on": True}
+
+    async def fake_call(service, tool_name, arguments):
+        calls.append(tool_name)
+        if fail["on"] and tool_name == "search_empresa":
+            raise RemoteMCPError(
+                server_name=service, stage="call_tool", error_type="timeout", message="boom"
+            )
+        return {"status": "ok", "empresas": [{"razao_social": "ACME", "cnpj": "1"}]}
+
+    _patch_builder(
+        monkeypatch,
+        "core.skills._builtin.brazilcnpj.handler.build_specialist_mcp_client",
+        fake_call,
+    )
+    config = _config("brazilcnpj")
+    config.cache_ttl_seconds = 3600
+    config.cache_key_args = ["query", "raw_input"]
+    registry = SkillRegistry(skill_dirs=[])
+    registry.register(BrazilCNPJSkill(config))
+
+    lookup = {"query": "CNPJ 12.345.678/0001-99"}
+    assert (await registry.execute_skill("brazilcnpj", lookup)).startswith("❌")
+    fail["on"] = False
+    assert "ACME" in await registry.execute_skill("brazilcnpj", lookup)
+    assert "ACME" in await registry.execute_skill("brazilcnpj", lookup)
+    assert calls.count("search_empresa") == 2
+
+    for query in ("status do brazilcnpj", "enriquecer cnpj 12.345.678/0001-99"):
+        calls.clear()
+        await registry.execute_skill("brazilcnpj", {"query": query})
+        await registry.execute_skill("brazilcnpj", {"query": query})
+        assert len(calls) == 2
+
+
 @pytest.mark.asyncio
 async def test_brazilcnpj_skill_uses_preferred_company_registry_brief(monkeypatch):
     calls = []
@@ -373,6 +373,125 @@ class TestGatewayEndpoints:
         assert response.status_code == 401
 
 
+# ============ Telegram Webhook Queue Tests ============
+
+
+class _FakeTelegramAdapter:
+    """TelegramAdapter double that records async replies."""
+
+    def __init__(self):
+        from core.gateway.adapters import TelegramAdapter
+
+        self._real = TelegramAdapter(bot_token="test_token")
+        self.sent = []
+        self.closed = False
+
+    def process_update(self, update):
+        return self._real.process_update(update)
+
+    async def send_message_async(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, text))
+        return {"ok": True}
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _telegram_update(update_id, text="Hello", chat_id=100):
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": 200, "username": "testuser"},
+            "text": text,
+        },
+    }
+
+
+class TestTelegramUpdateQueue:
+    """Tests for the background webhook queue."""
+
+    @pytest.mark.asyncio
+    async def test_processes_in_background_and_dedups(self):
+        from core.gateway.webhook_queue import TelegramUpdateQueue
+
+        calls = []
+
+        async def fake_agent(user_id, message):
+            calls.append((user_id, message))
+            return {"response": f"echo: {message}"}
+
+        adapter = _FakeTelegramAdapter()
+        queue = TelegramUpdateQueue(adapter, fake_agent, workers=2)
+
+        assert queue.enqueue(_telegram_update(1, "primeira")) == "queued"
+        assert queue.enqueue(_telegram_update(1, "primeira")) == "duplicate"
+        assert queue.enqueue(_telegram_update(2, "segunda")) == "queued"
+        await queue.join()
+        await queue.stop()
+
+        assert calls == [("testuser", "primeira"), ("testuser", "segunda")]
+        assert adapter.sent == [("100", "echo: primeira"), ("100", "echo: segunda")]
+        assert queue.stats["duplicates"] == 1
+        assert adapter.closed
+
+    @pytest.mark.asyncio
+    async def test_full_queue_is_not_marked_seen(self):
+        from core.gateway.webhook_queue import TelegramUpdateQueue
+
+        async def fake_agent(user_id, message):
+            return "ok"
+
+        queue = TelegramUpdateQueue(_FakeTelegramAdapter(), fake_agent, workers=1, max_queue_size=1)
+        assert queue.enqueue(_telegram_update(1)) == "queued"
+        assert queue.enqueue(_telegram_update(2)) == "full"
+        await queue.join()
+
+        # Retry do Telegram depois que a fila esvazia e aceito.
+        assert queue.enqueue(_telegram_update(2)) == "queued"
+        await queue.join()
+        await queue.stop()
+
+    def test_webhook_returns_immediately(self, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        import core.gateway.main as main_module
+
+        monkeypatch.setattr(main_module, "TELEGRAM_WEBHOOK_SECRET", None)
+        enqueued = []
+        monkeypatch.setattr(
+            main_module.telegram_queue,
+            "enqueue",
+            lambda update: enqueued.append(update) or "queued",
+        )
+
+        client = TestClient(main_module.app)
+        response = client.post("/api/v1/webhook/telegram", json=_telegram_update(7))
+
+        assert response.status_code == 200
+        assert response.json() == {"ok": True, "update_id": 7, "status": "queued"}
+        assert enqueued[0]["update_id"] == 7
+
+        assert client.post("/api/v1/webhook/telegram", json={"foo": 1}).status_code == 400
+
+    def test_webhook_rejects_wrong_secret(self, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        import core.gateway.main as main_module
+
+        monkeypatch.setattr(main_module, "TELEGRAM_WEBHOOK_SECRET", "s3cret")
+        client = TestClient(main_module.app)
+
+        response = client.post(
+            "/api/v1/webhook/telegram",
+            json=_telegram_update(8),
+            headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+        )
+
+        assert response.status_code == 401
+
+
 # Run tests
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -170,26 +170,31 @@ class TestHealthCheck:
         assert result.status == HealthStatus.UNHEALTHY
 
     def test_check_memory_unknown_when_psutil_missing(self):
-        """Test memory check returns UNKNOWN when psutil is not available."""
+        """Test memory check returns UNKNOWN without sampler data or psutil."""
         hc = HealthCheck()
+        hc._resource_sample = lambda: None
 
-        # Simular psutil não disponível
+        # Simular psutil não disponível (e sem amostra do /proc)
         with patch.dict("sys.modules", {"psutil": None}):
             result = hc.check_memory()
             assert result.status == HealthStatus.UNKNOWN
 
     def test_check_cpu_unknown_when_psutil_missing(self):
-        """Test CPU check returns UNKNOWN when psutil is not available."""
+        """Test CPU check returns UNKNOWN without sampler data or psutil."""
         hc = HealthCheck()
+        hc._resource_sample = lambda: None
 
+        # Simular psutil não disponível (e sem amostra do /proc)
         with patch.dict("sys.modules", {"psutil": None}):
             result = hc.check_cpu()
             assert result.status == HealthStatus.UNKNOWN
 
     def test_check_disk_unknown_when_psutil_missing(self):
-        """Test disk check returns UNKNOWN when psutil is not available."""
+        """Test disk check returns UNKNOWN without sampler data or psutil."""
         hc = HealthCheck()
+        hc._resource_sample = lambda: None
 
+        # Simular psutil não disponível (e sem amostra do /proc)
         with patch.dict("sys.modules", {"psutil": None}):
             result = hc.check_disk()
             assert result.status == HealthStatus.UNKNOWN
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.hooks.runner import HookContext, HookRunner, feedback_pre_hook
+
+
+def _ctx(skill="ram"):
+    return HookContext(skill_name=skill, args={}, user_id="u1")
+
+
+@pytest.mark.asyncio
+async def test_slow_pre_hook_runs_in_background_and_is_cached():
+    calls = []
+
+    async def slow_feedback(ctx):
+        calls.append(ctx.skill_name)
+        await asyncio.sleep(0.2)
+        ctx.metadata["warning"] = "falhou 3x"
+        return True
+
+    runner = HookRunner(pre_budget_ms=20)
+    runner.register_pre(slow_feedback, cache_ttl=60)
+
+    first = _ctx()
+    started = time.perf_counter()
+    assert await runner.run_pre(first) is True
+    assert time.perf_counter() - started < 0.15
+    assert "warning" not in first.metadata
+
+    await asyncio.sleep(0.3)
+    second = _ctx()
+    assert await runner.run_pre(second) is True
+    assert second.metadata["warning"] == "falhou 3x"
+    assert calls == ["ram"]
+
+    stats = runner.stats()["pre"]["slow_feedback"]
+    assert stats["calls"] == 1 and stats["timeouts"] == 1 and stats["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_critical_pre_hook_can_veto_beyond_budget():
+    async def policy(ctx):
+        await asyncio.sleep(0.05)
+        return False
+
+    async def failing(ctx):
+        raise RuntimeError("boom")
+
+    runner = HookRunner(pre_budget_ms=1)
+    runner.register_pre(failing)
+    runner.register_pre(policy, critical=True)
+
+    assert await runner.run_pre(_ctx()) is False
+    assert runner.stats()["pre"]["failing"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_post_hooks_are_fire_and_forget_and_concurrent():
+    finished = []
+
+    async def slow_a(ctx):
+        await asyncio.sleep(0.1)
+        finished.append("a")
+
+    async def slow_b(ctx):
+        await asyncio.sleep(0.1)
+        finished.append("b")
+
+    async def broken(ctx):
+        raise ValueError("x")
+
+    runner = HookRunner()
+    for hook in (slow_a, slow_b, broken):
+        runner.register_post(hook)
+
+    started = time.perf_counter()
+    await runner.run_post(_ctx())
+    assert time.perf_counter() - started < 0.05
+    assert finished == []
+
+    assert await runner.drain(timeout=2)
+    assert time.perf_counter() - started < 0.18
+    assert sorted(finished) == ["a", "b"]
+
+    stats = runner.stats()
+    assert stats["post"]["broken"]["errors"] == 1
+    assert stats["post"]["slow_a"]["avg_ms"] >= 90
+    assert stats["post_queue"]["processed"] == 1
+    await runner.close()
+
+
+@pytest.mark.asyncio
+async def test_feedback_hook_queries_learnings_off_the_event_loop(monkeypatch):
+    from core.vps_langgraph import learnings
+
+    threads = []
+
+    def recent_failure_count(trigger):
+        threads.append(threading.get_ident())
+        return 3
+
+    monkeypatch.setattr(learnings.learnings_manager, "recent_failure_count", recent_failure_count)
+    ctx = _ctx("web_search")
+
+    assert await feedback_pre_hook(ctx) is True
+    assert threads and threads[0] != threading.get_ident()
+    assert ctx.metadata["warning"] == "Este skill falhou 3x recentemente"
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+
+import pytest
+
+from core.vps_langgraph import learnings as learnings_module
+from core.vps_langgraph.learnings import LearningsManager
+
+ROW = (1, "execution_error", "web_search", "Erro ao executar web_search: timeout", False, {}, None)
+
+
+class FakeCursor:
+    def __init__(self, executed, rows):
+        self.executed = executed
+        self.rows = rows
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return (7,)
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    calls = []
+
+    @contextmanager
+    def db_cursor():
+        yield FakeCursor(calls, [ROW])
+
+    monkeypatch.setattr(learnings_module, "db_cursor", db_cursor)
+    monkeypatch.setattr(learnings_module, "TRIGRAM_ENABLED", False)
+    return calls
+
+
+def _searches(executed):
+    return [(sql, params) for sql, params in executed if "websearch_to_tsquery" in sql]
+
+
+def test_search_uses_ranked_full_text_on_indexed_expressions(executed):
+    manager = LearningsManager()
+
+    results = manager.search_learnings("web_search", limit=5)
+
+    assert results[0]["trigger"] == "web_search"
+    sql, params = _searches(executed)[0]
+    assert "ILIKE" not in sql
+    assert "to_tsvector('portuguese', trigger) @@ q" in sql
+    assert "to_tsvector('portuguese', lesson) @@ q" in sql
+    assert "ts_rank" in sql and "<%" not in sql
+    assert params == {"q": "web_search", "limit": 5}
+
+    manager.search_learnings("deploy falhou", match_any=True)
+    assert "to_tsquery('simple'" in _searches(executed)[1][0]
+
+
+def test_search_results_are_cached_until_a_learning_is_added(executed):
+    manager = LearningsManager(cache_ttl=60)
+
+    manager.search_learnings("web_search")
+    manager.search_learnings("  WEB_SEARCH ")
+    assert len(_searches(executed)) == 1
+    assert manager.cache_stats == {"hits": 1, "misses": 1}
+
+    manager.add_learning("execution_error", "web_search", "timeout", success=False)
+    manager.search_learnings("web_search")
+    assert len(_searches(executed)) == 2
+
+
+def test_empty_query_returns_recent_learnings(executed):
+    manager = LearningsManager()
+
+    results = manager.search_learnings("", limit=3)
+
+    assert results[0]["id"] == 1
+    assert _searches(executed) == []
+    assert "ORDER BY created_at DESC" in executed[-1][0]
+
+
+def test_add_learning_updates_rollup_in_the_same_transaction(executed):
+    manager = LearningsManager()
+    manager._initialized = True
+
+    manager.add_learning("execution_error", "web_search", "timeout", success=False)
+
+    insert, rollup = executed
+    assert insert[0].strip().startswith("INSERT INTO learnings ")
+    assert "ON CONFLICT (category, trigger, day)" in rollup[0]
+    assert rollup[1] == ("execution_error", "web_search", 1, False)
+
+
+def test_recent_failure_count_is_a_keyed_rollup_lookup(executed):
+    manager = LearningsManager()
+    manager._initialized = True
+
+    assert manager.recent_failure_count("web_search") == 7
+
+    sql, params = executed[-1]
+    assert "FROM learnings_rollup" in sql and "GROUP BY" not in sql
+    assert params == ("execution_error", "web_search", 2)
@@ -1,3 +1,5 @@
+import re
+
 from core.memory import MemoryPolicy, MemoryType
 
 
@@ -50,3 +52,51 @@ def test_memory_policy_sanitize_context_keeps_only_allowed_keys():
     assert "secret_token" in sanitized
     assert sanitized["secret_token"] == "[REDACTED]"
     assert "internal_notes" not in sanitized
+
+
+def test_memory_policy_redact_reports_changes_and_reuses_unchanged_subtrees():
+    policy = MemoryPolicy()
+    history = [{"role": "user", "content": f"mensagem {i}"} for i in range(100)]
+    payload = {"history": history, "auth": {"header": "Bearer abc.def"}}
+
+    redacted, changed = policy.redact(payload)
+
+    assert changed is True
+    assert redacted["history"] is history
+    assert redacted["auth"] == {"header": "[REDACTED]"}
+    assert payload["auth"]["header"] == "Bearer abc.def"
+
+    clean = {"a": [1, "x", ("y", None)]}
+    assert policy.redact(clean) == (clean, False)
+    assert policy.redact(clean)[0] is clean
+
+
+def test_memory_policy_combined_patterns_keep_per_pattern_flags():
+    policy = MemoryPolicy(
+        sensitive_patterns=(
+            re.compile(r"(?P<v>secret)-(?P=v)"),
+            re.compile(r"(?P<v>\d{4})"),
+            re.compile(r"CASE", re.IGNORECASE),
+        )
+    )
+
+    assert policy.redact_value("secret-secret case 1234 SECRET-x") == (
+        "[REDACTED] [REDACTED] [REDACTED] SECRET-x"
+    )
+    default = MemoryPolicy()
+    assert len(default._redactor().passes) == 1
+    assert default.redact_value("key sk-ABCDEF0123456789abcd fim") == "key [REDACTED] fim"
+
+
+def test_memory_policy_redacts_deeply_nested_values_without_recursion():
+    policy = MemoryPolicy()
+    value = {"password": "x"}
+    for _ in range(5000):
+        value = {"next": [value]}
+
+    redacted, changed = policy.redact(value)
+
+    assert changed is True
+    for _ in range(5000):
+        redacted = redacted["next"][0]
+    assert redacted == {"password": "[REDACTED]"}
@@ -0,0 +1,78 @@
+from core.skills.base import SkillBase, SkillConfig
+from core.skills.registry import SkillRegistry
+from core.vps_langgraph.prompt_cache import SystemPromptCache
+
+
+class _EchoSkill(SkillBase):
+    async def execute(self, args=None):
+        return "ok"
+
+
+def _skill(name):
+    return _EchoSkill(SkillConfig(name=name, description=f"Skill {name}"))
+
+
+def test_tool_schemas_cached_until_registry_changes():
+    registry = SkillRegistry(skill_dirs=[])
+    registry.register(_skill("alpha"))
+
+    first = registry.list_tool_schemas()
+    assert registry.list_tool_schemas() is first
+
+    registry.register(_skill("beta"))
+    second = registry.list_tool_schemas()
+    assert second is not first
+    assert [tool["function"]["name"] for tool in second] == ["alpha", "beta"]
+
+
+def test_system_prompt_rebuilt_only_on_version_change():
+    registry = SkillRegistry(skill_dirs=[])
+    registry.register(_skill("alpha"))
+    cache = SystemPromptCache(ttl_seconds=3600)
+    builds = []
+
+    def builder():
+        builds.append(registry.version)
+        return f"prompt v{registry.version}"
+
+    assert cache.get(registry, builder) == "prompt v1"
+    assert cache.get(registry, builder) == "prompt v1"
+    assert builds == [1]
+
+    registry.register(_skill("beta"))
+    assert cache.get(registry, builder) == "prompt v2"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_unversioned_registry_bypasses_cache():
+    class _FakeRegistry:
+        pass
+
+    cache = SystemPromptCache()
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return "prompt"
+
+    cache.get(_FakeRegistry(), builder)
+    cache.get(_FakeRegistry(), builder)
+    assert len(calls) == 2
+
+
+def test_capability_change_invalidates_prompt(monkeypatch):
+    from core.capabilities import capabilities_registry
+
+    registry = SkillRegistry(skill_dirs=[])
+    cache = SystemPromptCache(ttl_seconds=3600)
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return "prompt"
+
+    cache.get(registry, builder)
+    monkeypatch.setattr(capabilities_registry, "version", capabilities_registry.version + 1)
+    cache.get(registry, builder)
+    assert len(calls) == 2
@@ -0,0 +1,73 @@
+from core.resource_manager.sampler import ResourceSampler
+
+
+def _write_proc(root, *, available_kb: int, idle: int, busy: int):
+    (root / "meminfo").write_text(
+        "MemTotal:        2048000 kB\n"
+        f"MemAvailable:    {available_kb} kB\n"
+        "SwapTotal:       1024000 kB\n"
+        "SwapFree:        1024000 kB\n",
+        encoding="utf-8",
+    )
+    (root / "stat").write_text(
+        f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 {busy} 0 0 {idle} 0 0 0 0 0 0\n",
+        encoding="utf-8",
+    )
+
+
+def test_sample_reads_meminfo_and_cpu_delta(tmp_path):
+    _write_proc(tmp_path, available_kb=1024000, idle=900, busy=100)
+    sampler = ResourceSampler(proc_root=str(tmp_path), disk_path=str(tmp_path))
+
+    first = sampler.sample_now()
+    assert first.mem_total_mb == 2000
+    assert first.mem_available_mb == 1000
+    assert round(first.mem_used_percent) == 50
+    assert first.cpu_percent == 10.0  # media desde o boot
+    assert first.disk_total_gb > 0
+
+    _write_proc(tmp_path, available_kb=512000, idle=950, busy=150)
+    second = sampler.sample_now()
+    assert second.cpu_percent == 50.0  # delta: 50 busy / 100 total
+    assert sampler.latest() is second
+
+
+def test_smoothed_window_and_trend(tmp_path):
+    sampler = ResourceSampler(proc_root=str(tmp_path), disk_path=str(tmp_path))
+    for step, available_kb in enumerate((1536000, 1024000, 512000)):
+        _write_proc(tmp_path, available_kb=available_kb, idle=100 * (step + 1), busy=0)
+        sampler.sample_now()
+
+    smoothed = sampler.smoothed(60)
+    assert smoothed["samples"] == 3
+    assert smoothed["mem_available_mb"] == 1000
+
+    samples = list(sampler._samples)
+    for offset, sample in enumerate(samples):
+        object.__setattr__(sample, "ts", samples[0].ts + offset * 60)
+    assert sampler.trend("mem_used_percent", seconds=3600) == 25.0
+
+
+def test_ring_buffer_is_bounded(tmp_path):
+    _write_proc(tmp_path, available_kb=1024000, idle=900, busy=100)
+    sampler = ResourceSampler(window_size=3, proc_root=str(tmp_path), disk_path=str(tmp_path))
+    for _ in range(5):
+        sampler.sample_now()
+    assert len(sampler.window(60)) == 3
+
+
+def test_available_ram_falls_back_to_psutil_without_sample(monkeypatch):
+    import sys
+    from types import SimpleNamespace
+
+    from core.resource_manager import manager
+
+    monkeypatch.setattr(
+        manager, "get_resource_sampler", lambda: SimpleNamespace(latest=lambda: None)
+    )
+    fake_psutil = SimpleNamespace(
+        virtual_memory=lambda: SimpleNamespace(available=512 * 1024 * 1024)
+    )
+    monkeypatch.setitem(sys.modules, "psutil", fake_psutil)
+
+    assert manager.get_available_ram() == 512
@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from core.skills._builtin.shell_exec import handler as shell_handler
+from core.skills._builtin.shell_exec.handler import OutputCapture, ShellExecSkill
+from core.skills.base import SkillConfig
+
+
+def _skill(max_output_chars=200, timeout_seconds=10):
+    return ShellExecSkill(
+        SkillConfig(
+            name="shell_exec",
+            description="shell",
+            max_output_chars=max_output_chars,
+            timeout_seconds=timeout_seconds,
+        )
+    )
+
+
+def test_capture_keeps_head_and_tail_within_budget():
+    capture = OutputCapture(10)
+    for i in range(1000):
+        capture.feed(f"{i:04d}\n".encode())
+
+    assert len(capture.head) + len(capture.tail) == 10
+    assert capture.total_bytes == 5000
+    rendered = capture.render()
+    assert rendered.startswith("0000\n")
+    assert rendered.endswith("0999\n")
+    assert "truncated 4990 of 5000 bytes" in rendered
+
+
+@pytest.mark.asyncio
+async def test_large_output_is_bounded_and_can_spill(tmp_path, monkeypatch):
+    monkeypatch.setattr(shell_handler, "SPILL_DIR", str(tmp_path))
+    command = "seq 1 200000"
+
+    result = await _skill().execute({"command": command, "save_full_output": True})
+
+    assert result.startswith("1\n2\n")
+    assert result.rstrip().endswith("200000")
+    assert len(result) < 600
+    spill = result.split("full output: ", 1)[1].split("]", 1)[0]
+    with open(spill, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 200000
+
+    # Saída curta: nenhum arquivo temporário sobra
+    os.unlink(spill)
+    assert await _skill().execute({"command": "echo oi", "save_full_output": True}) == "oi\n"
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_runaway_output_and_timeout_kill_the_process(monkeypatch):
+    monkeypatch.setattr(shell_handler, "MAX_STREAM_BYTES", 1024 * 1024)
+
+    started = time.monotonic()
+    result = await _skill().execute({"command": "yes"})
+    assert "[killed: output exceeded 1048576 bytes]" in result
+    assert len(result) < 600
+
+    result = await _skill(timeout_seconds=1).execute({"command": "sleep 30"})
+    assert result == "ERROR: Timeout after 1s: sleep 30"
+    assert time.monotonic() - started < 10
@@ -0,0 +1,115 @@
+import pytest
+
+from core.hooks.metrics import SkillMetricsAggregator, metrics_hook
+from core.hooks.runner import HookContext
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self._store = store
+        self._ops = []
+
+    def getdel(self, key):
+        self._ops.append(key)
+
+    def execute(self):
+        return [self._store.pop(key, None) for key in self._ops]
+
+
+class _FakeRedis:
+    def __init__(self, store):
+        self.store = dict(store)
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.store) if key.startswith(prefix)]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.store)
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class _FakeConn:
+    def __init__(self):
+        self.committed = False
+        self.closed = False
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def close(self):
+        self.closed = True
+
+
+def test_record_builds_delta_and_latency_histogram():
+    aggregator = SkillMetricsAggregator()
+    aggregator.record("get_ram", True, 5)
+    aggregator.record("get_ram", True, 300)
+    aggregator.record("get_ram", False, 20000)
+
+    stats = aggregator.snapshot()["get_ram"]
+    assert stats["success"] == 2
+    assert stats["failure"] == 1
+    assert stats["latency_histogram"] == {"le_10": 1, "le_500": 1, "le_inf": 1}
+
+
+def test_flush_upserts_once_and_resets_deltas(monkeypatch):
+    calls = []
+
+    def _fake_execute_values(cur, sql, rows, template=None):
+        calls.append(rows)
+
+    monkeypatch.setattr("psycopg2.extras.execute_values", _fake_execute_values)
+
+    aggregator = SkillMetricsAggregator()
+    aggregator.record("get_ram", True, 12)
+    aggregator.record("shell_exec", False, 40)
+    redis_client = _FakeRedis({"skill_usage:web_search": "3", "other:key": "1"})
+    conn = _FakeConn()
+
+    flushed = aggregator.flush(lambda: conn, redis_client)
+
+    assert len(calls) == 1
+    rows = {row[0]: row for row in calls[0]}
+    assert set(rows) == {"get_ram", "shell_exec", "web_search"}
+    assert rows["web_search"][1] == 3
+    assert rows["shell_exec"][2] == 1
+    assert conn.committed and conn.closed
+    assert flushed["get_ram"]["success"] == 1
+    assert "skill_usage:web_search" not in redis_client.store
+    assert "other:key" in redis_client.store
+
+    # Segundo flush sem novas execucoes nao re-conta nada.
+    assert aggregator.flush(lambda: conn, redis_client) == {}
+    assert len(calls) == 1
+
+
+def test_flush_failure_restores_pending(monkeypatch):
+    def _broken_conn():
+        raise RuntimeError("db down")
+
+    aggregator = SkillMetricsAggregator()
+    aggregator.record("get_ram", True, 12)
+
+    assert aggregator.flush(_broken_conn) == {}
+    assert aggregator.has_pending()
+
+
+@pytest.mark.asyncio
+async def test_metrics_hook_counts_error_results_as_failures(monkeypatch):
+    aggregator = SkillMetricsAggregator(flush_interval_seconds=3600)
+    monkeypatch.setattr("core.hooks.metrics._aggregator", aggregator)
+
+    ctx = HookContext(skill_name="check_redis", args={}, user_id="u1")
+    ctx.result = "❌ Erro ao executar skill 'check_redis': boom"
+    ctx.duration_ms = 8
+    await metrics_hook(ctx)
+
+    assert aggregator.snapshot()["check_redis"]["failure"] == 1
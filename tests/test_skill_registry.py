@@ -144,6 +144,201 @@ class TestSkillRegistry:
         assert found.name == "get_system_status"
 
 
+class TestTriggerMatcher:
+    """Matcher Aho-Corasick usado por find_by_trigger."""
+
+    @staticmethod
+    def _registry(*specs):
+        registry = SkillRegistry(skill_dirs=[])
+        for name, triggers in specs:
+            registry.register(
+                MockSkill(SkillConfig(name=name, description=name, triggers=triggers))
+            )
+        return registry
+
+    def test_accent_folding_and_word_boundary(self):
+        registry = self._registry(("get_ram", ["ram", "memória"]))
+
+        assert registry.find_by_trigger("Como está a MEMORIA?").name == "get_ram"
+        assert registry.find_by_trigger("abra o programa") is None
+
+    def test_longest_trigger_wins_over_registration_order(self):
+        registry = self._registry(
+            ("get_system_status", ["status", "sistema"]),
+            ("check_postgres", ["status do banco de dados"]),
+        )
+
+        found = registry.find_by_trigger("qual o status do banco de dados?")
+        assert found.name == "check_postgres"
+
+    def test_exact_trigger_beats_longer_partial(self):
+        registry = self._registry(
+            ("web_search", ["pesquise na internet sobre docker"]),
+            ("list_containers", ["docker"]),
+        )
+
+        assert registry.find_by_trigger("Docker!").name == "list_containers"
+
+    def test_matcher_rebuilt_when_registry_changes(self):
+        registry = self._registry(("get_ram", ["ram"]))
+        assert registry.find_by_trigger("redis ok?") is None
+
+        registry.register(
+            MockSkill(SkillConfig(name="check_redis", description="", triggers=["redis"]))
+        )
+        assert registry.find_by_trigger("redis ok?").name == "check_redis"
+
+
+def _write_skill(root, name="lazy_skill", result="lazy ok"):
+    skill_dir = root / name
+    skill_dir.mkdir()
+    (skill_dir / "config.yaml").write_text(
+        f"name: {name}\ndescription: Skill lazy\ntriggers: [preguica]\n", encoding="utf-8"
+    )
+    (skill_dir / "handler.py").write_text(
+        "import sys\n"
+        "from core.skills.base import SkillBase\n"
+        "sys.modules.setdefault('lazy_skill_imported', True)\n\n"
+        "class LazyHandler(SkillBase):\n"
+        "    async def execute(self, args=None):\n"
+        f"        return {result!r}\n",
+        encoding="utf-8",
+    )
+    return skill_dir
+
+
+class TestLazySkillLoading:
+    """Manifest + import sob demanda dos handlers."""
+
+    @pytest.mark.asyncio
+    async def test_handler_imported_only_on_first_execution(self, tmp_path):
+        import sys
+
+        sys.modules.pop("lazy_skill_imported", None)
+        _write_skill(tmp_path)
+        registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+
+        assert registry.discover_and_register() == 1
+        assert registry.list_tool_schemas()[0]["function"]["name"] == "lazy_skill"
+        assert registry.find_by_trigger("preguica").name == "lazy_skill"
+        assert "lazy_skill_imported" not in sys.modules
+
+        assert await registry.execute_skill("lazy_skill") == "lazy ok"
+        assert registry.get("lazy_skill").loaded
+        assert "lazy_skill_imported" in sys.modules
+
+    def test_manifest_reused_without_parsing_yaml(self, tmp_path, monkeypatch):
+        skills_root = tmp_path / "skills"
+        skills_root.mkdir()
+        _write_skill(skills_root)
+        manifest_path = str(tmp_path / "manifest.json")
+
+        assert SkillRegistry([str(skills_root)], manifest_path).discover_and_register() == 1
+
+        def _no_yaml(*args, **kwargs):
+            raise AssertionError("config.yaml nao deveria ser parseado de novo")
+
+        monkeypatch.setattr("core.skills.manifest.yaml.safe_load", _no_yaml)
+        registry = SkillRegistry([str(skills_root)], manifest_path)
+        assert registry.discover_and_register() == 1
+        assert registry.get("lazy_skill").config.triggers == ["preguica"]
+
+    @pytest.mark.asyncio
+    async def test_broken_handler_reports_error(self, tmp_path):
+        skill_dir = _write_skill(tmp_path, name="broken_skill")
+        (skill_dir / "handler.py").write_text("raise RuntimeError('boom')\n", encoding="utf-8")
+        registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+        registry.discover_and_register()
+
+        result = await registry.execute_skill("broken_skill")
+        assert result.startswith("❌ Erro ao carregar skill 'broken_skill'")
+
+
+class TestHotReload:
+    """Reload incremental do registry (core/skills/watcher.py)."""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_skill_is_swapped(self, tmp_path):
+        _write_skill(tmp_path, name="alpha_skill", result="alpha v1")
+        beta_dir = _write_skill(tmp_path, name="beta_skill", result="beta v1")
+        registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+        registry.discover_and_register()
+        assert await registry.execute_skill("beta_skill") == "beta v1"
+        alpha = registry.get("alpha_skill")
+        version = registry.version
+
+        assert not registry.reload_changed().changed
+        (beta_dir / "handler.py").write_text(
+            "from core.skills.base import SkillBase\n\n"
+            "class BetaHandler(SkillBase):\n"
+            "    async def execute(self, args=None):\n"
+            "        return 'beta v2 recarregado'\n",
+            encoding="utf-8",
+        )
+        result = registry.reload_changed()
+
+        assert result.updated == ["beta_skill"]
+        assert registry.get("alpha_skill") is alpha
+        assert registry.version == version + 1
+        # Versão antiga já estava carregada: a nova é importada antes da troca
+        assert registry.get("beta_skill").loaded
+        assert await registry.execute_skill("beta_skill") == "beta v2 recarregado"
+
+    def test_added_and_removed_directories(self, tmp_path):
+        import shutil
+
+        alpha_dir = _write_skill(tmp_path, name="alpha_skill")
+        registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+        registry.discover_and_register()
+
+        _write_skill(tmp_path, name="gamma_skill")
+        shutil.rmtree(alpha_dir)
+        result = registry.reload_changed()
+
+        assert result.added == ["gamma_skill"]
+        assert result.removed == ["alpha_skill"]
+        assert registry.get("alpha_skill") is None
+        assert [t["function"]["name"] for t in registry.list_tool_schemas()] == ["gamma_skill"]
+
+    @pytest.mark.asyncio
+    async def test_watcher_drains_inflight_executions(self, tmp_path):
+        import asyncio
+
+        from core.skills.watcher import SkillWatcher
+
+        registry = SkillRegistry(skill_dirs=[])
+        registry._manifest = {"skills": {}}
+        started, release = asyncio.Event(), asyncio.Event()
+
+        class _SlowSkill(SkillBase):
+            async def execute(self, args=None):
+                started.set()
+                await release.wait()
+                return "lento"
+
+        old = _SlowSkill(SkillConfig(name="lazy_skill", description="antigo"))
+        registry.register(old)
+        running = asyncio.create_task(registry.execute_skill("lazy_skill"))
+        await started.wait()
+        assert registry.inflight(old) == 1
+
+        # Diretório novo substitui o skill com o mesmo nome
+        registry._skill_dirs = [str(tmp_path)]
+        registry._paths = {str(tmp_path / "lazy_skill"): "lazy_skill"}
+        registry._manifest = {"skills": {str(tmp_path / "lazy_skill"): {}}}
+        _write_skill(tmp_path)
+        poll = asyncio.create_task(SkillWatcher(registry, drain_timeout=5).poll_once())
+        await asyncio.sleep(0.1)
+        assert not poll.done()
+        assert registry.get("lazy_skill") is not old
+
+        release.set()
+        assert await running == "lento"
+        result = await poll
+        assert result.updated == ["lazy_skill"]
+        assert registry.inflight(old) == 0
+
+
 class TestSkillConfig:
     """Testes do SkillConfig."""
 
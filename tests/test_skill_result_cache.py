@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from core.skills.base import SkillBase, SkillConfig
+from core.skills.registry import SkillRegistry
+
+
+class _CountingSkill(SkillBase):
+    def __init__(self, config, delay=0.0, fail_first=False):
+        super().__init__(config)
+        self.calls = 0
+        self.delay = delay
+        self.fail_first = fail_first
+
+    async def execute(self, args=None):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_first and self.calls == 1:
+            raise RuntimeError("falhou")
+        return f"resultado {self.calls} {args.get('query', '')}".strip()
+
+
+def _registry(**cache):
+    config = SkillConfig(name="get_ram", description="RAM", **cache)
+    skill = _CountingSkill(config)
+    registry = SkillRegistry(skill_dirs=[])
+    registry.register(skill)
+    return registry, skill
+
+
+@pytest.mark.asyncio
+async def test_repeated_calls_served_from_cache():
+    registry, skill = _registry(cache_ttl_seconds=60, cache_key_args=[])
+
+    assert await registry.execute_skill("get_ram") == "resultado 1"
+    assert await registry.execute_skill("get_ram", {"raw_input": "ram?"}) == "resultado 1"
+    assert skill.calls == 1
+
+    stats = registry.cache_stats()["get_ram"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    registry, skill = _registry(cache_ttl_seconds=60, cache_key_args=["query"])
+    skill.delay = 0.05
+
+    results = await asyncio.gather(
+        *[registry.execute_skill("get_ram", {"query": "x"}) for _ in range(5)],
+        registry.execute_skill("get_ram", {"query": "y"}),
+    )
+
+    assert len(set(results[:5])) == 1
+    assert results[0].endswith(" x") and results[5].endswith(" y")
+    assert skill.calls == 2
+    assert registry.cache_stats()["get_ram"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_errors_and_uncacheable_calls_run_fresh():
+    registry, skill = _registry(cache_ttl_seconds=60)
+    skill.fail_first = True
+
+    assert (await registry.execute_skill("get_ram")).startswith("❌")
+    assert await registry.execute_skill("get_ram") == "resultado 2"
+    assert await registry.execute_skill("get_ram") == "resultado 2"
+
+    user_registry, user_skill = _registry(cache_ttl_seconds=60, cache_scope="user")
+    await user_registry.execute_skill("get_ram")
+    await user_registry.execute_skill("get_ram")
+    assert user_skill.calls == 2
+    await user_registry.execute_skill("get_ram", user_id="u1")
+    await user_registry.execute_skill("get_ram", user_id="u2")
+    await user_registry.execute_skill("get_ram", user_id="u1")
+    assert user_skill.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_skills_without_ttl_are_not_cached():
+    registry, skill = _registry()
+
+    await registry.execute_skill("get_ram")
+    await registry.execute_skill("get_ram")
+
+    assert skill.calls == 2
+    assert registry.cache_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_web_search_failures_are_not_cached(monkeypatch):
+    from core.skills._builtin.web_search import handler as web_search
+
+    calls = []
+
+    async def fake_ddg(self, query):
+        calls.append(query)
+        if len(calls) == 1:
+            raise RuntimeError("timeout")
+        return f"Resultados para: {query}"
+
+    monkeypatch.setattr(web_search, "BRAVE_API_KEY", "")
+    monkeypatch.setattr(web_search.WebSearchSkill, "_search_ddg", fake_ddg)
+    config = SkillConfig(
+        name="web_search",
+        description="busca",
+        cache_ttl_seconds=600,
+        cache_key_args=["query", "raw_input"],
+    )
+    registry = SkillRegistry(skill_dirs=[])
+    registry.register(web_search.WebSearchSkill(config))
+
+    assert (await registry.execute_skill("web_search", {"query": "x"})).startswith("❌")
+    assert await registry.execute_skill("web_search", {"query": "x"}) == "Resultados para: x"
+    assert await registry.execute_skill("web_search", {"query": "x"}) == "Resultados para: x"
+    assert len(calls) == 2
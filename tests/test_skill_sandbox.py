@@ -0,0 +1,175 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core.skills import sandbox as sandbox_module
+from core.skills.registry import SkillRegistry
+from core.skills.sandbox import SandboxLimits, SandboxPool, subprocess_preexec
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux", reason="rlimits/forkserver (Linux)")
+
+
+def _write_skill(root, name, body, sandbox="  worker: true\n"):
+    skill_dir = root / name
+    skill_dir.mkdir()
+    (skill_dir / "config.yaml").write_text(
+        f"name: {name}\ndescription: Skill isolado\ntimeout_seconds: 10\nsandbox:\n{sandbox}",
+        encoding="utf-8",
+    )
+    (skill_dir / "handler.py").write_text(
+        "import os\n"
+        "from core.skills.base import SkillBase\n\n"
+        "class SandboxedHandler(SkillBase):\n"
+        "    async def execute(self, args=None):\n"
+        f"{body}",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def sandbox_pool(monkeypatch):
+    pool = SandboxPool(size=1)
+    monkeypatch.setattr("core.skills.registry.get_sandbox_pool", lambda: pool)
+    yield pool
+
+
+def test_limits_from_config_apply_to_subprocess():
+    limits = SandboxLimits.from_config({"memory_mb": 128, "worker": True})
+    assert limits.to_dict() == {"memory_mb": 128}
+
+    proc = subprocess.run(
+        [sys.executable, "-c", "bytearray(400 * 1024 * 1024)"],
+        preexec_fn=limits.apply,
+        capture_output=True,
+    )
+    assert proc.returncode != 0
+    assert b"MemoryError" in proc.stderr
+
+
+def test_subprocess_preexec_joins_delegated_cgroup_and_caps_data(tmp_path, monkeypatch):
+    cgroup = tmp_path / "agentvps-skills"
+    monkeypatch.setenv("SKILL_SANDBOX_CGROUP", str(cgroup))
+    monkeypatch.setenv("SKILL_SANDBOX_CGROUP_MEMORY_MB", "768")
+    monkeypatch.setenv("SKILL_SANDBOX_CGROUP_MAX_TASKS", "256")
+    monkeypatch.setattr(sandbox_module, "_cgroup", None)
+    monkeypatch.setattr(sandbox_module, "_cgroup_checked", False)
+
+    preexec = subprocess_preexec(SandboxLimits.from_config({"data_mb": 128}))
+    proc = subprocess.run(
+        [sys.executable, "-c", "bytearray(400 * 1024 * 1024)"],
+        preexec_fn=preexec,
+        capture_output=True,
+    )
+
+    assert proc.returncode != 0
+    assert b"MemoryError" in proc.stderr
+    assert (cgroup / "memory.max").read_text() == str(768 * 1024 * 1024)
+    assert (cgroup / "pids.max").read_text() == "256"
+    # Num cgroupfs de verdade "0" move o próprio processo
+    assert (cgroup / "cgroup.procs").read_text() == "0"
+
+
+def test_subprocess_preexec_is_none_without_limits_or_cgroup(monkeypatch):
+    monkeypatch.setattr(sandbox_module, "_cgroup", None)
+    monkeypatch.setattr(sandbox_module, "_cgroup_checked", True)
+
+    assert subprocess_preexec(SandboxLimits()) is None
+
+
+@pytest.mark.asyncio
+async def test_worker_skill_runs_out_of_process_and_reports_usage(tmp_path, sandbox_pool):
+    _write_skill(tmp_path, "pid_skill", "        return str(os.getpid())\n")
+    registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+    registry.discover_and_register()
+    metadata = {}
+
+    try:
+        result = await registry.execute_skill("pid_skill", metadata=metadata)
+    finally:
+        await sandbox_pool.close()
+
+    assert result.isdigit() and int(result) != os.getpid()
+    assert not registry.get("pid_skill").loaded
+    usage = metadata["resource_usage"]
+    assert usage["sandboxed"] is True
+    assert {"cpu_user_s", "cpu_system_s", "max_rss_kb", "wall_ms"} <= set(usage)
+
+
+@pytest.mark.asyncio
+async def test_limit_violations_are_contained(tmp_path, sandbox_pool):
+    _write_skill(
+        tmp_path,
+        "memory_hog",
+        "        data = bytearray(1024 * 1024 * 1024)\n        return str(len(data))\n",
+        sandbox="  worker: true\n  memory_mb: 256\n",
+    )
+    _write_skill(
+        tmp_path,
+        "cpu_hog",
+        "        while True:\n            pass\n",
+        sandbox="  worker: true\n  cpu_seconds: 1\n",
+    )
+    _write_skill(tmp_path, "pid_skill", "        return 'ok'\n")
+    registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+    registry.discover_and_register()
+
+    try:
+        memory = await registry.execute_skill("memory_hog")
+        cpu_meta = {}
+        cpu = await registry.execute_skill("cpu_hog", metadata=cpu_meta)
+        after = await registry.execute_skill("pid_skill")
+    finally:
+        await sandbox_pool.close()
+
+    assert "excedeu o limite do sandbox (memory_limit)" in memory
+    assert "cpu_limit" in cpu
+    assert cpu_meta["resource_usage"]["error"] == "cpu_limit"
+    assert after == "ok"
+    assert sandbox_pool.stats["worker_restarts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_leak_reply_to_next_execution(tmp_path, sandbox_pool):
+    import asyncio
+
+    _write_skill(
+        tmp_path,
+        "slow",
+        "        import asyncio\n        await asyncio.sleep(1)\n        return 'slow'\n",
+    )
+    _write_skill(tmp_path, "fast", "        return 'fast'\n")
+    registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+    registry.discover_and_register()
+
+    try:
+        slow = asyncio.create_task(registry.execute_skill("slow"))
+        await asyncio.sleep(0.5)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+        await asyncio.sleep(1)  # a resposta do slow chegaria no pipe do worker antigo
+        result = await registry.execute_skill("fast")
+    finally:
+        await sandbox_pool.close()
+
+    assert result == "fast"
+    assert sandbox_pool.stats["worker_restarts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_failure_returns_error_string(tmp_path, monkeypatch):
+    _write_skill(tmp_path, "pid_skill", "        return 'ok'\n")
+    registry = SkillRegistry(skill_dirs=[str(tmp_path)])
+    registry.discover_and_register()
+
+    class BrokenPool:
+        async def run(self, *args, **kwargs):
+            raise OSError("forkserver unavailable")
+
+    monkeypatch.setattr("core.skills.registry.get_sandbox_pool", lambda: BrokenPool())
+
+    result = await registry.execute_skill("pid_skill")
+
+    assert result == "❌ Erro ao executar skill 'pid_skill': forkserver unavailable"
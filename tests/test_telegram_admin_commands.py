@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+import telegram_bot.bot as bot_module
+
+
+class _DummyMessage:
+    def __init__(self):
+        self.sent = []
+
+    async def reply_text(self, text, *args, **kwargs):
+        self.sent.append(text)
+
+
+class _FakePool:
+    def __init__(self, *, rows=None, status="UPDATE 1"):
+        self.rows = rows or []
+        self.status = status
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        self.calls.append(("fetch", args))
+        return self.rows
+
+    async def execute(self, query, *args):
+        self.calls.append(("execute", args))
+        return self.status
+
+
+def _update(user_id=123):
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id, first_name="Test"),
+        message=_DummyMessage(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_cmd_proposals_reads_from_shared_pool(monkeypatch):
+    pool = _FakePool(
+        rows=[(7, "ram_high", '{"description": "Limpar containers"}', "{}", None)],
+    )
+    monkeypatch.setattr(bot_module, "ALLOWED_USERS", [123])
+    monkeypatch.setattr(bot_module, "get_db_pool", lambda: pool)
+
+    update = _update()
+    await bot_module.cmd_proposals(update, SimpleNamespace(args=[]))
+
+    assert pool.calls == [("fetch", ())]
+    assert "#7 [ram_high] Limpar containers" in update.message.sent[0]
+
+
+@pytest.mark.asyncio
+async def test_cmd_reject_uses_asyncpg_params_and_status(monkeypatch):
+    pool = _FakePool(status="UPDATE 0")
+    monkeypatch.setattr(bot_module, "ALLOWED_USERS", [123])
+    monkeypatch.setattr(bot_module, "get_db_pool", lambda: pool)
+
+    update = _update()
+    await bot_module.cmd_reject(update, SimpleNamespace(args=["42", "nao", "agora"]))
+
+    assert pool.calls == [("execute", ("nao agora", 42))]
+    assert "nao encontrada ou ja processada" in update.message.sent[0]
+
+
+def test_affected_rows_parses_command_status():
+    assert bot_module._affected_rows("UPDATE 3") == 3
+    assert bot_module._affected_rows("") == 0
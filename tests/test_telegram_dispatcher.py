@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from telegram_bot.dispatcher import MessageDispatcher
+
+
+@pytest.mark.asyncio
+async def test_same_user_runs_in_order_and_coalesces_followups():
+    gate = asyncio.Event()
+    seen = []
+
+    async def handler(turn):
+        seen.append((turn.user_id, turn.messages))
+        if turn.messages == ["oi"]:
+            await gate.wait()
+
+    dispatcher = MessageDispatcher(handler, max_concurrency=2)
+    dispatcher.submit("u1", "oi")
+    await asyncio.sleep(0)
+    # Chegam enquanto o primeiro turno esta em voo: viram um unico turno.
+    dispatcher.submit("u1", "tudo bem?")
+    dispatcher.submit("u1", "me ve a ram")
+    assert dispatcher.stats()["queue_depth_by_user"] == {"u1": 1}
+
+    gate.set()
+    await dispatcher.join()
+    await dispatcher.close()
+
+    assert seen == [("u1", ["oi"]), ("u1", ["tudo bem?", "me ve a ram"])]
+    assert dispatcher.stats()["coalesced_messages"] == 1
+    assert dispatcher.stats()["processed_turns"] == 2
+
+
+@pytest.mark.asyncio
+async def test_users_share_budget_round_robin():
+    running = 0
+    peak = 0
+    order = []
+
+    async def handler(turn):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        order.append(turn.user_id)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    dispatcher = MessageDispatcher(handler, max_concurrency=1, max_messages_per_turn=1)
+    for text in ("a1", "a2", "a3"):
+        dispatcher.submit("a", text)
+    dispatcher.submit("b", "b1")
+    await dispatcher.join()
+    await dispatcher.close()
+
+    assert peak == 1
+    # "b" nao espera todas as mensagens de "a".
+    assert order.index("b") < 3
+
+
+@pytest.mark.asyncio
+async def test_full_user_queue_rejects_and_errors_do_not_stall():
+    async def handler(turn):
+        raise RuntimeError("boom")
+
+    dispatcher = MessageDispatcher(handler, max_concurrency=1, max_pending_per_user=1)
+    assert dispatcher.submit("u1", "primeira") is True
+    assert dispatcher.submit("u1", "segunda") is False
+    await dispatcher.join()
+
+    assert dispatcher.submit("u1", "terceira") is True
+    await dispatcher.join()
+    await dispatcher.close()
+
+    stats = dispatcher.stats()
+    assert stats["rejected_messages"] == 1
+    assert stats["processed_turns"] == 2
+    assert stats["pending_turns"] == 0
+
+
+@pytest.mark.asyncio
+async def test_commands_queue_in_order_without_coalescing():
+    gate = asyncio.Event()
+    seen = []
+
+    async def handler(turn):
+        seen.append(turn.messages)
+        if turn.messages == ["oi"]:
+            await gate.wait()
+
+    dispatcher = MessageDispatcher(handler, max_concurrency=2)
+    dispatcher.submit("u1", "oi")
+    await asyncio.sleep(0)
+    # /status espera o turno em voo e nao se mistura com mensagens vizinhas
+    dispatcher.submit("u1", "tudo bem?")
+    dispatcher.submit("u1", "/status", coalesce=False)
+    dispatcher.submit("u1", "e a ram?")
+    await asyncio.sleep(0)
+    assert seen == [["oi"]]
+
+    gate.set()
+    await dispatcher.join()
+    await dispatcher.close()
+
+    assert seen == [["oi"], ["tudo bem?"], ["/status"], ["e a ram?"]]
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.skills.base import SkillBase, SkillConfig
+from core.skills.registry import SkillRegistry
+from core.skills.tool_selector import ToolSelector, normalize_text, signals_missing_tool
+from core.vps_langgraph.prompt_cache import SystemPromptCache
+
+
+class _EchoSkill(SkillBase):
+    async def execute(self, args=None):
+        return "ok"
+
+
+def _registry():
+    registry = SkillRegistry(skill_dirs=[])
+    specs = [
+        ("shell_exec", "Executa um comando shell na VPS", ["comando", "terminal"]),
+        ("web_search", "Pesquisa informações na internet", ["pesquise", "buscar"]),
+        ("file_manager", "Lê, cria ou edita arquivos", ["arquivo"]),
+        ("get_ram", "Mostra uso de memória RAM do servidor", ["ram", "memória"]),
+        ("list_containers", "Lista containers Docker", ["containers", "docker"]),
+        ("check_postgres", "Verifica o PostgreSQL", ["postgres", "banco de dados"]),
+        ("check_redis", "Verifica o Redis", ["redis"]),
+        ("brazilcnpj", "Consulta dados de empresas por CNPJ", ["cnpj", "socios"]),
+        ("fleetintel", "Emplacamentos de caminhões no Brasil", ["caminhão", "frota"]),
+        ("log_reader", "Lê logs internos do agente", ["logs", "erros"]),
+        ("memory_query", "Consulta a memória do agente", ["historico"]),
+        ("self_edit", "Edita arquivos de código do agente", ["edite"]),
+    ]
+    for name, description, triggers in specs:
+        registry.register(
+            _EchoSkill(SkillConfig(name=name, description=description, triggers=triggers))
+        )
+    return registry
+
+
+def _names(tools):
+    return [tool["function"]["name"] for tool in tools]
+
+
+def test_selects_core_plus_relevant_tools():
+    registry = _registry()
+    selector = ToolSelector(top_k=3)
+
+    selected = _names(
+        selector.select(registry, "Quanta memoria tem?", registry.list_tool_schemas())
+    )
+
+    assert "get_ram" in selected
+    assert {"shell_exec", "web_search", "file_manager"} <= set(selected)
+    assert "brazilcnpj" not in selected
+    assert len(selected) < registry.count
+
+
+def test_trigger_index_is_accent_insensitive():
+    registry = _registry()
+    selector = ToolSelector(top_k=3)
+
+    assert normalize_text("Caminhão, Frota!") == "caminhao frota"
+    assert selector.score(registry, "quem comprou caminhao")[0][0] == "fleetintel"
+
+
+def test_missing_tool_signal_detection():
+    assert signals_missing_tool("Desculpe, não tenho uma ferramenta para isso.")
+    assert not signals_missing_tool("A RAM está em 40%.")
+
+
+@pytest.mark.asyncio
+async def test_node_react_falls_back_to_full_tool_set(monkeypatch):
+    from core.vps_langgraph import react_node
+
+    registry = _registry()
+    calls = []
+    replies = iter(
+        [
+            SimpleNamespace(
+                success=True, tool_calls=[], content="Não tenho uma ferramenta para isso."
+            ),
+            SimpleNamespace(success=True, tool_calls=[], content="Pronto."),
+        ]
+    )
+
+    class _FakeProvider:
+        async def generate(self, messages, tools):
+            calls.append(_names(tools))
+            return next(replies)
+
+    monkeypatch.setattr(react_node, "get_skill_registry", lambda: registry)
+    monkeypatch.setattr(react_node, "get_tool_selector", lambda: ToolSelector(top_k=2))
+    monkeypatch.setattr(react_node, "detect_external_workflow", lambda _m: None)
+    monkeypatch.setattr(react_node, "detect_external_skill", lambda _m: None)
+    monkeypatch.setattr(react_node, "build_react_system_prompt", lambda: "prompt")
+    monkeypatch.setattr(react_node, "get_prompt_cache", lambda: SystemPromptCache())
+    monkeypatch.setattr("core.llm.unified_provider.get_llm_provider", lambda: _FakeProvider())
+
+    result = await react_node.node_react(
+        {"user_id": "u1", "user_message": "quanta ram?", "conversation_history": []}
+    )
+
+    assert result["response"] == "Pronto."
+    assert len(calls[0]) < registry.count
+    assert len(calls[1]) == registry.count
@@ -1,3 +1,4 @@
+import hashlib
 from types import SimpleNamespace
 
 import pytest
@@ -436,3 +437,208 @@ async def test_voice_context_inspect_inbox_reports_missing_requested_files(tmp_p
     assert result["status"] == "no_files"
     assert result["requested_files"] == ["missing.mp3"]
     assert result["missing_requested_files"] == ["missing.mp3"]
+
+
+class _PipelineCursor:
+    def __init__(self, db):
+        self.db = db
+
+    def execute(self, query, params=None):
+        normalized = " ".join(str(query).split())
+        if "INSERT INTO voice_audio_files" in normalized and params[2] in self.db["conflicts"]:
+            raise RuntimeError("duplicate key value violates unique constraint")
+        self.db["queries"].append(normalized)
+
+    def fetchone(self):
+        self.db["next_id"] += 1
+        return (self.db["next_id"],)
+
+    def fetchall(self):
+        return []
+
+
+class _PipelineConn:
+    def __init__(self, db):
+        self.db = db
+        self.cursor_obj = _PipelineCursor(db)
+
+    def cursor(self, cursor_factory=None):
+        return self.cursor_obj
+
+    def commit(self):
+        self.db["commits"] += 1
+        self.db["queries"].append("COMMIT")
+
+    def rollback(self):
+        self.db["rollbacks"] += 1
+        self.db["queries"].append("ROLLBACK")
+
+    def close(self):
+        return None
+
+
+class _PipelineTranscriber:
+    def transcribe_file(self, file_path, language="pt"):  # noqa: ARG002
+        return TranscriptResult(
+            text=(
+                "Organizei o lote de voz, revisei a captacao, mantive o raciocinio continuo "
+                "e deixei contexto suficiente para memoria episodica sem ruido excessivo. "
+            )
+            * 8,
+            duration_seconds=12 * 60,
+            model="fake",
+        )
+
+
+class _PipelineExtractor:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def extract_structured_context(self, transcript, source_name=None):  # noqa: ARG002
+        import asyncio
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {
+            "summary": "",
+            "episodes": [{"text": f"Lote {source_name}", "domain": "trabalho", "confidence": 0.93}],
+            "facts": [],
+            "preferences": [],
+            "commitments": [],
+        }
+
+
+def _pipeline_service(tmp_path, monkeypatch, files, *, conflicts=(), save_memory=None):
+    inbox_dir = tmp_path / "inbox"
+    inbox_dir.mkdir()
+    for name, content in files.items():
+        (inbox_dir / name).write_bytes(content)
+
+    settings = SimpleNamespace(
+        file_extensions=".mp3,.wav",
+        inbox_dir=str(inbox_dir),
+        processing_dir=str(tmp_path / "processing"),
+        archive_dir=str(tmp_path / "archive"),
+        failed_dir=str(tmp_path / "failed"),
+        transcripts_dir=str(tmp_path / "transcripts"),
+        transcript_ttl_days=7,
+        max_files_per_run=12,
+        auto_commit_max_duration_minutes=30,
+        quality_warn_score=0.65,
+        quality_min_score=0.35,
+        create_daily_summary=False,
+        auto_commit_threshold=0.75,
+        notify_on_job_completion=False,
+        transcription_workers=2,
+        extraction_concurrency=2,
+    )
+    db = {
+        "queries": [],
+        "connections": 0,
+        "commits": 0,
+        "rollbacks": 0,
+        "next_id": 100,
+        "conflicts": set(conflicts),
+        "saved": [],
+    }
+
+    def get_conn():
+        db["connections"] += 1
+        return _PipelineConn(db)
+
+    service = VoiceContextService(
+        settings=settings,
+        memory=SimpleNamespace(
+            save_typed_memory=save_memory or (lambda **kwargs: db["saved"].append(kwargs))
+        ),
+        extractor=_PipelineExtractor(),
+        transcriber=_PipelineTranscriber(),
+    )
+    monkeypatch.setattr(service, "_get_conn", get_conn)
+    monkeypatch.setattr(service, "_create_job", lambda **kwargs: 7)
+    monkeypatch.setattr(service, "_finish_job", lambda *args, **kwargs: None)
+    monkeypatch.setattr(service, "get_status", lambda: {})
+    monkeypatch.setattr(service, "build_job_feedback", lambda **kwargs: "")
+    monkeypatch.setattr(service, "resolve_user_id", lambda user_id=None: "u1")
+    return service, db
+
+
+@pytest.mark.asyncio
+async def test_voice_context_sync_inbox_pipelines_stages_and_batches_persistence(
+    tmp_path, monkeypatch
+):
+    files = {"a.mp3": b"a", "b.mp3": b"b", "c.mp3": b"c", "a-copy.mp3": b"a"}
+    service, db = _pipeline_service(tmp_path, monkeypatch, files)
+
+    result = await service.sync_inbox()
+
+    assert result["success"] is True
+    assert result["processed_files"] == 4
+    assert result["duplicates_skipped"] == 1
+    assert len(db["saved"]) == 3
+    assert service.extractor.peak == 2
+    # One duplicate lookup, one registration connection and one persistence connection
+    assert db["connections"] == 3
+    assert sum("sha256 = ANY" in query for query in db["queries"]) == 1
+    pipeline = result["pipeline"]
+    assert pipeline["files"] == 4
+    assert pipeline["transcribe"]["runs"] == 3
+    assert pipeline["extract"]["limit"] == 2
+    assert pipeline["extract"]["runs"] == 3
+    assert pipeline["extract"]["max_queue_depth"] >= 1
+    assert list((tmp_path / "processing").iterdir()) == []
+    assert list((tmp_path / "inbox").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_voice_context_sync_inbox_isolates_registration_conflicts(tmp_path, monkeypatch):
+    # b.mp3 was dropped before and left a failed row: UNIQUE(sha256) rejects it
+    files = {"a.mp3": b"a", "b.mp3": b"b", "c.mp3": b"c"}
+    service, db = _pipeline_service(tmp_path, monkeypatch, files, conflicts={"b.mp3"})
+
+    result = await service.sync_inbox()
+
+    assert result["success"] is True
+    assert result["failed_files"] == 1
+    assert len(db["saved"]) == 2
+    assert db["rollbacks"] == 1
+    assert [p.name for p in (tmp_path / "failed").iterdir()] == [
+        f"{hashlib.sha256(b'b').hexdigest()}.mp3"
+    ]
+    assert list((tmp_path / "processing").iterdir()) == []
+    assert len(list((tmp_path / "archive").iterdir())) == 2
+
+
+@pytest.mark.asyncio
+async def test_voice_context_sync_inbox_commits_memory_keys_before_later_failures(
+    tmp_path, monkeypatch
+):
+    saved = []
+
+    def save_memory(**kwargs):
+        if saved:
+            raise RuntimeError("memory store unavailable")
+        saved.append(kwargs)
+
+    service, db = _pipeline_service(tmp_path, monkeypatch, {"a.mp3": b"a"}, save_memory=save_memory)
+    original_build = service._build_context_items
+
+    def two_items(**kwargs):
+        items = original_build(**kwargs)
+        return items + [dict(items[0], payload=dict(items[0]["payload"], text="segundo"))]
+
+    monkeypatch.setattr(service, "_build_context_items", two_items)
+
+    result = await service.sync_inbox()
+
+    assert result["failed_files"] == 1
+    assert len(saved) == 1
+    queries = db["queries"]
+    committed = [i for i, q in enumerate(queries) if "SET commit_status = 'committed'" in q]
+    assert len(committed) == 1
+    # The memory_key UPDATE of the stored memory is committed before the rollback
+    assert queries[committed[0] + 1] == "COMMIT"
+    assert queries.index("ROLLBACK") > committed[0] + 1